@@ -1,21 +1,37 @@
 import sys
 import pathlib
-import json
+import re
+import threading
 import time
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
+import orjson
 import streamlit as st
-from dotenv import load_dotenv
 
-# Ensure root is on sys.path so `bylaws_iq` is importable when running via Streamlit
-project_root = pathlib.Path(__file__).resolve().parents[1]
-if str(project_root) not in sys.path:
-    sys.path.insert(0, str(project_root))
+# Ensure root is on sys.path so `bylaws_iq` is importable when running via Streamlit.
+# Only the first run of a server process needs this: reruns find the package in sys.modules.
+if "bylaws_iq" not in sys.modules:
+    project_root = str(pathlib.Path(__file__).resolve().parents[1])
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+from bylaws_iq.logging_config import load_env_once
+from bylaws_iq.models import PARKING_KEYS, ZONING_KEYS
+
+# Fixed metric set (Parking Summary, then Zoning Analysis); a tuple so it doubles as a cache key
+REQUESTED_METRICS = PARKING_KEYS + ZONING_KEYS
+
+
+def _pipeline():
+    # Imported on first search rather than at the top: the pipeline pulls in Selenium,
+    # the PDF/HTML parsers and the LLM clients, and Streamlit re-executes this script
+    # on every widget interaction. After the first import this is a sys.modules lookup.
+    from bylaws_iq import pipeline
+    return pipeline
 
-from bylaws_iq.pipeline import run_query, run_query_fallback, run_query_with_manual_zoning
 
-load_dotenv()
 st.set_page_config(page_title="ByLaws-IQ", layout="wide")
+load_env_once()
 
 st.title("ByLaws-IQ — Zoning By-Laws AI Search")
 
@@ -23,53 +39,192 @@ address = st.text_input("US Address", placeholder="55 Constitution Blvd, Frankli
 
 st.subheader("Metrics (fixed)")
 st.caption("Parking Summary: Car parking 90°; Ratio required for offices; Driveway width. Zoning Analysis: Required minimum lot area; Minimum front/side/rear setbacks; Minimum lot frontage; Minimum lot width.")
-requested_metrics = [
-    # Parking Summary
-    "carParking90Deg",
-    "officesParkingRatio",
-    "drivewayWidth",
-    # Zoning Analysis
-    "minLotArea",
-    "minFrontSetback",
-    "minSideSetback",
-    "minRearSetback",
-    "minLotFrontage",
-    "minLotWidth",
-]
 
 progress_area = st.empty()
 zoning_display_area = st.empty()
 
 
+# Progress messages that also update the zoning status panel, checked in order:
+# (pattern, placeholder method, panel text formatted with the pattern's named groups)
+_PROGRESS_RULES = tuple(
+    (re.compile(pattern), level, fmt)
+    for pattern, level, fmt in (
+        (r"Found zoning district:\s*(?P<zoning_info>.*?)\s*$", "success", "🗺️ **Zoning District Discovered:** {zoning_info}"),
+        (r"Zoning district discovery failed", "warning", "⚠️ **Zoning District:** Could not determine from official sources"),
+        (r"Discovering official bylaws for district", "info", "📋 **Finding Official Bylaws...**"),
+        (r"Found official bylaws:", "success", "✅ **Official Bylaws Found**"),
+        (r"Could not find official bylaws for", "warning", "⚠️ **Bylaws:** Could not find official bylaws"),
+        (r"Adding official bylaws to document analysis", "info", "🔍 **Analyzing Official Bylaws for Metrics...**"),
+        (r"Using official bylaws document only", "success", "🎯 **Using Official Document Only**"),
+        (r"Primary method failed", "warning", "⚠️ **Primary Method Failed**"),
+        (r"Using fallback:", "info", "🔄 **Using Fallback Method**"),
+        (r"Accessing official document \(may try multiple strategies\)", "info", "🔄 **Accessing PDF (trying multiple strategies)...**"),
+        (r"Successfully accessed official document", "success", "✅ **PDF Access Successful**"),
+        (r"Extracted.*characters from official document", "success", "✅ **Document Processed Successfully**"),
+    )
+)
+
+
 def ui_progress(msg: str) -> None:
     progress_area.info(msg)
-    
-    # Special handling for zoning district discovery results
-    if "Found zoning district:" in msg:
-        zoning_info = msg.replace("✅ Found zoning district: ", "").strip()
-        zoning_display_area.success(f"🗺️ **Zoning District Discovered:** {zoning_info}")
-    elif "Zoning district discovery failed" in msg:
-        zoning_display_area.warning("⚠️ **Zoning District:** Could not determine from official sources")
-    elif "Discovering official bylaws for district" in msg:
-        zoning_display_area.info("📋 **Finding Official Bylaws...**")
-    elif "Found official bylaws:" in msg:
-        zoning_display_area.success("✅ **Official Bylaws Found**")
-    elif "Could not find official bylaws for" in msg:
-        zoning_display_area.warning("⚠️ **Bylaws:** Could not find official bylaws")
-    elif "Adding official bylaws to document analysis" in msg:
-        zoning_display_area.info("🔍 **Analyzing Official Bylaws for Metrics...**")
-    elif "Using official bylaws document only" in msg:
-        zoning_display_area.success("🎯 **Using Official Document Only**")
-    elif "Primary method failed" in msg:
-        zoning_display_area.warning("⚠️ **Primary Method Failed**")
-    elif "Using fallback:" in msg:
-        zoning_display_area.info("🔄 **Using Fallback Method**")
-    elif "Accessing official document (may try multiple strategies)" in msg:
-        zoning_display_area.info("🔄 **Accessing PDF (trying multiple strategies)...**")
-    elif "Successfully accessed official document" in msg:
-        zoning_display_area.success("✅ **PDF Access Successful**")
-    elif "Extracted" in msg and "characters from official document" in msg:
-        zoning_display_area.success("✅ **Document Processed Successfully**")
+
+    # Special handling for zoning district discovery and bylaws milestones
+    for rx, level, fmt in _PROGRESS_RULES:
+        match = rx.search(msg)
+        if match:
+            getattr(zoning_display_area, level)(fmt.format(**match.groupdict()))
+            break
+
+
+# Results live in a fragment: the export/citation buttons rerun only this block instead of
+# the whole script, so the rendered results stay on screen and no pipeline branch re-executes.
+@st.fragment
+def render_results(result: dict) -> None:
+    # Display discovered zoning district prominently if available
+    if "discoveredZoningDistrict" in result and result["discoveredZoningDistrict"]["code"]:
+        zoning_info = result["discoveredZoningDistrict"]
+        st.subheader("🗺️ Discovered Zoning District")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Zoning Code", zoning_info["code"])
+            st.metric("Discovery Method", zoning_info["discoveryMethod"])
+        with col2:
+            st.metric("Zoning Name", zoning_info["name"])
+            if zoning_info["overlays"]:
+                st.write("**Overlays:**", ", ".join(zoning_info["overlays"]))
+        
+        if zoning_info["sourceUrl"]:
+            st.markdown(f"**Source:** [Official Zoning Map]({zoning_info['sourceUrl']})")
+        
+        st.divider()
+
+    # Display official bylaws source if available
+    if "officialBylawsSource" in result and result["officialBylawsSource"]:
+        bylaws_source = result["officialBylawsSource"]
+        st.subheader("📋 Official Bylaws Source")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Document", bylaws_source["title"])
+        with col2:
+            st.metric("Discovery Method", bylaws_source["discoveryMethod"])
+        
+        st.markdown(f"**Source:** [Official Bylaws Document]({bylaws_source['url']})")
+        st.info("✅ **Metrics analysis used this official document as the primary source**")
+        
+        st.divider()
+
+    # Serialized once per search by run_search; the same bytes back the code view and the export
+    export_bytes = st.session_state.get("export_bytes", b"{}")
+
+    st.subheader("Metrics Results")
+    st.code(export_bytes.decode(), language="json")
+
+    st.write("\n")
+    st.download_button(
+        "Export JSON",
+        data=export_bytes,
+        file_name="bylaws_iq_result.json",
+        mime="application/json",
+    )
+
+    citations = result.get("citations")
+    if citations:
+        st.write("Citations:")
+        # One markdown element for the whole list rather than one per citation
+        st.markdown("\n".join(f"- [{c.get('label','Source')}]({c.get('url')})" for c in citations))
+        st.button("Copy citations", on_click=lambda: st.write("Copied above list."))
+
+
+# Pipeline results that hand control back to the user instead of producing metrics
+INTERACTIVE_STATUSES = ("manual_zoning_district_required", "fallback_permission_required")
+
+
+# Completed results are reused for an hour across reruns and sessions. Only the final dict
+# is stored, outside st.cache_data: nothing here may record or replay st.* calls, so the
+# progress UI is driven live by run_search and simply doesn't appear on a hit.
+_RESULT_TTL_S = 3600
+# Live objects handed between steps; never part of a result's identity
+_UNKEYED_ARGS = ("zoning_agent",)
+
+
+@st.cache_resource
+def _result_store() -> Tuple[Dict[bytes, Tuple[float, bytes]], threading.Lock]:
+    """{search key: (stored at, result as JSON)} shared by every session, and its lock."""
+    return {}, threading.Lock()
+
+
+def _result_key(entry_point: str, kwargs: dict) -> bytes:
+    args = {k: v for k, v in kwargs.items() if k not in _UNKEYED_ARGS}
+    return orjson.dumps([entry_point, args], option=orjson.OPT_SORT_KEYS, default=str)
+
+
+def _stored_result(key: bytes) -> Optional[dict]:
+    store, lock = _result_store()
+    now = time.time()
+    with lock:
+        entry = store.get(key)
+        if entry is None:
+            return None
+        if now - entry[0] > _RESULT_TTL_S:
+            del store[key]
+            return None
+    # Each caller gets its own copy, as st.cache_data would hand out
+    return orjson.loads(entry[1])
+
+
+def _store_result(key: bytes, result: dict) -> None:
+    store, lock = _result_store()
+    data = orjson.dumps(result)
+    now = time.time()
+    with lock:
+        # Drop expired entries while we're here so the store can't grow without bound
+        for stale in [k for k, (stored_at, _) in store.items() if now - stored_at > _RESULT_TTL_S]:
+            del store[stale]
+        store[key] = (now, data)
+
+
+def _drain(events, on_progress=None) -> dict:
+    # Consume a pipeline event stream on the script thread, forwarding progress to the UI
+    for kind, payload in events:
+        if kind == "progress":
+            if on_progress:
+                on_progress(payload)
+        else:
+            return payload
+
+
+def run_search(entry_point: str, label: str = "", on_progress=None, **kwargs) -> dict:
+    """Run one pipeline entry point, hand interactive results to the UI, and report latency.
+
+    The event stream is consumed right here on the script thread, so every progress update
+    goes straight to the page placeholders. Completed results come from (and go to) the
+    result store; interactive ones hold live objects and always rerun.
+    """
+    start = time.perf_counter_ns()
+    key = _result_key(entry_point, kwargs)
+    result = _stored_result(key)
+    if result is None:
+        pipeline = _pipeline()
+        result = _drain(pipeline.stream_query(getattr(pipeline, entry_point), **kwargs), on_progress)
+        if isinstance(result, dict) and result.get("status") not in INTERACTIVE_STATUSES:
+            _store_result(key, result)
+
+    status = result.get("status") if isinstance(result, dict) else None
+    if status == "manual_zoning_district_required":
+        st.session_state.manual_zoning_data = result
+        st.session_state.show_manual_zoning_input = True
+        st.rerun()
+    elif status == "fallback_permission_required":
+        st.session_state.fallback_data = result
+        st.session_state.show_fallback_choice = True
+        st.rerun()
+
+    latency_ms = (time.perf_counter_ns() - start) // 1_000_000
+    st.caption(f"Latency: {latency_ms} ms" + (f" ({label})" if label else ""))
+    st.session_state.export_bytes = orjson.dumps(result, option=orjson.OPT_INDENT_2)
+    return result
 
 
 # Initialize session state for fallback handling
@@ -133,27 +288,21 @@ if st.session_state.show_manual_zoning_input and st.session_state.manual_zoning_
                 progress_area.info("🔄 Continuing with manually provided zoning district...")
             
             # Run query with manual zoning district, preserving resources from initial discovery
-            start = time.time()
-            result = run_query_with_manual_zoning(
-                address=st.session_state.manual_zoning_data["address"],
-                requested_metrics=st.session_state.manual_zoning_data["requested_metrics"],
+            # (may still end in a fallback permission request)
+            manual_zoning_data = st.session_state.manual_zoning_data
+            st.session_state.manual_zoning_data = None
+            result = run_search(
+                "run_query_with_manual_zoning",
+                "Manual Zoning District",
+                on_progress=ui_progress,
+                address=manual_zoning_data["address"],
+                requested_metrics=list(manual_zoning_data["requested_metrics"]),
                 zoning_district_name=zoning_district_name.strip(),
                 zoning_district_code=zoning_district_code.strip(),
-                geo=st.session_state.manual_zoning_data["geo"],
-                official_website=st.session_state.manual_zoning_data.get("official_website"),
-                zoning_agent=st.session_state.manual_zoning_data.get("zoning_agent"),
-                on_progress=ui_progress
+                geo=manual_zoning_data["geo"],
+                official_website=manual_zoning_data.get("official_website"),
+                zoning_agent=manual_zoning_data.get("zoning_agent"),
             )
-            latency_ms = int((time.time() - start) * 1000)
-            
-            st.caption(f"Latency: {latency_ms} ms (Manual Zoning District)")
-            st.session_state.manual_zoning_data = None
-            
-            # Check if we still need fallback permission after manual zoning
-            if isinstance(result, dict) and result.get("status") == "fallback_permission_required":
-                st.session_state.fallback_data = result
-                st.session_state.show_fallback_choice = True
-                st.rerun()
             
             # Display success message
             st.success("✅ **Continuing with manually provided zoning district information**")
@@ -180,18 +329,17 @@ elif st.session_state.show_fallback_choice and st.session_state.fallback_data:
             progress_area.info("🔄 Using fallback search method...")
             
             # Run fallback query
-            start = time.time()
-            result = run_query_fallback(
-                address=st.session_state.fallback_data["address"],
-                requested_metrics=st.session_state.fallback_data["requested_metrics"],
-                zoning_district_info=st.session_state.fallback_data.get("zoning_district_info"),
-                geo=st.session_state.fallback_data.get("geo"),
-                on_progress=ui_progress
-            )
-            latency_ms = int((time.time() - start) * 1000)
-            
-            st.caption(f"Latency: {latency_ms} ms (Fallback Method)")
+            fallback_data = st.session_state.fallback_data
             st.session_state.fallback_data = None
+            result = run_search(
+                "run_query_fallback",
+                "Fallback Method",
+                on_progress=ui_progress,
+                address=fallback_data["address"],
+                requested_metrics=list(fallback_data["requested_metrics"]),
+                zoning_district_info=fallback_data.get("zoning_district_info"),
+                geo=fallback_data.get("geo"),
+            )
             
             # Display fallback results
             st.info("🔄 **Results from Fallback Method** - These may be less accurate than our primary method.")
@@ -212,79 +360,19 @@ else:
             st.warning("Please enter a valid US address.")
             st.stop()
 
-        # requested_metrics is fixed above
-        start = time.time()
-        result = run_query(address=address, requested_metrics=requested_metrics, on_progress=ui_progress)
-        
-        # Check if we need manual zoning district input
-        if isinstance(result, dict) and result.get("status") == "manual_zoning_district_required":
-            st.session_state.manual_zoning_data = result
-            st.session_state.show_manual_zoning_input = True
-            st.rerun()
-        
-        # Check if we need fallback permission
-        elif isinstance(result, dict) and result.get("status") == "fallback_permission_required":
-            st.session_state.fallback_data = result
-            st.session_state.show_fallback_choice = True
-            st.rerun()
-        
-        latency_ms = int((time.time() - start) * 1000)
-        st.caption(f"Latency: {latency_ms} ms")
+        # REQUESTED_METRICS is fixed above
+        # (manual zoning entry or fallback permission results rerun into their input step)
+        result = run_search(
+            "run_query",
+            on_progress=ui_progress,
+            address=address.strip(),
+            requested_metrics=list(REQUESTED_METRICS),
+        )
 
 # Only display results if we have them and we're not in fallback choice or manual zoning input mode
 if (not st.session_state.show_fallback_choice and 
     not st.session_state.show_manual_zoning_input and 
     'result' in locals() and 
     isinstance(result, dict) and 
-    result.get("status") not in ["fallback_permission_required", "manual_zoning_district_required"]):
-    # Display discovered zoning district prominently if available
-    if "discoveredZoningDistrict" in result and result["discoveredZoningDistrict"]["code"]:
-        zoning_info = result["discoveredZoningDistrict"]
-        st.subheader("🗺️ Discovered Zoning District")
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            st.metric("Zoning Code", zoning_info["code"])
-            st.metric("Discovery Method", zoning_info["discoveryMethod"])
-        with col2:
-            st.metric("Zoning Name", zoning_info["name"])
-            if zoning_info["overlays"]:
-                st.write("**Overlays:**", ", ".join(zoning_info["overlays"]))
-        
-        if zoning_info["sourceUrl"]:
-            st.markdown(f"**Source:** [Official Zoning Map]({zoning_info['sourceUrl']})")
-        
-        st.divider()
-
-    # Display official bylaws source if available
-    if "officialBylawsSource" in result and result["officialBylawsSource"]:
-        bylaws_source = result["officialBylawsSource"]
-        st.subheader("📋 Official Bylaws Source")
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            st.metric("Document", bylaws_source["title"])
-        with col2:
-            st.metric("Discovery Method", bylaws_source["discoveryMethod"])
-        
-        st.markdown(f"**Source:** [Official Bylaws Document]({bylaws_source['url']})")
-        st.info("✅ **Metrics analysis used this official document as the primary source**")
-        
-        st.divider()
-
-    st.subheader("Metrics Results")
-    st.code(json.dumps(result, indent=2), language="json")
-
-    st.write("\n")
-    st.download_button(
-        "Export JSON",
-        data=json.dumps(result, indent=2),
-        file_name="bylaws_iq_result.json",
-        mime="application/json",
-    )
-
-    if result.get("citations"):
-        st.write("Citations:")
-        for c in result["citations"]:
-            st.markdown(f"- [{c.get('label','Source')}]({c.get('url')})")
-        st.button("Copy citations", on_click=lambda: st.write("Copied above list."))
+    result.get("status") not in INTERACTIVE_STATUSES):
+    render_results(result)
@@ -0,0 +1,91 @@
+"""Small on-disk cache shared by the services.
+
+Entries live under BLIQ_CACHE_DIR (default ~/.cache/bylaws_iq), one file per key,
+grouped by namespace. Writes are atomic so concurrent workers never see a torn file;
+set BLIQ_CACHE_DISABLE=1 to bypass the cache entirely.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import orjson
+
+
+def _enabled() -> bool:
+    return (os.getenv("BLIQ_CACHE_DISABLE") or "").lower() not in ("1", "true", "yes")
+
+
+def _root() -> Path:
+    return Path(os.getenv("BLIQ_CACHE_DIR") or Path.home() / ".cache" / "bylaws_iq")
+
+
+def key_for(*parts: Any) -> str:
+    """Stable hex key for an arbitrary tuple of str/bytes/JSON-able parts."""
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, bytes):
+            h.update(part)
+        elif isinstance(part, str):
+            h.update(part.encode("utf-8"))
+        else:
+            h.update(orjson.dumps(part, option=orjson.OPT_SORT_KEYS))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def _path(namespace: str, key: str) -> Path:
+    return _root() / namespace / key[:2] / key
+
+
+def read_bytes(namespace: str, key: str, max_age: Optional[float] = None) -> Optional[bytes]:
+    if not _enabled():
+        return None
+    path = _path(namespace, key)
+    try:
+        if max_age is not None and time.time() - path.stat().st_mtime > max_age:
+            return None
+        return path.read_bytes()
+    except OSError:
+        return None
+
+
+def write_bytes(namespace: str, key: str, data: bytes) -> None:
+    if not _enabled():
+        return
+    path = _path(namespace, key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+    except OSError:
+        # A cache that can't be written is just a cache miss next time
+        pass
+
+
+def read_json(namespace: str, key: str, max_age: Optional[float] = None) -> Any:
+    data = read_bytes(namespace, key, max_age)
+    if data is None:
+        return None
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        return None
+
+
+def write_json(namespace: str, key: str, value: Any) -> None:
+    write_bytes(namespace, key, orjson.dumps(value))
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import functools
 import logging
 import os
+import threading
 import time
 from contextlib import contextmanager
 from typing import Iterator
@@ -9,17 +11,32 @@ from dotenv import load_dotenv
 
 
 _CONFIGURED = False
+_CONFIGURE_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def load_env_once() -> None:
+    """Load .env into the environment the first time it is needed in this process."""
+    try:
+        load_dotenv()
+    except Exception:
+        pass
 
 
 def configure_logging() -> None:
     global _CONFIGURED
     if _CONFIGURED:
         return
+    with _CONFIGURE_LOCK:
+        # Re-check under the lock: pipeline stages may configure from worker threads
+        if _CONFIGURED:
+            return
+        _configure_handlers()
+        _CONFIGURED = True
 
-    try:
-        load_dotenv()
-    except Exception:
-        pass
+
+def _configure_handlers() -> None:
+    load_env_once()
 
     level_name = (os.getenv("BLIQ_LOG_LEVEL") or "INFO").upper()
     level = getattr(logging, level_name, logging.INFO)
@@ -27,7 +44,10 @@ def configure_logging() -> None:
     root = logging.getLogger("bylaws_iq")
     root.setLevel(level)
 
-    fmt = logging.Formatter(
+    # Our handlers are the only ones needed; don't duplicate records into the root logger
+    root.propagate = False
+
+    fmt = _FastFormatter(
         fmt="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
     )
@@ -44,15 +64,34 @@ def configure_logging() -> None:
         fh.setLevel(level)
         root.addHandler(fh)
 
-    _CONFIGURED = True
+
+class _FastFormatter(logging.Formatter):
+    """Formatter that renders the (second-resolution) timestamp once per second."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._cached: tuple[int, str] = (-1, "")  # (second, rendered timestamp)
+
+    def formatTime(self, record: logging.LogRecord, datefmt: str | None = None) -> str:
+        sec = int(record.created)
+        # The pair is read and replaced as one object, so a thread formatting a record from
+        # another second never sees that second's text; racing threads only recompute
+        cached_sec, cached_time = self._cached
+        if sec != cached_sec:
+            cached_time = super().formatTime(record, datefmt)
+            self._cached = (sec, cached_time)
+        return cached_time
 
 
 @contextmanager
 def span(logger: logging.Logger, step: str) -> Iterator[None]:
-    start = time.time()
-    logger.info("step.start: %s", step)
+    enabled = logger.isEnabledFor(logging.INFO)
+    start = time.perf_counter_ns()
+    if enabled:
+        logger.info("step.start: %s", step)
     try:
         yield
     finally:
-        dur_ms = int((time.time() - start) * 1000)
-        logger.info("step.end: %s | durationMs=%d", step, dur_ms)
+        if enabled:
+            dur_ms = (time.perf_counter_ns() - start) // 1_000_000
+            logger.info("step.end: %s | durationMs=%d", step, dur_ms)
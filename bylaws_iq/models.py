@@ -81,22 +81,22 @@ class OutputResult(BaseModel):
 	zoningAnalysis: Dict[str, MetricValue] = Field(default_factory=dict)
 	confidence: float = 0.0
 	citations: List[Dict[str, str]] = Field(default_factory=list)
-	mode: Literal["synthesis"] = "synthesis"
+	mode: Literal["synthesis", "fallback_synthesis"] = "synthesis"
 	latencyMs: int = 0
 
 
-# Canonical metric keys (strict set as requested)
-PARKING_KEYS = [
+# Canonical metric keys (strict set as requested); tuples so they can be shared and hashed
+PARKING_KEYS = (
 	"carParking90Deg",
 	"officesParkingRatio",  # Ratio required for offices
 	"drivewayWidth",
-]
+)
 
-ZONING_KEYS = [
+ZONING_KEYS = (
 	"minLotArea",
 	"minFrontSetback",
 	"minSideSetback",
 	"minRearSetback",
 	"minLotFrontage",
 	"minLotWidth",
-]
+)
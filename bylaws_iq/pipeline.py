@@ -1,15 +1,23 @@
 from __future__ import annotations
 
+import asyncio
+import copy
+import functools
 import time
 import os
-import requests
-import PyPDF2
-import io
-from typing import Any, Dict, List, Optional, Callable
-from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
-
-from .models import OutputResult
+import httpx
+import re
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterator, List, Optional, Callable, Sequence, Tuple, Union
+from urllib.parse import urljoin, urlparse, urlsplit
+from rapidfuzz import fuzz
+from rapidfuzz.utils import default_process
+
+from . import cache
+from .models import PARKING_KEYS, ZONING_KEYS, OutputResult, ZoningDistrict
 from .logging_config import configure_logging, span
 import logging
 from .services import geocode as geocode_service
@@ -17,73 +25,384 @@ from .services import zoning as zoning_service
 from .services import search as search_service
 from .services import scrape as scrape_service
 from .services import llm as llm_service
-from .services.zoning_agent import create_zoning_agent
+from .services import pdf as pdf_service
+
+
+# Domains the fallback search trusts for municipal code (matched against the result's hostname)
+_ALLOWLIST = (".gov", ".us", "municode.com", "ecode360.com", "arcgis.com", "mapgeo.io")
+_FALLBACK_QUERY = "zoning code parking setbacks height {city} {state}"
 
+# Metrics kept in the output: the canonical keys from models, so the filter can't drift
+# from what the UI requests
+_ALLOWED_PARKING = frozenset(PARKING_KEYS)
+_ALLOWED_ZONING = frozenset(ZONING_KEYS)
 
-def _transform_to_metric_values(raw_data: dict, source_title: str, allowed_keys: set = None) -> dict:
+# The fallback sends at most this many documents to the LLM, ranked by _METRIC_TERMS hits
+MAX_SYNTHESIS_DOCS = 3
+_METRIC_TERMS = (
+	"setback", "lot area", "frontage", "lot width", "dimensional",
+	"parking", "driveway", "aisle", "space", "zoning",
+)
+
+
+def _transform_to_metric_values(raw_data: dict, source_title: str, allowed_keys: Optional[frozenset] = None) -> dict:
 	"""Transform raw LLM data to MetricValue objects with optional filtering"""
+	if not raw_data:
+		return {}
+	items = raw_data.items()
+	if allowed_keys:
+		# One C-level set intersection instead of a membership test per key
+		keys = raw_data.keys() & allowed_keys
+		if not keys:
+			return {}
+		if len(keys) < len(raw_data):
+			# Filter in the LLM's key order so the output keeps its layout
+			items = [(key, raw_data[key]) for key in raw_data if key in keys]
+	
 	from .models import MetricValue
 	transformed = {}
-	
-	for key, value in raw_data.items():
-		# Skip keys not in allowed list if filtering is enabled
-		if allowed_keys and key not in allowed_keys:
+	for key, value in items:
+		try:
+			# Common case: the LLM's {"value", "quote", "source", "note"} shape
+			metric_value = value["value"]
+		except (TypeError, KeyError):
+			if isinstance(value, (str, list, int, float)):
+				# Convert raw values to MetricValue (fallback for old format)
+				transformed[key] = MetricValue.model_construct(
+					value=_metric_text(value),
+					verified=True,
+					source=source_title,
+					quote="",
+					note="Extracted from zoning bylaws"
+				)
+			else:
+				# Some other shape; keep as is
+				transformed[key] = value
 			continue
-			
-		if isinstance(value, dict) and all(k in value for k in ['value', 'quote', 'source']):
-			# Already in the correct LLM format, convert to MetricValue
-			transformed[key] = MetricValue(
-				value=str(value.get('value', 'Unknown')),
-				verified=True,
-				source=value.get('source', source_title),
-				quote=value.get('quote', ''),
-				note=value.get('note', 'Extracted from zoning bylaws')
-			)
-		elif isinstance(value, (str, list, int, float)):
-			# Convert raw values to MetricValue (fallback for old format)
-			str_value = str(value) if not isinstance(value, list) else "; ".join(map(str, value))
-			transformed[key] = MetricValue(
-				value=str_value,
-				verified=True,
-				source=source_title,
-				quote="",
-				note="Extracted from zoning bylaws"
-			)
-		else:
-			# If already a MetricValue-like dict, keep as is
+		if 'quote' not in value or 'source' not in value:
+			# Without its evidence the value isn't verified; OutputResult validates the dict as is
 			transformed[key] = value
+			continue
+		# Every field is coerced to text here, so skip re-validation with model_construct
+		transformed[key] = MetricValue.model_construct(
+			value=_metric_text(metric_value),
+			verified=True,
+			source=_optional_text(value['source']),
+			quote=_optional_text(value['quote']),
+			note=_optional_text(value.get('note', 'Extracted from zoning bylaws'))
+		)
 	return transformed
 
 
-def robust_fetch_pdf(pdf_url: str, referrer_url: str = None, logger=None) -> bytes:
+def _optional_text(value: Any) -> Optional[str]:
+	# MetricValue's optional text fields: None stays None, anything else the LLM sent becomes text
+	return None if value is None else _metric_text(value)
+
+
+class _Progress:
+	"""Progress reporter for one pipeline run: logs each message and forwards it to the UI callback.
+
+	With `prefix` (batch runs), messages are tagged with the address they belong to. A failing
+	callback is logged and otherwise ignored so it can never break the pipeline.
+	"""
+
+	__slots__ = ("logger", "callback", "prefix")
+
+	def __init__(
+		self,
+		logger: logging.Logger,
+		callback: Optional[Callable[[str], None]] = None,
+		prefix: Optional[str] = None,
+	) -> None:
+		self.logger = logger
+		self.callback = callback
+		self.prefix = prefix
+
+	def __call__(self, msg: str) -> None:
+		if self.prefix:
+			self.logger.info("progress: %s | %s", self.prefix, msg)
+			msg = f"{self.prefix}: {msg}"
+		else:
+			self.logger.info("progress: %s", msg)
+		if self.callback:
+			try:
+				self.callback(msg)
+			except Exception:
+				self.logger.debug("progress callback failed", exc_info=True)
+
+
+def _metric_text(value: Any) -> str:
+	return "; ".join(map(str, value)) if isinstance(value, list) else str(value)
+
+
+@functools.lru_cache(maxsize=4096)
+def _fuzzy_key(value: str) -> str:
+	"""rapidfuzz-normalised form of a short string (URL, title, place name), memoised across queries."""
+	return default_process(value)
+
+
+def _normalize_address(address: str) -> str:
+	return " ".join(address.lower().split())
+
+
+# The in-process caches below are backed by the on-disk cache so results survive restarts.
+# An address's coordinates and jurisdiction practically never change, so geocodes keep longest.
+_GEOCODE_TTL_S = 30 * 24 * 3600
+_ZONING_TTL_S = 7 * 24 * 3600
+
+
+@functools.lru_cache(maxsize=2048)
+def _cached_geocode(address_key: str) -> Dict[str, Any]:
+	key = cache.key_for(address_key)
+	geo = cache.read_json("geocode", key, max_age=_GEOCODE_TTL_S)
+	if geo is None:
+		geo = geocode_service.geocode_address(address_key)
+		cache.write_json("geocode", key, geo)
+	return geo
+
+
+@functools.lru_cache(maxsize=2048)
+def _cached_legacy_zoning(lat: float, lon: float, city: str, state: str, county: str) -> List[Any]:
+	key = cache.key_for(lat, lon, city, state, county)
+	stored = cache.read_json("zoning", key, max_age=_ZONING_TTL_S)
+	if stored is not None:
+		return [ZoningDistrict(**d) for d in stored]
+	districts = zoning_service.discover_zoning_districts(
+		latitude=lat, longitude=lon, jurisdiction={"city": city, "county": county, "state": state}
+	)
+	cache.write_json("zoning", key, [d.model_dump() for d in districts])
+	return districts
+
+
+def _geocode(address: str, logger: logging.Logger) -> Dict[str, Any]:
+	"""Geocode an address, memoised per process on its normalised form (failures aren't cached)."""
+	with span(logger, "geocode"):
+		# Callers get their own copy; the cached dict is shared across queries
+		return copy.deepcopy(_cached_geocode(_normalize_address(address)))
+
+
+_HSPACE_RE = re.compile(r"[ \t]+")
+
+
+def _html_document_text(html_file_path: str) -> str:
+	"""Readable text of a saved bylaws HTML page: one text node per line, runs of spaces collapsed."""
+	from lxml import etree, html as lxml_html
+
+	# Parsed with lxml directly: only the text is needed, so there's no point building
+	# a BeautifulSoup tree on top of it. The file is fed to the parser in chunks rather
+	# than read and decoded into one string first; the agent always saves it as UTF-8.
+	try:
+		with open(html_file_path, "rb") as f:
+			root = lxml_html.parse(f, parser=etree.HTMLParser(encoding="utf-8")).getroot()
+	except etree.XMLSyntaxError:
+		# Raised for an empty document
+		return ""
+	if root is None:
+		return ""
+	# Remove script, style, and other non-content elements (and comments) in C
+	etree.strip_elements(root, etree.Comment, "script", "style", "nav", "header", "footer", with_tail=False)
+	text = "\n".join(s for s in (t.strip() for t in root.itertext()) if s)
+	return _HSPACE_RE.sub(" ", text)
+
+
+MAX_PDF_BYTES = 50 * 1024 * 1024
+
+# Connect in 3 s, otherwise 15 s: a dead host fails in seconds rather than stalling each
+# strategy for 30 s. Warm-up visits are best-effort, so they get an even shorter budget.
+_FAST_TIMEOUT = httpx.Timeout(15.0, connect=3.0)
+_WARMUP_TIMEOUT = httpx.Timeout(5.0, connect=2.0)
+
+
+def _http2_available() -> bool:
+	try:
+		import h2  # noqa: F401  (installed by the httpx[http2] extra)
+	except ImportError:
+		return False
+	return True
+
+
+# One client for every PDF strategy, so retries, warm-up visits and repeat hosts reuse
+# keep-alive connections and TLS sessions. Over HTTP/2 the warm-up visit and the PDF
+# share a single multiplexed connection; hosts without h2 are spoken to over HTTP/1.1.
+# Headers are passed per request so the client is never mutated.
+_PDF_CLIENT = httpx.Client(
+	http2=_http2_available(),
+	timeout=_FAST_TIMEOUT,
+	limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+	follow_redirects=True,
+)
+
+# Disk cache namespaces for fetched PDFs and their validators
+_PDF_BODY_NS = "pdf-body"
+_PDF_META_NS = "pdf-meta"
+
+# A cached PDF younger than this is used without revalidating (re-runs, resubmissions)
+_PDF_FRESH_S = 6 * 3600
+
+
+class _NotPdfError(Exception):
+	"""The response body isn't a usable PDF (wrong magic, or too large); try the next strategy."""
+
+
+# Hosts that refuse direct PDF downloads until the linking page has been visited
+_REFERRER_REQUIRED_DOMAINS = ("woburnma.gov", "mapgeo.io")
+
+
+def _needs_referrer_visit(referrer_url: str) -> bool:
+	host = (urlparse(referrer_url).hostname or "").lower()
+	return host.endswith(_REFERRER_REQUIRED_DOMAINS)
+
+
+def _is_transient_error(e: Exception) -> bool:
+	# Dropped/refused connections are worth one retry; a server that is merely slow is not
+	if isinstance(e, httpx.TransportError):
+		return not isinstance(e, httpx.ReadTimeout)
+	return isinstance(e, httpx.HTTPStatusError) and e.response.status_code >= 500
+
+
+def _get_streamed(url: str, headers: Optional[Dict[str, str]] = None, timeout: httpx.Timeout = _FAST_TIMEOUT) -> httpx.Response:
+	"""GET with the body left unread; the caller reads it (or closes the response)."""
+	request = _PDF_CLIENT.build_request("GET", url, headers=headers, timeout=timeout)
+	return _PDF_CLIENT.send(request, stream=True)
+
+
+def _fetch_pdf_body(url: str, headers: Optional[Dict[str, str]] = None):
+	"""Download `url` as a PDF; returns (content, response headers)."""
+	response = _get_streamed(url, headers)
+	try:
+		response.raise_for_status()
+		return _read_pdf_body(response), response.headers
+	finally:
+		response.close()
+
+
+def _read_pdf_body(response: httpx.Response, max_bytes: int = MAX_PDF_BYTES) -> bytearray:
+	"""Read a streamed response as a PDF, failing fast on HTML error pages and oversized bodies.
+
+	The buffer is returned as is: copying it into `bytes` would duplicate the whole PDF,
+	and every consumer (PDF parsers, pdftotext, the disk cache) takes any bytes-like object.
+	"""
+	declared = response.headers.get("Content-Length")
+	if declared and declared.isdigit() and int(declared) > max_bytes:
+		response.close()
+		raise _NotPdfError(f"PDF too large: {declared} bytes")
+	buf = bytearray()
+	sniffed = False
+	for chunk in response.iter_bytes(chunk_size=64 * 1024):
+		buf += chunk
+		if len(buf) > max_bytes:
+			response.close()
+			raise _NotPdfError(f"PDF exceeds {max_bytes} bytes")
+		if not sniffed and len(buf) >= 1024:
+			sniffed = True
+			# The header may follow a little leading junk, but always within the first 1 KB
+			if b"%PDF-" not in buf[:1024]:
+				response.close()
+				raise _NotPdfError("response is not a PDF")
+	if not sniffed and b"%PDF-" not in buf:
+		raise _NotPdfError("response is not a PDF")
+	return buf
+
+
+def robust_fetch_pdf(pdf_url: str, referrer_url: str = None, logger=None) -> Union[bytes, bytearray]:
 	"""
 	Robustly fetch a PDF with multiple strategies to bypass access restrictions
 	
+	Fetched PDFs are kept in the on-disk cache. Within _PDF_FRESH_S of being fetched (or
+	last revalidated) a PDF is served from disk without touching the network; after that,
+	one served with an ETag or Last-Modified header is revalidated with a conditional GET,
+	so an unchanged bylaws PDF costs a 304 instead of a full download. The cache is keyed
+	by URL alone: the referrer only helps get past the host, it doesn't change the file.
+	
 	Args:
 		pdf_url (str): URL of the PDF to fetch
 		referrer_url (str, optional): URL of the page where the PDF link was found
 		logger: Logger instance for debugging
 		
 	Returns:
-		bytes: PDF content
+		bytes or bytearray: PDF content
 		
 	Raises:
 		Exception: If all strategies fail
 	"""
+	key = cache.key_for(pdf_url)
+	meta = cache.read_json(_PDF_META_NS, key)
+	cached_pdf = cache.read_bytes(_PDF_BODY_NS, key) if meta else None
+	if cached_pdf is not None:
+		if time.time() - meta.get("fetched_at", 0) < _PDF_FRESH_S:
+			if logger:
+				logger.info(f"♻️ Using cached PDF: {len(cached_pdf)} bytes")
+			return cached_pdf
+		if meta.get("etag") or meta.get("last_modified"):
+			try:
+				content, headers = _revalidate_pdf(pdf_url, meta, cached_pdf, logger)
+				if content is cached_pdf:
+					# Still current: restart the freshness window without rewriting the body
+					cache.write_json(_PDF_META_NS, key, dict(meta, fetched_at=time.time()))
+				else:
+					_store_pdf(key, content, headers)
+				return content
+			except Exception as e:
+				if logger:
+					logger.info(f"♻️ Cached PDF revalidation failed ({e}); fetching afresh")
+
+	try:
+		content, headers = _fetch_pdf_with_strategies(pdf_url, referrer_url, logger)
+	except Exception:
+		if cached_pdf is not None:
+			# The site is refusing us right now; a previously fetched copy beats no document
+			if logger:
+				logger.warning(f"⚠️ All strategies failed; using cached copy of {pdf_url}")
+			return cached_pdf
+		raise
+	_store_pdf(key, content, headers)
+	return content
+
+
+def _revalidate_pdf(pdf_url: str, meta: Dict[str, Any], cached_pdf: bytes, logger=None):
+	"""Conditional GET for a cached PDF; returns (content, headers), content being `cached_pdf` on 304."""
+	headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+	if meta.get("etag"):
+		headers['If-None-Match'] = meta["etag"]
+	if meta.get("last_modified"):
+		headers['If-Modified-Since'] = meta["last_modified"]
+	response = _get_streamed(pdf_url, headers)
+	try:
+		if response.status_code == 304:
+			if logger:
+				logger.info(f"♻️ PDF unchanged (304), using cached copy: {len(cached_pdf)} bytes")
+			return cached_pdf, response.headers
+		response.raise_for_status()
+		return _read_pdf_body(response), response.headers
+	finally:
+		response.close()
+
+
+def _store_pdf(key: str, content: bytes, headers) -> None:
+	# Copies without a validator are still kept: they serve the freshness window and
+	# stand in when every strategy fails later, but are re-downloaded once stale
+	cache.write_bytes(_PDF_BODY_NS, key, content)
+	cache.write_json(_PDF_META_NS, key, {
+		"etag": headers.get("ETag"),
+		"last_modified": headers.get("Last-Modified"),
+		"fetched_at": time.time(),
+	})
+
+
+def _fetch_pdf_with_strategies(pdf_url: str, referrer_url: str = None, logger=None):
+	"""Try each download strategy in turn; returns (content, response headers)."""
 	if logger:
 		logger.info(f"🔄 Attempting robust PDF fetch: {pdf_url}")
 	
 	# Strategy 1: Full browser simulation with session
 	try:
-		session = requests.Session()
-		
-		# Set comprehensive browser-like headers
+		# Set comprehensive browser-like headers (no Connection header: HTTP/2 forbids it,
+		# and the client keeps connections alive anyway)
 		browser_headers = {
 			'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
 			'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
 			'Accept-Language': 'en-US,en;q=0.9',
 			'Accept-Encoding': 'gzip, deflate, br',
-			'Connection': 'keep-alive',
 			'Upgrade-Insecure-Requests': '1',
 			'Sec-Fetch-Dest': 'document',
 			'Sec-Fetch-Mode': 'navigate',
@@ -99,14 +418,14 @@ def robust_fetch_pdf(pdf_url: str, referrer_url: str = None, logger=None) -> byt
 			scheme = urlparse(referrer_url).scheme or 'https'
 			browser_headers['Origin'] = f"{scheme}://{domain}"
 		
-		session.headers.update(browser_headers)
-		
-		# First, visit the referrer page to establish session
-		if referrer_url:
+		# First, visit the referrer page to establish session. Most municipal hosts serve the
+		# PDF without it, so the extra round trip is only paid where it's known to matter;
+		# Strategy 4 still warms up a session on the PDF's own site if this attempt is refused.
+		if referrer_url and _needs_referrer_visit(referrer_url):
 			if logger:
 				logger.info(f"🌐 Visiting referrer page first: {referrer_url}")
 			try:
-				session.get(referrer_url, timeout=15)
+				_PDF_CLIENT.get(referrer_url, headers=browser_headers, timeout=_WARMUP_TIMEOUT)
 			except:
 				pass  # Continue even if referrer visit fails
 		
@@ -114,16 +433,29 @@ def robust_fetch_pdf(pdf_url: str, referrer_url: str = None, logger=None) -> byt
 		if logger:
 			logger.info(f"📄 Strategy 1: Full browser simulation")
 		
-		response = session.get(pdf_url, timeout=30, stream=True)
-		response.raise_for_status()
-		
-		# Verify it's actually a PDF
-		content_type = response.headers.get('content-type', '').lower()
-		if 'pdf' in content_type or pdf_url.lower().endswith('.pdf'):
-			content = response.content
+		content = None
+		for attempt in range(2):
+			try:
+				response = _get_streamed(pdf_url, browser_headers)
+				try:
+					response.raise_for_status()
+					
+					# Verify it's actually a PDF
+					content_type = response.headers.get('content-type', '').lower()
+					if 'pdf' in content_type or pdf_url.lower().endswith('.pdf'):
+						content = _read_pdf_body(response)
+				finally:
+					response.close()
+				break
+			except Exception as e:
+				# One quick retry for flaky connections and server errors; a 403/404 won't change
+				if attempt or not _is_transient_error(e):
+					raise
+				time.sleep(0.25)
+		if content is not None:
 			if logger:
 				logger.info(f"✅ Strategy 1 successful: {len(content)} bytes")
-			return content
+			return content, response.headers
 	
 	except Exception as e:
 		if logger:
@@ -139,13 +471,10 @@ def robust_fetch_pdf(pdf_url: str, referrer_url: str = None, logger=None) -> byt
 			'Accept': '*/*'
 		}
 		
-		response = requests.get(pdf_url, headers=simple_headers, timeout=30)
-		response.raise_for_status()
-		
-		content = response.content
+		content, headers = _fetch_pdf_body(pdf_url, simple_headers)
 		if logger:
 			logger.info(f"✅ Strategy 2 successful: {len(content)} bytes")
-		return content
+		return content, headers
 	
 	except Exception as e:
 		if logger:
@@ -161,13 +490,10 @@ def robust_fetch_pdf(pdf_url: str, referrer_url: str = None, logger=None) -> byt
 			'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'
 		}
 		
-		response = requests.get(pdf_url, headers=mobile_headers, timeout=30)
-		response.raise_for_status()
-		
-		content = response.content
+		content, headers = _fetch_pdf_body(pdf_url, mobile_headers)
 		if logger:
 			logger.info(f"✅ Strategy 3 successful: {len(content)} bytes")
-		return content
+		return content, headers
 	
 	except Exception as e:
 		if logger:
@@ -178,14 +504,12 @@ def robust_fetch_pdf(pdf_url: str, referrer_url: str = None, logger=None) -> byt
 		if logger:
 			logger.info(f"📄 Strategy 4: Government website navigation")
 		
-		session = requests.Session()
-		session.headers.update({
+		nav_headers = {
 			'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
 			'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
 			'Accept-Language': 'en-US,en;q=0.9',
-			'Connection': 'keep-alive',
 			'Upgrade-Insecure-Requests': '1'
-		})
+		}
 		
 		# Extract domain from PDF URL and visit main site first
 		parsed = urlparse(pdf_url)
@@ -196,7 +520,7 @@ def robust_fetch_pdf(pdf_url: str, referrer_url: str = None, logger=None) -> byt
 		
 		# Visit main site
 		try:
-			session.get(main_site, timeout=15)
+			_PDF_CLIENT.get(main_site, headers=nav_headers, timeout=_WARMUP_TIMEOUT)
 		except:
 			pass
 		
@@ -208,23 +532,30 @@ def robust_fetch_pdf(pdf_url: str, referrer_url: str = None, logger=None) -> byt
 			f"{parsed.scheme}://{parsed.netloc}/documents/"
 		]
 		
-		for page in potential_pages:
-			try:
-				if logger:
-					logger.info(f"🌐 Trying navigation page: {page}")
-				session.get(page, timeout=10)
-				break
-			except:
-				continue
+		# Probe them all at once and move on as soon as one answers; stragglers are left to finish
+		# in the background rather than holding up the PDF request
+		if logger:
+			logger.info(f"🌐 Trying navigation pages: {potential_pages}")
+		probe_executor = ThreadPoolExecutor(max_workers=len(potential_pages), thread_name_prefix="bylaws-iq-probe")
+		probes = [
+			probe_executor.submit(_PDF_CLIENT.get, page, headers=nav_headers, timeout=_WARMUP_TIMEOUT)
+			for page in potential_pages
+		]
+		try:
+			for probe in as_completed(probes):
+				try:
+					if probe.result().is_success:
+						break
+				except Exception:
+					continue
+		finally:
+			probe_executor.shutdown(wait=False, cancel_futures=True)
 		
 		# Now try the PDF
-		response = session.get(pdf_url, timeout=30)
-		response.raise_for_status()
-		
-		content = response.content
+		content, headers = _fetch_pdf_body(pdf_url, nav_headers)
 		if logger:
 			logger.info(f"✅ Strategy 4 successful: {len(content)} bytes")
-		return content
+		return content, headers
 	
 	except Exception as e:
 		if logger:
@@ -237,15 +568,12 @@ def robust_fetch_pdf(pdf_url: str, referrer_url: str = None, logger=None) -> byt
 			if logger:
 				logger.info(f"📄 Strategy 5: HTTP fallback to {http_url}")
 			
-			response = requests.get(http_url, headers={
+			content, headers = _fetch_pdf_body(http_url, {
 				'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-			}, timeout=30)
-			response.raise_for_status()
-			
-			content = response.content
+			})
 			if logger:
 				logger.info(f"✅ Strategy 5 successful: {len(content)} bytes")
-			return content
+			return content, headers
 		
 		except Exception as e:
 			if logger:
@@ -265,38 +593,118 @@ def run_query_fallback(
 	"""Fallback query using search results when official bylaws not found"""
 	configure_logging()
 	logger = logging.getLogger("bylaws_iq.pipeline")
-	start_time = time.time()
+	start_ns = time.perf_counter_ns()
 
-	def progress(msg: str) -> None:
-		logger.info("progress: %s", msg)
-		if on_progress:
-			try:
-				on_progress(msg)
-			except Exception:
-				logger.debug("progress callback failed", exc_info=True)
+	progress = _Progress(logger, on_progress)
+
+	prepared = _prepare_fallback(address, zoning_district_info, geo, progress, logger)
+
+	with span(logger, "synthesize_metrics"):
+		progress("🔄 Fallback: Synthesizing metric candidates with LLM")
+		# Citations only depend on the search results, so they're gathered while the LLM runs
+		llm_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bylaws-iq-llm")
+		extraction_future = llm_executor.submit(
+			llm_service.synthesize_metrics,
+			address=address,
+			jurisdiction=prepared["geo"]["jurisdiction"],
+			zoning_districts=prepared["enhanced_zoning_districts"],
+			requested_metrics=requested_metrics,
+			documents=prepared["documents"],
+		)
+		llm_executor.shutdown(wait=False)
+		with span(logger, "collect_citations"):
+			citations = search_service.collect_citations(prepared["search_results"])
+		extraction = extraction_future.result()
+
+	return _fallback_output(address, zoning_district_info, prepared, extraction, start_ns, logger, citations)
 
+
+def run_queries(
+	addresses: List[str],
+	requested_metrics: List[str],
+	on_progress: Optional[Callable[[str], None]] = None,
+) -> List[Dict[str, Any]]:
+	"""Search-based (fallback) query for many addresses with batched LLM synthesis.
+
+	Retrieval (geocode, search, fetch) runs concurrently per address; synthesis then goes out
+	in prompts of up to llm_service.MAX_SYNTHESIS_BATCH queries that share one set of
+	instructions. Results line up with `addresses`; an address whose retrieval fails yields
+	{"address": ..., "error": ...} instead of a result.
+	"""
+	configure_logging()
+	logger = logging.getLogger("bylaws_iq.pipeline")
+	start_ns = time.perf_counter_ns()
+
+	def progress_for(address: str) -> Callable[[str], None]:
+		return _Progress(logger, on_progress, prefix=address)
+
+	results: List[Optional[Dict[str, Any]]] = [None] * len(addresses)
+	ready = []
+	if addresses:
+		with span(logger, "prepare_batch"), ThreadPoolExecutor(
+			max_workers=min(8, len(addresses)), thread_name_prefix="bylaws-iq-batch"
+		) as executor:
+			futures = [
+				executor.submit(_prepare_fallback, address, None, None, progress_for(address), logger)
+				for address in addresses
+			]
+			for i, (address, future) in enumerate(zip(addresses, futures)):
+				try:
+					ready.append((i, future.result()))
+				except Exception as e:
+					logger.error(f"❌ Batch retrieval failed for {address}: {str(e)}", exc_info=True)
+					results[i] = {"address": address, "error": str(e)}
+
+	if ready:
+		with span(logger, "synthesize_metrics_batch"):
+			extractions = llm_service.synthesize_metrics_batch(
+				items=[
+					{
+						"address": addresses[i],
+						"jurisdiction": prepared["geo"]["jurisdiction"],
+						"zoning_districts": prepared["enhanced_zoning_districts"],
+						"documents": prepared["documents"],
+					}
+					for i, prepared in ready
+				],
+				requested_metrics=requested_metrics,
+			)
+		for (i, prepared), extraction in zip(ready, extractions):
+			results[i] = _fallback_output(addresses[i], None, prepared, extraction, start_ns, logger)
+
+	return results
+
+
+def _prepare_fallback(
+	address: str,
+	zoning_district_info: Optional[Dict[str, Any]],
+	geo: Optional[Dict[str, Any]],
+	progress: Callable[[str], None],
+	logger: logging.Logger,
+) -> Dict[str, Any]:
+	"""Retrieval half of the fallback query: geocode, search and fetch/filter documents."""
 	# If geo wasn't provided, do geocoding
 	if not geo:
-		with span(logger, "geocode"):
-			progress("Geocoding address")
-			geo = geocode_service.geocode_address(address)
+		progress("Geocoding address")
+		geo = _geocode(address, logger)
 
-	# Use legacy zoning discovery
-	zoning_districts = []
+	# Legacy zoning discovery only needs the geocode, so it runs alongside the search below
+	legacy_executor = None
+	legacy_future = None
 	if not zoning_district_info:
-		with span(logger, "discover_zoning_legacy"):
-			progress("🔄 Using fallback: Discovering zoning districts")
-		zoning_districts = zoning_service.discover_zoning_districts(
-			latitude=geo["lat"], longitude=geo["lon"], jurisdiction=geo["jurisdiction"]
-		)
-
-	allowlist = [".gov", ".us", "municode.com", "ecode360.com", "arcgis.com", "mapgeo.io"]
+		progress("🔄 Using fallback: Discovering zoning districts")
+		legacy_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bylaws-iq-zoning")
+		legacy_future = legacy_executor.submit(_discover_zoning_legacy, geo, logger)
+		legacy_executor.shutdown(wait=False)
 
 	with span(logger, "search_documents"):
 		progress("🔄 Using fallback: Searching public code sources")
 		
 		# Build enhanced search query with zoning district information
-		base_query = f"zoning code parking setbacks height {geo['jurisdiction'].get('city','')} {geo['jurisdiction'].get('state','')}"
+		base_query = _FALLBACK_QUERY.format(
+			city=geo['jurisdiction'].get('city', ''),
+			state=geo['jurisdiction'].get('state', ''),
+		)
 		
 		# Add zoning district information to search if available
 		if zoning_district_info:
@@ -317,101 +725,253 @@ def run_query_fallback(
 		
 		search_results = search_service.search_documents(
 			query=enhanced_query,
-			allowed_domains=allowlist,
+			allowed_domains=_ALLOWLIST,
 		)
 
+	zoning_districts = legacy_future.result() if legacy_future else []
+
 	with span(logger, "fetch_and_prepare_docs"):
 		progress("🔄 Fallback: Fetching and preparing source documents")
 		documents = []
 		target_city = (geo["jurisdiction"].get("city") or "").lower()
 		target_state = (geo["jurisdiction"].get("state") or "").lower()
-		from rapidfuzz import fuzz
-		for item in search_results[:8]:
-			url = item.get("url")
-			title = item.get("title") or ""
-			if not url:
+		# Fetch all candidates concurrently; HTML pages are parsed as they arrive
+		items = []
+		seen_urls = set()
+		for item in search_results:
+			if not item.get("url"):
 				continue
-			try:
-				text_html, raw_bytes, ctype = scrape_service.fetch(url)
-				if ctype and "pdf" in ctype and raw_bytes:
-					pdf_text = scrape_service.try_extract_pdf_text(url, raw_bytes)
-					text = pdf_text or ""
-				else:
-					if not text_html:
-						continue
-					text = scrape_service.parse_text_from_html(text_html)
-			except Exception:
-				logger.debug("doc.fetch.failed: %s", url, exc_info=True)
+			key = _url_key(item["url"])
+			if key in seen_urls:
+				logger.debug("doc.duplicate: %s", item["url"])
+				continue
+			seen_urls.add(key)
+			items.append(item)
+			if len(items) == 8:
+				break
+		titles = {item["url"]: item.get("title") or "" for item in items}
+		parse_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="bylaws-iq-parse")
+		html_futures = {}
+
+		def on_fetched(url: str, result: Any) -> None:
+			if isinstance(result, BaseException) or _is_pdf_result(result) or not result[0]:
+				return
+			html_futures[url] = parse_executor.submit(_html_candidate, url, titles[url], result[0])
+
+		try:
+			# Only the first 8k characters of each page are used, so HTML downloads stop early
+			fetched = scrape_service.fetch_many(
+				[item["url"] for item in items],
+				max_html_bytes=scrape_service.MAX_HTML_BYTES,
+				on_result=on_fetched,
+			)
+		finally:
+			parse_executor.shutdown(wait=False)
+		pdf_texts = _extract_pdf_texts(items, fetched, logger)
+		parsed = []
+		for i, (item, fetch_result) in enumerate(zip(items, fetched)):
+			url = item["url"]
+			# fetch_many hands failures back as values; log them without re-raising
+			if isinstance(fetch_result, BaseException):
+				logger.debug("doc.fetch.failed: %s", url, exc_info=fetch_result)
 				continue
-			text_lc = text.lower()
-			city_ok = True
-			state_ok = True
-			if target_city:
-				candidates = [target_city, url.lower(), title.lower(), text_lc[:5000]]
-				city_ok = any(fuzz.partial_ratio(target_city, c) >= 70 for c in candidates)
-			if target_state:
-				candidates = [target_state, url.lower(), title.lower(), text_lc[:5000]]
-				state_ok = any(fuzz.partial_ratio(target_state, c) >= 70 for c in candidates)
-			if not (city_ok and state_ok):
+			if _is_pdf_result(fetch_result):
+				parsed.append(_doc_candidate(url, titles[url], pdf_texts.get(i) or ""))
+			elif url in html_futures:
+				try:
+					parsed.append(html_futures[url].result())
+				except Exception:
+					logger.debug("doc.parse.failed: %s", url, exc_info=True)
+
+		# Jurisdiction gate: city and state must each fuzzily match the document's URL,
+		# title or opening text. Both sides are normalised up front, so the scorer runs with
+		# processor=None. Exact containment settles most pairs; the rest get one partial_ratio
+		# whose score_cutoff lets the C engine bail out early, and a failed target
+		# short-circuits the document.
+		targets = [_fuzzy_key(t) for t in (target_city, target_state) if t]
+		keep = [
+			all(
+				t in candidate or fuzz.partial_ratio(t, candidate, processor=None, score_cutoff=70)
+				for t in targets
+			)
+			for _, _, _, candidate in parsed
+		]
+		for (url, title, excerpt, _), ok in zip(parsed, keep):
+			if not ok:
 				logger.info("doc.filtered.jurisdiction: %s", url)
 				continue
-			excerpt = text[:8000]
 			documents.append({"url": url, "title": title, "excerpt": excerpt})
+		documents = _select_relevant_documents(documents, zoning_district_info, logger)
 		logger.info("docs.prepared: %d", len(documents))
 
-	with span(logger, "synthesize_metrics"):
-		progress("🔄 Fallback: Synthesizing metric candidates with LLM")
-		
-		# Add discovered zoning district
-		enhanced_zoning_districts = []
-		if zoning_district_info:
-			from .models import ZoningDistrict
-			discovered_district = ZoningDistrict(
-				code=zoning_district_info.get('zoning_code', ''),
-				name=zoning_district_info.get('zoning_name', ''),
-				overlays=zoning_district_info.get('overlays', []),
-				source=zoning_district_info.get('zoning_map_url', 'Official Zoning Map Analysis')
-			)
-			enhanced_zoning_districts = [discovered_district]
-		else:
-			enhanced_zoning_districts = []
-		
-		extraction = llm_service.synthesize_metrics(
-			address=address,
-			jurisdiction=geo["jurisdiction"],
-			zoning_districts=enhanced_zoning_districts,
-			requested_metrics=requested_metrics,
-			documents=documents,
+	# Add discovered zoning district
+	enhanced_zoning_districts = []
+	if zoning_district_info:
+		from .models import ZoningDistrict
+		discovered_district = ZoningDistrict(
+			code=zoning_district_info.get('zoning_code', ''),
+			name=zoning_district_info.get('zoning_name', ''),
+			overlays=zoning_district_info.get('overlays', []),
+			source=zoning_district_info.get('zoning_map_url', 'Official Zoning Map Analysis')
 		)
+		enhanced_zoning_districts = [discovered_district]
+	else:
+		enhanced_zoning_districts = []
 
+	return {
+		"geo": geo,
+		"zoning_districts": zoning_districts,
+		"enhanced_zoning_districts": enhanced_zoning_districts,
+		"search_results": search_results,
+		"documents": documents,
+	}
+
+
+def _is_pdf_result(result: Tuple[Optional[str], Optional[bytes], Optional[str]]) -> bool:
+	_, raw_bytes, ctype = result
+	return bool(ctype and "pdf" in ctype and raw_bytes)
+
+
+# Fallback documents are only used through their opening text, so PDFs are parsed
+# no further than this; a few pages comfortably cover the excerpt after cover/TOC pages
+_CANDIDATE_EXCERPT_CHARS = 8000
+_CANDIDATE_MATCH_CHARS = 5000
+_CANDIDATE_PDF_PAGES = 10
+
+
+def _doc_candidate(url: str, title: str, text: str) -> Tuple[str, str, str, str]:
+	"""(url, title, excerpt, match key) for one fetched fallback document."""
+	# Only the opening text is used (matching and the excerpt); keep just that slice
+	# so full document texts can be freed while the rest are parsed. Slice before
+	# lower() so no lowercased copy of the whole document is ever built
+	head = text[:_CANDIDATE_EXCERPT_CHARS]
+	text_lc_head = head[:_CANDIDATE_MATCH_CHARS].lower()
+	candidate = f"{_fuzzy_key(url)} || {_fuzzy_key(title)} || {default_process(text_lc_head)}"
+	return url, title, head, candidate
+
+
+def _html_candidate(url: str, title: str, html: str) -> Tuple[str, str, str, str]:
+	return _doc_candidate(url, title, scrape_service.parse_text_from_html(html))
+
+
+def _url_key(url: str) -> Tuple[str, str, str, str]:
+	"""Identity of a URL for de-duplication: ignores the fragment, host case and a trailing slash."""
+	u = urlsplit(url)
+	return (u.scheme, u.netloc.lower(), u.path.rstrip("/"), u.query)
+
+
+def _select_relevant_documents(
+	documents: List[Dict[str, Any]],
+	zoning_district_info: Optional[Dict[str, Any]],
+	logger: logging.Logger,
+) -> List[Dict[str, Any]]:
+	"""Keep the MAX_SYNTHESIS_DOCS documents that mention the requested metrics most.
+
+	Scoring is a plain term count over the title and excerpt (plus the district code when
+	known); the survivors keep their search-rank order, and ties favour the higher rank.
+	"""
+	if len(documents) <= MAX_SYNTHESIS_DOCS:
+		return documents
+	terms = list(_METRIC_TERMS)
+	if zoning_district_info and zoning_district_info.get("zoning_code"):
+		terms.append(zoning_district_info["zoning_code"].lower())
+	scores = []
+	for doc in documents:
+		text = f"{doc['title']} {doc['excerpt']}".lower()
+		scores.append(sum(text.count(term) for term in terms))
+	ranked = sorted(range(len(documents)), key=lambda i: (-scores[i], i))[:MAX_SYNTHESIS_DOCS]
+	for i in sorted(set(range(len(documents))) - set(ranked)):
+		logger.info("doc.dropped.relevance: %s (score=%d)", documents[i]["url"], scores[i])
+	return [documents[i] for i in sorted(ranked)]
+
+
+def _extract_pdf_texts(items: List[Dict[str, Any]], fetched: List[Any], logger: logging.Logger) -> Dict[int, Optional[str]]:
+	"""Extract text from the fetched PDFs, keyed by position in `items`.
+
+	Extraction is CPU-bound, so two or more PDFs are extracted in parallel worker processes;
+	a single PDF isn't worth the hand-off and is extracted inline.
+	"""
+	jobs = [
+		(i, item["url"], result[1])
+		for i, (item, result) in enumerate(zip(items, fetched))
+		if not isinstance(result, BaseException) and _is_pdf_result(result)
+	]
+	if len(jobs) < 2:
+		return {i: scrape_service.try_extract_pdf_text(url, raw, _CANDIDATE_PDF_PAGES) for i, url, raw in jobs}
+
+	with span(logger, "pdf.extract_parallel"):
+		try:
+			pool = pdf_service.process_pool()
+			futures = {i: pool.submit(scrape_service.try_extract_pdf_text, url, raw, _CANDIDATE_PDF_PAGES) for i, url, raw in jobs}
+		except Exception:
+			logger.debug("pdf.pool.unavailable, extracting inline", exc_info=True)
+			pdf_service.process_pool.cache_clear()
+			return {i: scrape_service.try_extract_pdf_text(url, raw, _CANDIDATE_PDF_PAGES) for i, url, raw in jobs}
+		texts: Dict[int, Optional[str]] = {}
+		for i, url, raw in jobs:
+			try:
+				texts[i] = futures[i].result()
+			except BrokenProcessPool:
+				# A crashed worker poisons the pool; replace it on the next query
+				pdf_service.process_pool.cache_clear()
+				texts[i] = scrape_service.try_extract_pdf_text(url, raw, _CANDIDATE_PDF_PAGES)
+			except Exception:
+				logger.debug("pdf.extract.failed: %s", url, exc_info=True)
+				texts[i] = None
+		return texts
+
+
+def _discover_zoning_legacy(geo: Dict[str, Any], logger: logging.Logger) -> List[Any]:
+	with span(logger, "discover_zoning_legacy"):
+		jurisdiction = geo["jurisdiction"]
+		# ~11 m grid: points on the same parcel/block share one lookup
+		return list(_cached_legacy_zoning(
+			round(geo["lat"], 4),
+			round(geo["lon"], 4),
+			jurisdiction.get("city") or "",
+			jurisdiction.get("state") or "",
+			jurisdiction.get("county") or "",
+		))
+
+
+def _fallback_output(
+	address: str,
+	zoning_district_info: Optional[Dict[str, Any]],
+	prepared: Dict[str, Any],
+	extraction: Dict[str, Any],
+	start_ns: int,
+	logger: logging.Logger,
+	citations: Optional[List[Dict[str, str]]] = None,
+) -> Dict[str, Any]:
+	"""Assemble the fallback result dict from prepared documents and the LLM extraction.
+
+	`citations` may be passed in when the caller already collected them.
+	"""
 	verified = extraction
 
-	with span(logger, "collect_citations"):
-		citations = search_service.collect_citations(search_results)
+	if citations is None:
+		with span(logger, "collect_citations"):
+			citations = search_service.collect_citations(prepared["search_results"])
 
 	# Prepare final zoning districts output (prioritize discovered district)
-	final_zoning_districts = enhanced_zoning_districts if zoning_district_info else zoning_districts
+	final_zoning_districts = prepared["enhanced_zoning_districts"] if zoning_district_info else prepared["zoning_districts"]
 	
 	# Transform raw LLM data to MetricValue objects with proper filtering
 	source_title = "Fallback Search Results"
 	
-	# Define allowed metrics (matching old implementation)
-	allowed_parking = {"carParking90Deg", "officesParkingRatio", "drivewayWidth"}
-	allowed_zoning = {"minLotArea", "minFrontSetback", "minSideSetback", "minRearSetback", "minLotFrontage", "minLotWidth"}
-	
-	transformed_zoning_analysis = _transform_to_metric_values(verified.get("zoningAnalysis", {}), source_title, allowed_zoning)
-	transformed_parking_summary = _transform_to_metric_values(verified.get("parkingSummary", {}), source_title, allowed_parking)
+	transformed_zoning_analysis = _transform_to_metric_values(verified.get("zoningAnalysis", {}), source_title, _ALLOWED_ZONING)
+	transformed_parking_summary = _transform_to_metric_values(verified.get("parkingSummary", {}), source_title, _ALLOWED_PARKING)
 	
 	output = OutputResult(
 		address=address,
-		jurisdiction=geo["jurisdiction"],
+		jurisdiction=prepared["geo"]["jurisdiction"],
 		zoningDistricts=final_zoning_districts,
 		parkingSummary=transformed_parking_summary,
 		zoningAnalysis=transformed_zoning_analysis,
 		confidence=llm_service.estimate_confidence(verified),
 		citations=citations,
 		mode="fallback_synthesis",
-		latencyMs=int((time.time() - start_time) * 1000),
+		latencyMs=(time.perf_counter_ns() - start_ns) // 1_000_000,
 	)
 	
 	# Add zoning district discovery metadata to output if available
@@ -430,6 +990,207 @@ def run_query_fallback(
 	return output_dict
 
 
+
+# Evidence that a page states a value for a metric: its label followed, within the same
+# sentence, by a number in the metric's unit, or by a "(unit)" table header and a number.
+# Table-of-contents lines ("Front yard setbacks ..... 45") match neither.
+_FEET = r"(?:'|ft\b|feet\b|foot\b)"
+_SQFT = r"(?:sq\.?\s*(?:ft|feet)\b|square\s+feet\b|acres?\b)"
+
+
+def _metric_value_re(label: str, unit: str) -> "re.Pattern[str]":
+	return re.compile(
+		rf"{label}[^.]{{0,200}}?(?:\d[\d,]*(?:\.\d+)?\s*{unit}|\(\s*{unit}\s*\)[^.]{{0,200}}?\d)",
+		re.IGNORECASE,
+	)
+
+
+_METRIC_VALUE_RES = {
+	"carParking90Deg": re.compile(rf"\d+(?:\.\d+)?\s*{_FEET}?\s*(?:x|by|×)\s*\d+(?:\.\d+)?\s*{_FEET}", re.IGNORECASE),
+	"officesParkingRatio": re.compile(
+		rf"spaces?\s+(?:per|for\s+(?:each|every))\s+(?:\w+\s+){{0,2}}?\d[\d,]*\s*{_SQFT}", re.IGNORECASE
+	),
+	"drivewayWidth": _metric_value_re(r"driveway", _FEET),
+	"minLotArea": _metric_value_re(r"lot\s+area", _SQFT),
+	"minFrontSetback": _metric_value_re(r"front\s+(?:yard|setback)", _FEET),
+	"minSideSetback": _metric_value_re(r"side\s+(?:yard|setback)", _FEET),
+	"minRearSetback": _metric_value_re(r"rear\s+(?:yard|setback)", _FEET),
+	"minLotFrontage": _metric_value_re(r"frontage", _FEET),
+	"minLotWidth": _metric_value_re(r"lot\s+width", _FEET),
+}
+
+# Pages still read once the district's section and every requested metric have turned up,
+# for footnotes and conditions that trail a table
+_SECTION_TAIL_PAGES = 5
+
+
+def _section_stop(zoning_code: Optional[str], requested_metrics: Sequence[str]) -> Optional[Callable[[str], bool]]:
+	"""Page-by-page stop condition for an official bylaws PDF, or None to read all of it.
+
+	Reading ends _SECTION_TAIL_PAGES after two things have both been seen: a page naming the
+	district code next to a metric value (its section or dimensional table, not a contents
+	entry), and a value for every requested metric. A document where that never happens is
+	read in full, as before. Stateful, so build one per document.
+	"""
+	if not zoning_code or not requested_metrics or any(m not in _METRIC_VALUE_RES for m in requested_metrics):
+		return None
+	patterns = [_METRIC_VALUE_RES[m] for m in requested_metrics]
+	# Lookarounds rather than \b so "R-1" matches neither "R-10" nor "CR-1"
+	code_re = re.compile(rf"(?<![\w-]){re.escape(zoning_code)}(?![\w-])", re.IGNORECASE)
+	pending = patterns
+	section_seen = False
+	tail: Optional[int] = None
+
+	def until(page: str) -> bool:
+		nonlocal pending, section_seen, tail
+		if tail is not None:
+			tail -= 1
+			return tail <= 0
+		if not section_seen and code_re.search(page) and any(p.search(page) for p in patterns):
+			section_seen = True
+		pending = [p for p in pending if not p.search(page)]
+		if section_seen and not pending:
+			tail = _SECTION_TAIL_PAGES
+		return False
+
+	return until
+
+
+def _prepare_official_doc(
+	official_doc: Dict[str, Any],
+	logger: logging.Logger,
+	progress: Callable[[str], None],
+	zoning_code: Optional[str] = None,
+	requested_metrics: Sequence[str] = (),
+) -> Dict[str, Any]:
+	"""Read or fetch one official bylaws document and return it as a synthesis source.
+
+	Pure blocking work (file/network I/O and PDF parsing) so it can run on a worker thread or
+	behind `asyncio.to_thread`. Raises on any failure; the caller decides how to fall back.
+	PDFs stop being read shortly after the district's section and every requested metric
+	have turned up (see `_section_stop`).
+	"""
+	doc_type = official_doc.get('type', 'pdf')
+	url = official_doc.get('url')
+	logger.info("🏛️ Processing official bylaws (%s): %s", doc_type, url)
+	if logger.isEnabledFor(logging.DEBUG):
+		logger.debug("📄 Document metadata: %s", list(official_doc.keys()))
+	
+	if doc_type == 'ecode360_pdf':
+		# Handle ecode360 PDF file
+		progress("📄 Processing ecode360 PDF document")
+		pdf_file_path = official_doc.get('filepath')
+		
+		logger.info("🔍 Looking for PDF file at: %s", pdf_file_path)
+		logger.info("📁 File exists: %s", os.path.exists(pdf_file_path) if pdf_file_path else 'No filepath provided')
+		
+		if not (pdf_file_path and os.path.exists(pdf_file_path)):
+			raise Exception(f"ecode360 PDF file not found: {pdf_file_path}")
+		logger.info("📖 Reading ecode360 PDF file: %s", pdf_file_path)
+		try:
+			pages = pdf_service.page_texts(pdf_file_path, _section_stop(zoning_code, requested_metrics))
+			logger.info("📄 Read %d PDF pages", len(pages))
+			text = "\n".join(pages)
+		except Exception as pdf_error:
+			logger.error("❌ Error reading PDF file: %s", pdf_error)
+			raise Exception(f"Failed to read PDF file {pdf_file_path}: {str(pdf_error)}")
+		
+		logger.info("✅ Loaded %d characters from ecode360 PDF document", len(text))
+		progress("✅ Ecode360 PDF Document Processed Successfully")
+	
+	elif doc_type == 'ecode360_html':
+		# Handle ecode360 HTML file (fallback)
+		progress("📄 Processing ecode360 HTML document")
+		html_file_path = official_doc.get('filepath')
+		
+		if not (html_file_path and os.path.exists(html_file_path)):
+			raise Exception(f"ecode360 HTML file not found: {html_file_path}")
+		logger.info("📖 Reading ecode360 HTML file: %s", html_file_path)
+		text = _html_document_text(html_file_path)
+		
+		logger.info("✅ Loaded %d characters from ecode360 HTML document", len(text))
+		progress("✅ Ecode360 HTML Document Processed Successfully")
+	
+	elif doc_type == 'ecode360_txt':
+		# Handle legacy ecode360 .txt file (for backward compatibility)
+		progress("📄 Processing ecode360 text document")
+		txt_file_path = official_doc.get('txt_file_path') or official_doc.get('filepath')
+		
+		if not (txt_file_path and os.path.exists(txt_file_path)):
+			raise Exception(f"ecode360 text file not found: {txt_file_path}")
+		logger.info("📖 Reading ecode360 text file: %s", txt_file_path)
+		with open(txt_file_path, 'r', encoding='utf-8') as f:
+			text = f.read()
+		
+		logger.info("✅ Loaded %d characters from ecode360 document", len(text))
+		progress("✅ Ecode360 Document Processed Successfully")
+	
+	else:
+		# Handle standard PDF document
+		url = official_doc['url']
+		progress("🔄 Accessing official document (may try multiple strategies)")
+		
+		# Referrer is the page where we found this PDF, or else the site root
+		referrer_url = official_doc.get('source_page')
+		if not referrer_url:
+			parsed = urlparse(url)
+			referrer_url = f"{parsed.scheme}://{parsed.netloc}/"
+		
+		# Use robust PDF fetching with multiple strategies
+		pdf_content = robust_fetch_pdf(url, referrer_url, logger)
+		progress("✅ Successfully accessed official document")
+		
+		# Read up to the end of the district's section (the whole document if it can't be placed)
+		pages = pdf_service.page_texts(pdf_content, _section_stop(zoning_code, requested_metrics))
+		logger.info("📄 Read %d PDF pages", len(pages))
+		text = "\n".join(pages)
+	
+	logger.info("✅ Using official bylaws document only: %d chars", len(text))
+	progress(f"✅ Extracted {len(text):,} characters from official document")
+	return {
+		"url": url,
+		"title": official_doc['title'],
+		"text": text,  # Full text up to the end of the district's section
+		"score": 1.0,
+		"source": "official_bylaws",
+		"city_match": 1.0,
+		"domain_priority": 1.0
+	}
+
+
+def _prepare_official_docs(
+	official_bylaws_documents: List[Dict[str, Any]],
+	logger: logging.Logger,
+	progress: Callable[[str], None],
+	zoning_code: Optional[str] = None,
+	requested_metrics: Sequence[str] = (),
+) -> List[Dict[str, Any]]:
+	"""Prepare every official bylaws document, in order, as the ONLY synthesis sources.
+
+	Blocking; safe to hand to `asyncio.to_thread`. Several documents are fetched concurrently
+	(socket reads and PDF parsing spend most of their time outside the GIL). The first failure is
+	logged and re-raised so the caller can offer the fallback search.
+	"""
+	def prepare(official_doc: Dict[str, Any]) -> Dict[str, Any]:
+		try:
+			return _prepare_official_doc(official_doc, logger, progress, zoning_code, requested_metrics)
+		except Exception as e:
+			logger.error("❌ Failed to fetch official bylaws %s: %s", official_doc.get('url'), e)
+			raise
+	
+	progress("🏛️ Fetching official bylaws document")
+	if len(official_bylaws_documents) <= 1:
+		return [prepare(doc) for doc in official_bylaws_documents]
+	
+	pool = ThreadPoolExecutor(max_workers=min(4, len(official_bylaws_documents)))
+	try:
+		# map() yields in input order and re-raises the first failure it reaches
+		return list(pool.map(prepare, official_bylaws_documents))
+	finally:
+		# Don't wait for the remaining fetches once one has failed
+		pool.shutdown(wait=False, cancel_futures=True)
+
+
 def run_query_with_manual_zoning(
 	address: str,
 	requested_metrics: List[str],
@@ -443,15 +1204,9 @@ def run_query_with_manual_zoning(
 	"""Run query pipeline with manually provided zoning district information"""
 	configure_logging()
 	logger = logging.getLogger("bylaws_iq.pipeline")
-	start_time = time.time()
+	start_ns = time.perf_counter_ns()
 
-	def progress(msg: str) -> None:
-		logger.info("progress: %s", msg)
-		if on_progress:
-			try:
-				on_progress(msg)
-			except Exception:
-				logger.debug("progress callback failed", exc_info=True)
+	progress = _Progress(logger, on_progress)
 
 	# Create zoning district info from manual input
 	zoning_district_info = {
@@ -467,6 +1222,8 @@ def run_query_with_manual_zoning(
 
 	# Use the existing zoning agent if provided, otherwise create new one
 	if zoning_agent is None:
+		# Imported here: the agents pull in Selenium, which fallback-only callers never need
+		from .services.zoning_agent import create_zoning_agent
 		zoning_agent = create_zoning_agent()
 		logger.info("🔧 Created new zoning agent for manual zoning processing")
 	else:
@@ -552,144 +1309,20 @@ def run_query_with_manual_zoning(
 
 	with span(logger, "fetch_and_prepare_docs"):
 		progress("Preparing official bylaws document")
-		documents = []
-		
-		# Use ONLY the official bylaws document we discovered
-		progress("🏛️ Fetching official bylaws document")
-		for official_doc in official_bylaws_documents:
-			try:
-				doc_type = official_doc.get('type', 'pdf')
-				url = official_doc['url']
-				logger.info(f"🏛️ Processing official bylaws ({doc_type}): {url}")
-				logger.info(f"📄 Document metadata: {list(official_doc.keys())}")
-				
-				text = ""
-				
-				if doc_type == 'ecode360_pdf':
-					# Handle ecode360 PDF file
-					progress("📄 Processing ecode360 PDF document")
-					pdf_file_path = official_doc.get('filepath')
-					
-					logger.info(f"🔍 Looking for PDF file at: {pdf_file_path}")
-					logger.info(f"📁 File exists: {os.path.exists(pdf_file_path) if pdf_file_path else 'No filepath provided'}")
-					
-					if pdf_file_path and os.path.exists(pdf_file_path):
-						logger.info(f"📖 Reading ecode360 PDF file: {pdf_file_path}")
-						
-						try:
-							with open(pdf_file_path, 'rb') as f:
-								pdf_reader = PyPDF2.PdfReader(f)
-								text = ""
-								page_count = len(pdf_reader.pages)
-								logger.info(f"📄 PDF has {page_count} pages")
-								
-								for i, page in enumerate(pdf_reader.pages):
-									page_text = page.extract_text()
-									text += page_text + "\n"
-									logger.info(f"📄 Page {i+1}: extracted {len(page_text)} characters")
-							
-							logger.info(f"✅ Loaded {len(text):,} characters from ecode360 PDF document")
-							progress("✅ Ecode360 PDF Document Processed Successfully")
-						except Exception as pdf_error:
-							logger.error(f"❌ Error reading PDF file: {str(pdf_error)}")
-							raise Exception(f"Failed to read PDF file {pdf_file_path}: {str(pdf_error)}")
-					else:
-						raise Exception(f"ecode360 PDF file not found: {pdf_file_path}")
-				
-				elif doc_type == 'ecode360_html':
-					# Handle ecode360 HTML file (fallback)
-					progress("📄 Processing ecode360 HTML document")
-					html_file_path = official_doc.get('filepath')
-					
-					if html_file_path and os.path.exists(html_file_path):
-						logger.info(f"📖 Reading ecode360 HTML file: {html_file_path}")
-						
-						with open(html_file_path, 'r', encoding='utf-8') as f:
-							html_content = f.read()
-						
-						# Extract text from HTML using BeautifulSoup
-						soup = BeautifulSoup(html_content, 'html.parser')
-						
-						# Remove script, style, and other non-content elements
-						for script in soup(["script", "style", "nav", "header", "footer"]):
-							script.decompose()
-						
-						# Get text content
-						text_content = soup.get_text()
-						lines = (line.strip() for line in text_content.splitlines())
-						chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-						text = '\n'.join(chunk for chunk in chunks if chunk)
-						
-						logger.info(f"✅ Loaded {len(text):,} characters from ecode360 HTML document")
-						progress("✅ Ecode360 HTML Document Processed Successfully")
-					else:
-						raise Exception(f"ecode360 HTML file not found: {html_file_path}")
-				
-				elif doc_type == 'ecode360_txt':
-					# Handle legacy ecode360 .txt file (for backward compatibility)
-					progress("📄 Processing ecode360 text document")
-					txt_file_path = official_doc.get('txt_file_path') or official_doc.get('filepath')
-					
-					if txt_file_path and os.path.exists(txt_file_path):
-						logger.info(f"📖 Reading ecode360 text file: {txt_file_path}")
-						
-						with open(txt_file_path, 'r', encoding='utf-8') as f:
-							text = f.read()
-						
-						logger.info(f"✅ Loaded {len(text):,} characters from ecode360 document")
-						progress("✅ Ecode360 Document Processed Successfully")
-					else:
-						raise Exception(f"ecode360 text file not found: {txt_file_path}")
-				
-				else:
-					# Handle standard PDF document
-					progress("🔄 Accessing official document (may try multiple strategies)")
-					
-					# Try to get the referrer URL (the page where we found this PDF)
-					referrer_url = None
-					# Look for "source_page" in the official_doc metadata if available
-					if 'source_page' in official_doc:
-						referrer_url = official_doc['source_page']
-					else:
-						# Generate a reasonable referrer based on the domain
-						from urllib.parse import urlparse
-						parsed = urlparse(url)
-						referrer_url = f"{parsed.scheme}://{parsed.netloc}/"
-					
-					# Use robust PDF fetching with multiple strategies
-					pdf_content = robust_fetch_pdf(url, referrer_url, logger)
-					progress("✅ Successfully accessed official document")
-					
-					# Extract text from PDF
-					pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_content))
-					for page in pdf_reader.pages:  # Use all pages for official document
-						text += page.extract_text() + "\n"
-				
-				# Add the official document as the ONLY source
-				documents.append({
-					"url": official_doc.get('url', url),  # Use URL from document
-					"title": official_doc['title'],
-					"text": text,  # Use full text for official document
-					"score": 1.0,
-					"source": "official_bylaws",
-					"city_match": 1.0,
-					"domain_priority": 1.0
-				})
-				
-				logger.info(f"✅ Using official bylaws document only: {len(text)} chars")
-				progress(f"✅ Extracted {len(text):,} characters from official document")
-				
-			except Exception as e:
-				logger.error(f"❌ Failed to fetch official bylaws {url}: {str(e)}")
-				# If we can't fetch the official document, we need fallback
-				return {
-					"status": "fallback_permission_required",
-					"message": "We found the official bylaws document but couldn't access it. Would you like us to try our fallback search method instead?",
-					"address": address,
-					"zoning_district_info": zoning_district_info,
-					"geo": geo,
-					"requested_metrics": requested_metrics
-				}
+		try:
+			documents = _prepare_official_docs(
+				official_bylaws_documents, logger, progress, zoning_district_info.get('zoning_code'), requested_metrics
+			)
+		except Exception:
+			# If we can't fetch the official document, we need fallback
+			return {
+				"status": "fallback_permission_required",
+				"message": "We found the official bylaws document but couldn't access it. Would you like us to try our fallback search method instead?",
+				"address": address,
+				"zoning_district_info": zoning_district_info,
+				"geo": geo,
+				"requested_metrics": requested_metrics
+			}
 		
 		logger.info("docs.prepared: %d (official only)", len(documents))
 
@@ -745,13 +1378,15 @@ def run_query_with_manual_zoning(
 			raise e
 
 	verified = extraction
+	# The official document that sourced the metrics (citations, source title, output metadata)
+	first_bylaws = official_bylaws_documents[0] if official_bylaws_documents else None
 
 	with span(logger, "collect_citations"):
 		# Create citation from the official bylaws document only
 		citations = [
 			{
-				"label": official_bylaws_documents[0]['title'],
-				"url": official_bylaws_documents[0]['url'],
+				"label": first_bylaws['title'],
+				"url": first_bylaws['url'],
 				"type": "official_bylaws"
 			}
 		]
@@ -761,14 +1396,10 @@ def run_query_with_manual_zoning(
 	final_zoning_districts = enhanced_zoning_districts
 	
 	# Transform raw LLM data to MetricValue objects with proper filtering
-	source_title = official_bylaws_documents[0]['title'] if official_bylaws_documents else "Official Bylaws"
-	
-	# Define allowed metrics (matching old implementation)
-	allowed_parking = {"carParking90Deg", "officesParkingRatio", "drivewayWidth"}
-	allowed_zoning = {"minLotArea", "minFrontSetback", "minSideSetback", "minRearSetback", "minLotFrontage", "minLotWidth"}
+	source_title = first_bylaws['title'] if first_bylaws else "Official Bylaws"
 	
-	transformed_zoning_analysis = _transform_to_metric_values(verified.get("zoningAnalysis", {}), source_title, allowed_zoning)
-	transformed_parking_summary = _transform_to_metric_values(verified.get("parkingSummary", {}), source_title, allowed_parking)
+	transformed_zoning_analysis = _transform_to_metric_values(verified.get("zoningAnalysis", {}), source_title, _ALLOWED_ZONING)
+	transformed_parking_summary = _transform_to_metric_values(verified.get("parkingSummary", {}), source_title, _ALLOWED_PARKING)
 
 	output = OutputResult(
 		address=address,
@@ -778,7 +1409,7 @@ def run_query_with_manual_zoning(
 		confidence=llm_service.estimate_confidence(verified),
 		citations=citations,
 		mode="synthesis",
-		latencyMs=int((time.time() - start_time) * 1000),
+		latencyMs=(time.perf_counter_ns() - start_ns) // 1_000_000,
 		zoningDistricts=final_zoning_districts,
 	)
 	
@@ -794,10 +1425,10 @@ def run_query_with_manual_zoning(
 		}
 	
 	# Add official bylaws source if available
-	if official_bylaws_documents:
+	if first_bylaws:
 		output_dict["officialBylawsSource"] = {
-			"title": official_bylaws_documents[0]['title'],
-			"url": official_bylaws_documents[0]['url'],
+			"title": first_bylaws['title'],
+			"url": first_bylaws['url'],
 			"discoveryMethod": "Official Website Search"
 		}
 	logger.info("result.latencyMs=%d confidence=%.3f mode=%s", output.latencyMs, output.confidence, output.mode)
@@ -811,26 +1442,28 @@ def run_query(
 ) -> Dict[str, Any]:
 	configure_logging()
 	logger = logging.getLogger("bylaws_iq.pipeline")
-	start_time = time.time()
+	start_ns = time.perf_counter_ns()
 
-	def progress(msg: str) -> None:
-		logger.info("progress: %s", msg)
-		if on_progress:
-			try:
-				on_progress(msg)
-			except Exception:
-				logger.debug("progress callback failed", exc_info=True)
+	progress = _Progress(logger, on_progress)
 
-	with span(logger, "geocode"):
-		progress("Geocoding address")
-		geo = geocode_service.geocode_address(address)
+	# Geocoding is independent of zoning district discovery (the map agent parses the
+	# address itself), so it runs in the background while the agent works.
+	progress("Geocoding address")
+	geo_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bylaws-iq-geocode")
+	geo_future = geo_executor.submit(_geocode, address, logger)
+	geo_executor.shutdown(wait=False)
 
-	# Initialize our new zoning discovery system
+	# Initialize our new zoning discovery system (imported here: the agents pull in Selenium)
+	from .services.zoning_agent import create_zoning_agent
 	zoning_agent = create_zoning_agent()
 	zoning_district_info = None
 	zoning_map_failed = False
 	official_website_from_map_discovery = None
 	
+	# Bylaws discovery doesn't depend on the district, so it runs alongside the map analysis;
+	# find_zoning_bylaws() below picks up its result
+	zoning_agent.prefetch_zoning_bylaws(address)
+	
 	with span(logger, "discover_zoning_district"):
 		progress("🗺️ Discovering zoning district for address")
 		try:
@@ -838,20 +1471,16 @@ def run_query(
 			zoning_district_info = zoning_agent.find_zoning_district(address)
 			
 			# Try to preserve the official website URL even if zoning district discovery failed
-			try:
-				if hasattr(zoning_agent, 'zoning_map_agent') and hasattr(zoning_agent.zoning_map_agent, 'official_website'):
-					official_website_from_map_discovery = zoning_agent.zoning_map_agent.official_website
-					if official_website_from_map_discovery:
-						logger.info(f"🌐 Preserved official website from map discovery: {official_website_from_map_discovery}")
-			except Exception:
-				logger.debug("Could not extract official website from zoning map agent")
+			official_website_from_map_discovery = getattr(zoning_agent.map_agent, '_last_official_website', None)
+			if official_website_from_map_discovery:
+				logger.info(f"🌐 Preserved official website from map discovery: {official_website_from_map_discovery}")
 			
 			if zoning_district_info:
 				# Debug: Check for None values in zoning district data
 				zoning_code = zoning_district_info.get('zoning_code')
 				zoning_name = zoning_district_info.get('zoning_name')
 				if zoning_code is None or zoning_name is None:
-					logger.warning(f"🔍 DEBUG: Zoning district has None values - keys: {list(zoning_district_info.keys())}")
+					logger.warning("🔍 DEBUG: Zoning district has None values - keys: %s", list(zoning_district_info))
 				
 				logger.info(f"✅ Zoning district found: {zoning_code} - {zoning_name}")
 				progress(f"✅ Found zoning district: {zoning_code} - {zoning_name}")
@@ -864,6 +1493,8 @@ def run_query(
 			progress("⚠️ Zoning district discovery failed")
 			zoning_map_failed = True
 
+	geo = geo_future.result()
+
 	# Discover official bylaws PDF for the zoning district
 	official_bylaws_documents = []
 	use_fallback_system = False
@@ -954,144 +1585,20 @@ def run_query(
 
 	with span(logger, "fetch_and_prepare_docs"):
 		progress("Preparing official bylaws document")
-		documents = []
-		
-		# Use ONLY the official bylaws document we discovered
-		progress("🏛️ Fetching official bylaws document")
-		for official_doc in official_bylaws_documents:
-			try:
-				doc_type = official_doc.get('type', 'pdf')
-				url = official_doc['url']
-				logger.info(f"🏛️ Processing official bylaws ({doc_type}): {url}")
-				logger.info(f"📄 Document metadata: {list(official_doc.keys())}")
-				
-				text = ""
-				
-				if doc_type == 'ecode360_pdf':
-					# Handle ecode360 PDF file
-					progress("📄 Processing ecode360 PDF document")
-					pdf_file_path = official_doc.get('filepath')
-					
-					logger.info(f"🔍 Looking for PDF file at: {pdf_file_path}")
-					logger.info(f"📁 File exists: {os.path.exists(pdf_file_path) if pdf_file_path else 'No filepath provided'}")
-					
-					if pdf_file_path and os.path.exists(pdf_file_path):
-						logger.info(f"📖 Reading ecode360 PDF file: {pdf_file_path}")
-						
-						try:
-							with open(pdf_file_path, 'rb') as f:
-								pdf_reader = PyPDF2.PdfReader(f)
-								text = ""
-								page_count = len(pdf_reader.pages)
-								logger.info(f"📄 PDF has {page_count} pages")
-								
-								for i, page in enumerate(pdf_reader.pages):
-									page_text = page.extract_text()
-									text += page_text + "\n"
-									logger.info(f"📄 Page {i+1}: extracted {len(page_text)} characters")
-							
-							logger.info(f"✅ Loaded {len(text):,} characters from ecode360 PDF document")
-							progress("✅ Ecode360 PDF Document Processed Successfully")
-						except Exception as pdf_error:
-							logger.error(f"❌ Error reading PDF file: {str(pdf_error)}")
-							raise Exception(f"Failed to read PDF file {pdf_file_path}: {str(pdf_error)}")
-					else:
-						raise Exception(f"ecode360 PDF file not found: {pdf_file_path}")
-				
-				elif doc_type == 'ecode360_html':
-					# Handle ecode360 HTML file (fallback)
-					progress("📄 Processing ecode360 HTML document")
-					html_file_path = official_doc.get('filepath')
-					
-					if html_file_path and os.path.exists(html_file_path):
-						logger.info(f"📖 Reading ecode360 HTML file: {html_file_path}")
-						
-						with open(html_file_path, 'r', encoding='utf-8') as f:
-							html_content = f.read()
-						
-						# Extract text from HTML using BeautifulSoup
-						soup = BeautifulSoup(html_content, 'html.parser')
-						
-						# Remove script, style, and other non-content elements
-						for script in soup(["script", "style", "nav", "header", "footer"]):
-							script.decompose()
-						
-						# Get text content
-						text_content = soup.get_text()
-						lines = (line.strip() for line in text_content.splitlines())
-						chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-						text = '\n'.join(chunk for chunk in chunks if chunk)
-						
-						logger.info(f"✅ Loaded {len(text):,} characters from ecode360 HTML document")
-						progress("✅ Ecode360 HTML Document Processed Successfully")
-					else:
-						raise Exception(f"ecode360 HTML file not found: {html_file_path}")
-				
-				elif doc_type == 'ecode360_txt':
-					# Handle legacy ecode360 .txt file (for backward compatibility)
-					progress("📄 Processing ecode360 text document")
-					txt_file_path = official_doc.get('txt_file_path') or official_doc.get('filepath')
-					
-					if txt_file_path and os.path.exists(txt_file_path):
-						logger.info(f"📖 Reading ecode360 text file: {txt_file_path}")
-						
-						with open(txt_file_path, 'r', encoding='utf-8') as f:
-							text = f.read()
-						
-						logger.info(f"✅ Loaded {len(text):,} characters from ecode360 document")
-						progress("✅ Ecode360 Document Processed Successfully")
-					else:
-						raise Exception(f"ecode360 text file not found: {txt_file_path}")
-				
-				else:
-					# Handle standard PDF document
-					progress("🔄 Accessing official document (may try multiple strategies)")
-					
-					# Try to get the referrer URL (the page where we found this PDF)
-					referrer_url = None
-					# Look for "source_page" in the official_doc metadata if available
-					if 'source_page' in official_doc:
-						referrer_url = official_doc['source_page']
-					else:
-						# Generate a reasonable referrer based on the domain
-						from urllib.parse import urlparse
-						parsed = urlparse(url)
-						referrer_url = f"{parsed.scheme}://{parsed.netloc}/"
-					
-					# Use robust PDF fetching with multiple strategies
-					pdf_content = robust_fetch_pdf(url, referrer_url, logger)
-					progress("✅ Successfully accessed official document")
-					
-					# Extract text from PDF
-					pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_content))
-					for page in pdf_reader.pages:  # Use all pages for official document
-						text += page.extract_text() + "\n"
-				
-				# Add the official document as the ONLY source
-				documents.append({
-					"url": official_doc.get('url', url),  # Use URL from document
-					"title": official_doc['title'],
-					"text": text,  # Use full text for official document
-					"score": 1.0,
-					"source": "official_bylaws",
-					"city_match": 1.0,
-					"domain_priority": 1.0
-				})
-				
-				logger.info(f"✅ Using official bylaws document only: {len(text)} chars")
-				progress(f"✅ Extracted {len(text):,} characters from official document")
-				
-			except Exception as e:
-				logger.error(f"❌ Failed to fetch official bylaws {url}: {str(e)}")
-				# If we can't fetch the official document, we need fallback
-				return {
-					"status": "fallback_permission_required",
-					"message": "We found the official bylaws document but couldn't access it. Would you like us to try our fallback search method instead?",
-					"address": address,
-					"zoning_district_info": zoning_district_info,
-					"geo": geo,
-					"requested_metrics": requested_metrics
-				}
+		try:
+			documents = _prepare_official_docs(
+				official_bylaws_documents, logger, progress, zoning_district_info.get('zoning_code'), requested_metrics
+			)
+		except Exception:
+			# If we can't fetch the official document, we need fallback
+			return {
+				"status": "fallback_permission_required",
+				"message": "We found the official bylaws document but couldn't access it. Would you like us to try our fallback search method instead?",
+				"address": address,
+				"zoning_district_info": zoning_district_info,
+				"geo": geo,
+				"requested_metrics": requested_metrics
+			}
 		
 		logger.info("docs.prepared: %d (official only)", len(documents))
 
@@ -1147,13 +1654,15 @@ def run_query(
 			raise e
 
 	verified = extraction
+	# The official document that sourced the metrics (citations, source title, output metadata)
+	first_bylaws = official_bylaws_documents[0] if official_bylaws_documents else None
 
 	with span(logger, "collect_citations"):
 		# Create citation from the official bylaws document only
 		citations = [
 			{
-				"label": official_bylaws_documents[0]['title'],
-				"url": official_bylaws_documents[0]['url'],
+				"label": first_bylaws['title'],
+				"url": first_bylaws['url'],
 				"type": "official_bylaws"
 			}
 		]
@@ -1163,14 +1672,10 @@ def run_query(
 	final_zoning_districts = enhanced_zoning_districts
 	
 	# Transform raw LLM data to MetricValue objects with proper filtering
-	source_title = official_bylaws_documents[0]['title'] if official_bylaws_documents else "Official Bylaws"
-	
-	# Define allowed metrics (matching old implementation)
-	allowed_parking = {"carParking90Deg", "officesParkingRatio", "drivewayWidth"}
-	allowed_zoning = {"minLotArea", "minFrontSetback", "minSideSetback", "minRearSetback", "minLotFrontage", "minLotWidth"}
+	source_title = first_bylaws['title'] if first_bylaws else "Official Bylaws"
 	
-	transformed_zoning_analysis = _transform_to_metric_values(verified.get("zoningAnalysis", {}), source_title, allowed_zoning)
-	transformed_parking_summary = _transform_to_metric_values(verified.get("parkingSummary", {}), source_title, allowed_parking)
+	transformed_zoning_analysis = _transform_to_metric_values(verified.get("zoningAnalysis", {}), source_title, _ALLOWED_ZONING)
+	transformed_parking_summary = _transform_to_metric_values(verified.get("parkingSummary", {}), source_title, _ALLOWED_PARKING)
 
 	output = OutputResult(
 		address=address,
@@ -1181,7 +1686,7 @@ def run_query(
 		confidence=llm_service.estimate_confidence(verified),
 		citations=citations,
 		mode="synthesis",
-		latencyMs=int((time.time() - start_time) * 1000),
+		latencyMs=(time.perf_counter_ns() - start_ns) // 1_000_000,
 	)
 	
 	# Add zoning district discovery metadata to output if available
@@ -1196,11 +1701,93 @@ def run_query(
 		}
 	
 	# Add official bylaws source if available
-	if official_bylaws_documents:
+	if first_bylaws:
 		output_dict["officialBylawsSource"] = {
-			"title": official_bylaws_documents[0]['title'],
-			"url": official_bylaws_documents[0]['url'],
+			"title": first_bylaws['title'],
+			"url": first_bylaws['url'],
 			"discoveryMethod": "Official Website Search"
 		}
 	logger.info("result.latencyMs=%d confidence=%.3f mode=%s", output.latencyMs, output.confidence, output.mode)
 	return output_dict
+
+
+async def arun_query(
+	address: str,
+	requested_metrics: List[str],
+	on_progress: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+	"""Awaitable `run_query` for async callers (e.g. an ASGI app serving many addresses).
+
+	The zoning agents drive Selenium and the services use blocking clients, so the query
+	runs on a worker thread; callers can `asyncio.gather` several addresses without
+	stalling their event loop. `on_progress` is invoked from that worker thread.
+	"""
+	return await asyncio.to_thread(run_query, address, requested_metrics, on_progress)
+
+
+async def arun_query_fallback(
+	address: str,
+	requested_metrics: List[str],
+	zoning_district_info: Optional[Dict[str, Any]] = None,
+	geo: Optional[Dict[str, Any]] = None,
+	on_progress: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+	"""Awaitable `run_query_fallback`.
+
+	The document fetch stage runs its own event loop (`scrape.fetch_many`), which can't
+	be started from inside the caller's loop, so the whole query runs on a worker thread.
+	"""
+	return await asyncio.to_thread(
+		run_query_fallback, address, requested_metrics, zoning_district_info, geo, on_progress
+	)
+
+
+async def arun_query_with_manual_zoning(
+	address: str,
+	requested_metrics: List[str],
+	zoning_district_name: str,
+	zoning_district_code: str,
+	geo: Dict[str, Any],
+	official_website: Optional[str] = None,
+	zoning_agent = None,
+	on_progress: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+	"""Awaitable `run_query_with_manual_zoning`; see `arun_query` for the threading model."""
+	return await asyncio.to_thread(
+		run_query_with_manual_zoning,
+		address,
+		requested_metrics,
+		zoning_district_name,
+		zoning_district_code,
+		geo,
+		official_website,
+		zoning_agent,
+		on_progress,
+	)
+
+
+def stream_query(run: Callable[..., Dict[str, Any]], **kwargs: Any) -> Iterator[Tuple[str, Any]]:
+	"""Run a pipeline entry point in a worker thread and yield its progress as it happens.
+
+	Yields ("progress", message) events followed by one final ("result", result) event.
+	Progress is handed over through a queue, so the consumer (e.g. the Streamlit script
+	thread) does all UI work itself no matter which thread the pipeline reports from.
+	Exceptions raised by the pipeline are re-raised in the consuming thread.
+	"""
+	events: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+
+	def _worker() -> None:
+		try:
+			result = run(on_progress=lambda msg: events.put(("progress", msg)), **kwargs)
+			events.put(("result", result))
+		except BaseException as exc:
+			events.put(("error", exc))
+
+	threading.Thread(target=_worker, name="bylaws-iq-query", daemon=True).start()
+	while True:
+		kind, payload = events.get()
+		if kind == "error":
+			raise payload
+		yield kind, payload
+		if kind == "result":
+			return
@@ -24,16 +24,26 @@ shared resource management.
 import os
 import re
 import json
+import atexit
+import functools
+import hashlib
 import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import random
+import threading
+from collections import OrderedDict
 from typing import Dict, List, Optional, Tuple, Any
-from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
-from dotenv import load_dotenv
+from urllib.parse import parse_qsl, urldefrag, urlencode, urljoin, urlparse, urlsplit, urlunsplit
+from rapidfuzz import fuzz, process
+from selectolax.parser import HTMLParser
 
-from ..logging_config import configure_logging, span
+from .. import cache
+from ..logging_config import configure_logging, load_env_once, span
+from . import pdf as pdf_service
+from .llm import OPENROUTER_CLIENT, OPENROUTER_URL
 from . import search
 
 # Selenium imports for JavaScript content handling
@@ -48,6 +58,326 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException,
 from webdriver_manager.chrome import ChromeDriverManager
 
 
+# One keep-alive pool for the plain HTTP calls of every agent instance: discovery hits the
+# same city host many times, and each new connection costs a TCP+TLS handshake. Refused or
+# reset connections are retried with backoff; read timeouts and HTTP errors are not.
+_HTTP_SESSION = requests.Session()
+_HTTP_ADAPTER = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, read=0, status=0, backoff_factor=0.3),
+)
+_HTTP_SESSION.mount("https://", _HTTP_ADAPTER)
+_HTTP_SESSION.mount("http://", _HTTP_ADAPTER)
+
+# Agent LLM replies, keyed by a hash of (model, system message, prompt). The agents call
+# the LLM at these near-zero temperatures, which is what makes a reply safe to replay; raise
+# them and the caching in _call_llm/_call_llm_classification has to go.
+# Recent replies stay in memory; the disk copy is shared across sessions and restarts.
+_LLM_TEMPERATURE = 0.1
+_CLASSIFICATION_TEMPERATURE = 0.0
+_LLM_CACHE_NS = "agent-llm"
+_LLM_CACHE_TTL_S = 3600
+_LLM_CACHE_SIZE = 512
+_llm_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+_llm_cache_lock = threading.Lock()
+LLM_CACHE_STATS = {"hits": 0, "misses": 0}
+
+
+def _llm_cache_get(key: str) -> Optional[str]:
+    now = time.time()
+    with _llm_cache_lock:
+        entry = _llm_cache.get(key)
+        if entry is not None and now - entry[0] <= _LLM_CACHE_TTL_S:
+            _llm_cache.move_to_end(key)
+            LLM_CACHE_STATS["hits"] += 1
+            return entry[1]
+    content = cache.read_json(_LLM_CACHE_NS, key, max_age=_LLM_CACHE_TTL_S)
+    with _llm_cache_lock:
+        if not isinstance(content, str):
+            LLM_CACHE_STATS["misses"] += 1
+            return None
+        LLM_CACHE_STATS["hits"] += 1
+    _llm_cache_remember(key, content, now)
+    return content
+
+
+def _llm_cache_put(key: str, content: str) -> None:
+    _llm_cache_remember(key, content, time.time())
+    cache.write_json(_LLM_CACHE_NS, key, content)
+
+
+def _llm_cache_remember(key: str, content: str, stored_at: float) -> None:
+    with _llm_cache_lock:
+        _llm_cache[key] = (stored_at, content)
+        _llm_cache.move_to_end(key)
+        while len(_llm_cache) > _LLM_CACHE_SIZE:
+            _llm_cache.popitem(last=False)
+
+
+# Opt-in (BLIQ_SEMANTIC_CACHE=1) second layer for _call_llm: a reply is reused for a prompt
+# whose embedding is within _SEMANTIC_CACHE_THRESHOLD cosine similarity of an earlier one.
+# Near-identical prompts for different cities differ mostly in their URLs, so a reply is
+# only reused when both prompts reference exactly the same URLs. Needs sentence-transformers.
+_SEMANTIC_CACHE_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+_SEMANTIC_CACHE_THRESHOLD = 0.92
+_PROMPT_URL_RE = re.compile(r"https?://[^\s\"'<>)\]]+")
+_semantic_lock = threading.Lock()
+_semantic_vectors = None  # float32 matrix of unit-length prompt embeddings, one row per entry
+_semantic_entries: List[Tuple[str, frozenset, str]] = []  # (scope, prompt URLs, reply) per row
+
+
+def _semantic_cache_enabled() -> bool:
+    return (os.getenv("BLIQ_SEMANTIC_CACHE") or "").lower() in ("1", "true", "yes")
+
+
+@functools.lru_cache(maxsize=1)
+def _semantic_encoder():
+    """The sentence-embedding model, or None when sentence-transformers isn't installed."""
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        logging.getLogger("bylaws_iq.base").warning("llm.semantic_cache_unavailable: sentence-transformers is not installed")
+        return None
+    return SentenceTransformer(_SEMANTIC_CACHE_MODEL)
+
+
+def _semantic_lookup(scope: str, prompt: str) -> Tuple[Optional[str], Any]:
+    """(cached reply or None, prompt embedding for _semantic_store; None if unavailable)."""
+    encoder = _semantic_encoder()
+    if encoder is None:
+        return None, None
+    import numpy as np
+
+    vector = np.asarray(encoder.encode(prompt, normalize_embeddings=True), dtype=np.float32)
+    urls = frozenset(_PROMPT_URL_RE.findall(prompt))
+    with _semantic_lock:
+        if _semantic_vectors is None:
+            return None, vector
+        # Rows are unit length, so one matrix-vector product gives every cosine similarity
+        sims = _semantic_vectors @ vector
+        for i in np.argsort(-sims):
+            if sims[i] < _SEMANTIC_CACHE_THRESHOLD:
+                break
+            entry_scope, entry_urls, reply = _semantic_entries[i]
+            if entry_scope == scope and entry_urls == urls:
+                return reply, vector
+    return None, vector
+
+
+def _semantic_store(scope: str, prompt: str, vector: Any, reply: str) -> None:
+    global _semantic_vectors
+    import numpy as np
+
+    with _semantic_lock:
+        row = vector[np.newaxis, :]
+        _semantic_vectors = row if _semantic_vectors is None else np.vstack((_semantic_vectors, row))
+        _semantic_entries.append((scope, frozenset(_PROMPT_URL_RE.findall(prompt)), reply))
+        if len(_semantic_entries) > _LLM_CACHE_SIZE:
+            _semantic_vectors = _semantic_vectors[1:]
+            del _semantic_entries[0]
+
+
+# "www.", "www1.", "www2." ... host prefixes, dropped when comparing domains
+_WWW_PREFIX_RE = re.compile(r'^www\d*\.')
+
+
+@functools.lru_cache(maxsize=10000)
+def _normalized_domain(domain: str) -> str:
+    return _WWW_PREFIX_RE.sub('', domain.lower())
+
+
+@functools.lru_cache(maxsize=10000)
+def _url_domain(url: str) -> str:
+    return _normalized_domain(urlparse(url).netloc)
+
+
+# Query parameters that only record where a click came from; ignored when keying PDFs by URL
+_TRACKING_PARAM_RE = re.compile(r'^(?:utm_\w+|fbclid|gclid|mc_cid|mc_eid)$', re.IGNORECASE)
+
+
+def canonical_url(url: str) -> str:
+    """`url` without its fragment or tracking query parameters, for recognising repeat links."""
+    url = urldefrag(url)[0]
+    parts = urlsplit(url)
+    if not parts.query:
+        return url
+    params = parse_qsl(parts.query, keep_blank_values=True)
+    kept = [(k, v) for k, v in params if not _TRACKING_PARAM_RE.match(k)]
+    if len(kept) == len(params):
+        return url
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(kept), ''))
+
+
+# The MMA's directory of city and town websites. Every query looks a city up in it and the
+# page rarely changes, so it is fetched once a day (the raw HTML is kept on disk) and parsed
+# once per process into a lookup table.
+MMA_DIRECTORY_URL = "https://www.mma.org/members/member-communities/city-and-town-websites/#all"
+_MMA_NS = "mma"
+_MMA_TTL_S = 24 * 3600
+_MMA_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+_mma_html: Optional[Tuple[float, bytes]] = None  # (fetched at, HTML)
+_mma_lock = threading.Lock()
+
+
+def mma_directory_html(session: requests.Session, logger: logging.Logger) -> bytes:
+    """HTML of the MMA directory, fetched at most once per _MMA_TTL_S; raises on HTTP errors."""
+    global _mma_html
+    # Held across the fetch so agents asking at the same time share one request
+    with _mma_lock:
+        now = time.time()
+        if _mma_html is not None and now - _mma_html[0] <= _MMA_TTL_S:
+            return _mma_html[1]
+        key = cache.key_for(MMA_DIRECTORY_URL)
+        html = cache.read_bytes(_MMA_NS, key, max_age=_MMA_TTL_S)
+        if html is None:
+            logger.info(f"mma.request_start: Fetching MMA directory from {MMA_DIRECTORY_URL}")
+            try:
+                response = session.get(MMA_DIRECTORY_URL, headers=_MMA_HEADERS, timeout=30)
+                logger.info(f"mma.response_status: {response.status_code}")
+                response.raise_for_status()
+            except requests.exceptions.HTTPError as e:
+                logger.error(f"mma.http_error: {e.response.status_code} {e.response.reason}")
+                if e.response.status_code == 403:
+                    logger.error("mma.blocked: MMA website is blocking requests - this may be temporary")
+                raise
+            html = response.content
+            cache.write_bytes(_MMA_NS, key, html)
+        _mma_html = (now, html)
+        return html
+
+
+_MMA_WORD_RE = re.compile(r"[a-z0-9']+")
+
+
+def _mma_normalize(name: str) -> str:
+    return name.lower().replace(' ', '').replace('.', '')
+
+
+def _mma_words(name: str) -> List[str]:
+    return _MMA_WORD_RE.findall(name.lower().replace('.', ''))
+
+
+@functools.lru_cache(maxsize=1)
+def _mma_link_index(html: bytes) -> Tuple[Dict[str, str], Dict[str, List[str]]]:
+    """
+    Lookup tables for the directory's links, first link winning:
+    {normalized link text: absolute URL} and {word: normalized link texts using it, in page order}
+    """
+    index: Dict[str, str] = {}
+    words: Dict[str, List[str]] = {}
+    # Only anchors are needed, so selectolax's C parser walks them without building a soup
+    for link in HTMLParser(html).css('a[href]'):
+        href = link.attributes.get('href')
+        # Skip empty links or non-website links
+        if not href or href.startswith('#') or 'mailto:' in href:
+            continue
+        text = link.text(strip=True)
+        name = _mma_normalize(text)
+        if name and name not in index:
+            index[name] = href if href.startswith('http') else urljoin("https://www.mma.org", href)
+            for word in dict.fromkeys(_mma_words(text)):
+                words.setdefault(word, []).append(name)
+    return index, words
+
+
+# Browsers handed back by _cleanup_webdriver, kept warm for the next agent that needs one:
+# launching Chrome and resolving ChromeDriver costs seconds, and the map agent alone opens
+# and closes a browser several times per query
+_MAX_IDLE_DRIVERS = 2
+_idle_drivers: List[webdriver.Chrome] = []
+_idle_drivers_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _chromedriver_path() -> str:
+    """Path of a ChromeDriver matching the installed Chrome, resolved once per process."""
+    import shutil
+
+    # A corrupted webdriver-manager cache (seen on macOS) breaks every launch, so start
+    # from a clean download, but only on the first launch rather than every one
+    cache_dir = os.path.expanduser("~/.wdm")
+    if os.path.exists(cache_dir):
+        logging.getLogger("bylaws_iq.base").info(f"webdriver.clearing_cache: Removing {cache_dir}")
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    return ChromeDriverManager().install()
+
+
+def _take_idle_driver() -> Optional[webdriver.Chrome]:
+    """A live browser from the idle pool, or None."""
+    while True:
+        with _idle_drivers_lock:
+            if not _idle_drivers:
+                return None
+            driver = _idle_drivers.pop()
+        try:
+            driver.current_url  # Round-trip to confirm the session is still alive
+            return driver
+        except Exception:
+            _quit_quietly(driver)
+
+
+def _release_driver(driver: webdriver.Chrome) -> bool:
+    """Reset a browser and park it in the idle pool; False if it should be quit instead."""
+    with _idle_drivers_lock:
+        if len(_idle_drivers) >= _MAX_IDLE_DRIVERS:
+            return False
+    try:
+        # Note every origin the open windows' histories visited
+        origins = set()
+        handles = driver.window_handles
+        for handle in handles:
+            driver.switch_to.window(handle)
+            history = driver.execute_cdp_cmd("Page.getNavigationHistory", {})
+            for entry in history.get("entries", []):
+                parts = urlparse(entry.get("url", ""))
+                if parts.scheme in ("http", "https") and parts.netloc:
+                    origins.add(f"{parts.scheme}://{parts.netloc}")
+        # Nothing the last query stored (cookies, local storage, IndexedDB, service workers,
+        # HTTP cache) may leak into the next one
+        for origin in origins:
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+        driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        # A fresh tab drops sessionStorage and history; then close every old window
+        driver.switch_to.new_window("tab")
+        fresh = driver.current_window_handle
+        for handle in handles:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(fresh)
+    except Exception:
+        return False
+    with _idle_drivers_lock:
+        if len(_idle_drivers) >= _MAX_IDLE_DRIVERS:
+            return False
+        _idle_drivers.append(driver)
+    return True
+
+
+def _quit_quietly(driver: webdriver.Chrome) -> None:
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+@atexit.register
+def _quit_idle_drivers() -> None:
+    with _idle_drivers_lock:
+        drivers = list(_idle_drivers)
+        _idle_drivers.clear()
+    for driver in drivers:
+        _quit_quietly(driver)
+
+
 class BaseZoningAgent:
     """
     Base class providing shared infrastructure for all zoning agents
@@ -59,17 +389,25 @@ class BaseZoningAgent:
     - Official website discovery
     """
     
+    # System message for _call_llm_classification; agents with a narrower task override it
+    classification_system_message = "You are a classification agent that selects the best option from multiple choices. Be precise and follow the output format exactly."
+    
     def __init__(self, agent_name: str = "base"):
         configure_logging()
         self.logger = logging.getLogger(f"bylaws_iq.{agent_name}")
-        load_dotenv()
+        load_env_once()
         self.model = "google/gemini-2.5-pro"  # For complex PDF analysis tasks
         self.classification_model = "google/gemini-flash-1.5"  # For cheap classification tasks
         self.logger.debug(f"agent.init: Using model {self.model} for complex tasks, {self.classification_model} for classification")
         
         # Shared resources
+        self.session = _HTTP_SESSION  # Pooled HTTP session shared by all agents
         self.driver = None  # WebDriver instance
-        self.downloaded_pdfs = {}  # Track downloaded PDFs {url: {filename, source_pages}}
+        self.downloaded_pdfs = {}  # Track downloaded PDFs {canonical url: {filename, source_pages}}
+        # Extracted PDF text, by canonical URL and by SHA-256 of the file, so a PDF linked
+        # from several pages (or mirrored under another URL) is only parsed once
+        self._pdf_texts: Dict[str, str] = {}
+        self._pdf_texts_by_hash: Dict[str, str] = {}
 
 
     # SHARED WEBDRIVER MANAGEMENT
@@ -79,6 +417,12 @@ class BaseZoningAgent:
         """
         if self.driver is not None:
             return self.driver
+        
+        idle_driver = _take_idle_driver()
+        if idle_driver is not None:
+            self.driver = idle_driver
+            self.logger.info("webdriver.reused: Took a warm Chrome session from the idle pool")
+            return idle_driver
             
         with span(self.logger, "webdriver.init"):
             # Configure Chrome options for headless operation with enhanced anti-bot detection
@@ -111,18 +455,10 @@ class BaseZoningAgent:
             # Try multiple approaches for ChromeDriver initialization
             driver = None
             
-            # Approach 1: Try webdriver-manager with cache clearing
+            # Approach 1: Try webdriver-manager (fresh download on the first launch only)
             try:
-                self.logger.info("webdriver.attempt1: Trying ChromeDriverManager with fresh download")
-                import shutil
-                
-                # Clear webdriver-manager cache on macOS to avoid corrupted downloads
-                cache_dir = os.path.expanduser("~/.wdm")
-                if os.path.exists(cache_dir):
-                    self.logger.info(f"webdriver.clearing_cache: Removing {cache_dir}")
-                    shutil.rmtree(cache_dir, ignore_errors=True)
-                
-                service = Service(ChromeDriverManager().install())
+                self.logger.info("webdriver.attempt1: Trying ChromeDriverManager")
+                service = Service(_chromedriver_path())
                 driver = webdriver.Chrome(service=service, options=chrome_options)
                 self.logger.info("webdriver.success1: ChromeDriverManager worked")
                 
@@ -243,8 +579,11 @@ class BaseZoningAgent:
         """
         if self.driver:
             try:
-                self.driver.quit()
-                self.logger.debug("webdriver.cleanup: WebDriver closed successfully")
+                if _release_driver(self.driver):
+                    self.logger.debug("webdriver.cleanup: WebDriver returned to the idle pool")
+                else:
+                    self.driver.quit()
+                    self.logger.debug("webdriver.cleanup: WebDriver closed successfully")
             except Exception as e:
                 self.logger.warning(f"webdriver.cleanup_error: {str(e)}")
             finally:
@@ -255,13 +594,31 @@ class BaseZoningAgent:
         """Call the LLM using OpenRouter without forcing JSON format"""
         
         try:
-            load_dotenv()
+            system_message = """You are an expert web navigation agent specializing in finding official municipal zoning maps. You understand the difference between zoning maps (visual/graphic PDFs) and zoning codes/ordinances (text documents). You prioritize official, recent, and authoritative sources."""
+            
+            cache_key = cache.key_for(self.model, system_message, prompt)
+            cached = _llm_cache_get(cache_key)
+            if cached is not None:
+                self.logger.debug(f"llm.cache_hit: model={self.model}")
+                return cached
+            
+            semantic_scope = semantic_vector = None
+            if _semantic_cache_enabled():
+                semantic_scope = cache.key_for(self.model, system_message)
+                try:
+                    cached, semantic_vector = _semantic_lookup(semantic_scope, prompt)
+                except Exception as e:
+                    self.logger.warning(f"llm.semantic_cache_failed: {str(e)}")
+                    cached = None
+                if cached is not None:
+                    self.logger.debug(f"llm.semantic_cache_hit: model={self.model}")
+                    return cached
+            
+            load_env_once()
             api_key = os.getenv("OPENROUTER_API_KEY")
             if not api_key:
                 raise RuntimeError("OPENROUTER_API_KEY not set")
             
-            system_message = """You are an expert web navigation agent specializing in finding official municipal zoning maps. You understand the difference between zoning maps (visual/graphic PDFs) and zoning codes/ordinances (text documents). You prioritize official, recent, and authoritative sources."""
-            
             headers = {
                 "Authorization": f"Bearer {api_key}",
                 "HTTP-Referer": "https://bylaws-iq.local",
@@ -276,21 +633,23 @@ class BaseZoningAgent:
             
             payload = {
                 "model": self.model,
-                "temperature": 0.1,
+                "temperature": _LLM_TEMPERATURE,
                 "messages": messages,
                 # NOTE: No response_format forcing JSON - we want text responses
             }
             
             self.logger.debug(f"llm.call_start: model={self.model}")
             
-            import httpx
-            with httpx.Client(timeout=60) as client:
-                r = client.post("https://openrouter.ai/api/v1/chat/completions", headers=headers, json=payload)
-                r.raise_for_status()
-                js = r.json()
+            r = OPENROUTER_CLIENT.post(OPENROUTER_URL, headers=headers, json=payload, timeout=60)
+            r.raise_for_status()
+            js = r.json()
             
             response = js["choices"][0]["message"]["content"]
             self.logger.debug(f"llm.call_success: response_length={len(response)}")
+            if response:
+                _llm_cache_put(cache_key, response)
+                if semantic_vector is not None:
+                    _semantic_store(semantic_scope, prompt, semantic_vector, response)
             return response
             
         except Exception as e:
@@ -300,7 +659,15 @@ class BaseZoningAgent:
     def _call_llm_classification(self, prompt: str) -> str:
         """Call LLM for classification tasks using cheaper model"""
         try:
-            load_dotenv()
+            system_message = self.classification_system_message
+            
+            cache_key = cache.key_for(self.classification_model, system_message, prompt)
+            cached = _llm_cache_get(cache_key)
+            if cached is not None:
+                self.logger.debug(f"llm.classification_cache_hit: model={self.classification_model}")
+                return cached
+            
+            load_env_once()
             api_key = os.getenv("OPENROUTER_API_KEY")
             if not api_key:
                 raise RuntimeError("OPENROUTER_API_KEY not set")
@@ -313,27 +680,27 @@ class BaseZoningAgent:
             }
             
             messages = [
-                {"role": "system", "content": "You are a classification agent that selects the best option from multiple choices. Be precise and follow the output format exactly."},
+                {"role": "system", "content": system_message},
                 {"role": "user", "content": prompt}
             ]
             
             payload = {
                 "model": self.classification_model,  # Use cheaper model for classification
-                "temperature": 0.0,  # Lower temperature for consistent classification
+                "temperature": _CLASSIFICATION_TEMPERATURE,  # Lower temperature for consistent classification
                 "messages": messages,
                 "max_tokens": 500  # Classification shouldn't need many tokens
             }
             
             self.logger.debug(f"llm.classification_start: model={self.classification_model}")
             
-            import httpx
-            with httpx.Client(timeout=30) as client:
-                r = client.post("https://openrouter.ai/api/v1/chat/completions", headers=headers, json=payload)
-                r.raise_for_status()
-                js = r.json()
+            r = OPENROUTER_CLIENT.post(OPENROUTER_URL, headers=headers, json=payload, timeout=30)
+            r.raise_for_status()
+            js = r.json()
             
             response = js["choices"][0]["message"]["content"]
             self.logger.debug(f"llm.classification_success: response_length={len(response)}")
+            if response:
+                _llm_cache_put(cache_key, response)
             return response
             
         except Exception as e:
@@ -354,86 +721,48 @@ class BaseZoningAgent:
         try:
             self.logger.info(f"mma.lookup_start: Looking up {city} in MMA directory")
             
-            import requests
-            from urllib.parse import urljoin
-            
-            # Fetch the MMA page with proper headers to avoid blocking
-            mma_url = "https://www.mma.org/members/member-communities/city-and-town-websites/#all"
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-            }
-            
-            self.logger.info(f"mma.request_start: Fetching MMA directory from {mma_url}")
-            
-            # Add small delay to be respectful to the MMA website
-            time.sleep(1)
-            
-            try:
-                response = requests.get(mma_url, headers=headers, timeout=30)
-                self.logger.info(f"mma.response_status: {response.status_code}")
-                response.raise_for_status()
-            except requests.exceptions.HTTPError as e:
-                self.logger.error(f"mma.http_error: {e.response.status_code} {e.response.reason}")
-                if e.response.status_code == 403:
-                    self.logger.error("mma.blocked: MMA website is blocking requests - this may be temporary")
-                raise
-            
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Look for the city in anchor tags (links)
-            for link in soup.find_all('a', href=True):
-                link_text = link.get_text(strip=True)
-                href = link['href']
-                
-                # Skip empty links or non-website links
-                if not href or href.startswith('#') or 'mailto:' in href:
+            index, words = _mma_link_index(mma_directory_html(self.session, self.logger))
+            city_normalized = _mma_normalize(city)
+            
+            # Check for exact match first
+            url = index.get(city_normalized)
+            if url:
+                self.logger.info(f"mma.exact_match: {city} -> {url}")
+                return url
+            
+            # Then links using every word of the city name ("North Andover" -> "Town of North
+            # Andover"), ignoring short words such as a state suffix; the shortest text is closest
+            city_words = _mma_words(city)
+            city_words = [w for w in city_words if len(w) > 3] or city_words
+            candidates = None
+            for word in city_words:
+                names = words.get(word, [])
+                if candidates is None:
+                    candidates = names
+                else:
+                    present = set(names)
+                    candidates = [n for n in candidates if n in present]
+                if not candidates:
+                    break
+            if candidates:
+                name = min(candidates, key=len)
+                url = index[name]
+                self.logger.info(f"mma.partial_match: {city} matched '{name}' -> {url}")
+                return url
+            
+            # Finally the closest link text to any word of the city name, which also catches
+            # spelling variants ("Foxboro" -> "Foxborough")
+            # (scored against the link texts; given the dict itself, rapidfuzz would score the URLs)
+            names = list(index)
+            for word in _mma_words(city):
+                if len(word) <= 3:  # Avoid short words
                     continue
-                    
-                # Normalize city name for comparison
-                city_normalized = city.lower().replace(' ', '').replace('.', '')
-                link_text_normalized = link_text.lower().replace(' ', '').replace('.', '')
-                
-                # Check for exact match first
-                if city_normalized == link_text_normalized:
-                    if href.startswith('http'):
-                        url = href
-                    else:
-                        url = urljoin("https://www.mma.org", href)
-                    
-                    self.logger.info(f"mma.exact_match: {city} -> {url}")
+                match = process.extractOne(word, names, scorer=fuzz.partial_ratio, score_cutoff=90)
+                if match:
+                    name = match[0]
+                    url = index[name]
+                    self.logger.info(f"mma.match_found: {city} matched '{name}' -> {url}")
                     return url
-                
-                # Check if city name is contained in the link text
-                if city_normalized in link_text_normalized:
-                    if href.startswith('http'):
-                        url = href  
-                    else:
-                        url = urljoin("https://www.mma.org", href)
-                    
-                    self.logger.info(f"mma.partial_match: {city} matched '{link_text}' -> {url}")
-                    return url
-                
-                # Also check if any word in the city name appears in the link
-                city_words = city_normalized.replace(',', ' ').split()
-                for word in city_words:
-                    if len(word) > 3 and word in link_text_normalized:  # Avoid short words
-                        if href.startswith('http'):
-                            url = href
-                        else:
-                            url = urljoin("https://www.mma.org", href)
-                        
-                        # Extract the matching part for logging
-                        for name_part in link_text.split():
-                            if word in name_part.lower().replace('.', ''):
-                                self.logger.info(f"mma.match_found: {city} matched '{name_part}' -> {url}")
-                                return url
             
             self.logger.warning(f"mma.not_found: No entry found for {city} in MMA directory")
             return None
@@ -454,6 +783,11 @@ class BaseZoningAgent:
             str or None: Extracted text content
         """
         try:
+            text_content = self._known_pdf_text(pdf_url)
+            if text_content is not None:
+                self.logger.info(f"pdf.reused: {pdf_url} already extracted")
+                return text_content
+            
             self.logger.info(f"pdf.fetch_start: Downloading from {pdf_url}")
             
             # Download PDF with proper headers
@@ -461,45 +795,55 @@ class BaseZoningAgent:
                 'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
             }
             
-            response = requests.get(pdf_url, headers=headers, timeout=30)
+            response = self.session.get(pdf_url, headers=headers, timeout=30)
             response.raise_for_status()
             
-            # Extract text using PyPDF2
+            digest = hashlib.sha256(response.content).hexdigest()
+            text_content = self._known_pdf_text(pdf_url, digest)
+            if text_content is not None:
+                self.logger.info(f"pdf.reused: {pdf_url} has the same content as a PDF already extracted")
+                return text_content
+            
+            # Extract text (PyMuPDF, or PyPDF2 when it isn't installed)
             try:
-                import PyPDF2
-                import io
-                
-                pdf_file = io.BytesIO(response.content)
-                pdf_reader = PyPDF2.PdfReader(pdf_file)
-                
-                text_content = ""
-                for page_num in range(len(pdf_reader.pages)):
-                    page = pdf_reader.pages[page_num]
-                    text_content += page.extract_text() + "\n"
+                text_content = pdf_service.extract_text(response.content)
                 
                 self.logger.info(f"pdf.extraction_success: Extracted {len(text_content)} characters")
-                return text_content
+                return self._remember_pdf_text(pdf_url, digest, text_content)
                 
             except ImportError:
-                self.logger.warning("pdf.pypdf2_missing: PyPDF2 not available, cannot extract text")
+                self.logger.warning("pdf.parser_missing: neither PyMuPDF nor PyPDF2 available, cannot extract text")
                 return None
                 
         except Exception as e:
             self.logger.error(f"pdf.fetch_failed: {str(e)}", exc_info=True)
             return None
 
+    def _known_pdf_text(self, pdf_url: str, digest: Optional[str] = None) -> Optional[str]:
+        """Text already extracted for this URL or, given the SHA-256 of its bytes, for the same file"""
+        key = canonical_url(pdf_url)
+        text = self._pdf_texts.get(key)
+        if text is None and digest is not None:
+            text = self._pdf_texts_by_hash.get(digest)
+            if text is not None:
+                self._pdf_texts[key] = text
+        return text
+    
+    def _remember_pdf_text(self, pdf_url: str, digest: str, text: str) -> str:
+        self._pdf_texts[canonical_url(pdf_url)] = text
+        self._pdf_texts_by_hash[digest] = text
+        return text
+
     # SHARED DOMAIN UTILITIES
     def _normalize_domain(self, domain: str) -> str:
         """Normalize domain by removing www prefix and common variations"""
         if not domain:
             return ""
-        return domain.replace('www.', '').replace('www1.', '').replace('www2.', '').lower()
+        return _normalized_domain(domain)
     
     def _same_domain(self, url1: str, url2: str) -> bool:
         """Check if two URLs are from the same domain"""
         try:
-            domain1 = urlparse(url1).netloc
-            domain2 = urlparse(url2).netloc
-            return self._normalize_domain(domain1) == self._normalize_domain(domain2)
-        except:
+            return _url_domain(url1) == _url_domain(url2)
+        except ValueError:  # Malformed netloc, e.g. an unbalanced IPv6 bracket
             return False
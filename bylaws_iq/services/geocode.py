@@ -4,22 +4,26 @@ import os
 import urllib.parse
 from typing import Dict, Any
 import logging
-from ..logging_config import configure_logging, span
+from ..logging_config import configure_logging, load_env_once, span
 
 import httpx
-from dotenv import load_dotenv
 
 
 USER_AGENT = "ByLaws-IQ/0.1 (contact: dev@example.com)"
 
+# Shared by every provider so repeat lookups reuse a keep-alive connection instead of
+# paying a fresh TCP+TLS handshake per address
+_CLIENT = httpx.Client(
+	headers={"User-Agent": USER_AGENT},
+	timeout=15,
+	limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+)
+
 
 def geocode_address(address: str) -> Dict[str, Any]:
 	configure_logging()
 	logger = logging.getLogger("bylaws_iq.geocode")
-	try:
-		load_dotenv()
-	except Exception:
-		logger.debug("dotenv.load failed", exc_info=True)
+	load_env_once()
 
 	mapbox = os.getenv("MAPBOX_TOKEN")
 	geoapify = os.getenv("GEOAPIFY_KEY")
@@ -43,10 +47,9 @@ def _geocode_mapbox(address: str, token: str) -> Dict[str, Any]:
 		+ urllib.parse.quote(address)
 		+ f".json?access_token={token}&limit=1"
 	)
-	with httpx.Client(headers={"User-Agent": USER_AGENT}, timeout=15) as client:
-		r = client.get(url)
-		r.raise_for_status()
-		js = r.json()
+	r = _CLIENT.get(url)
+	r.raise_for_status()
+	js = r.json()
 	if not js.get("features"):
 		return _geocode_nominatim(address)
 	f = js["features"][0]
@@ -76,10 +79,9 @@ def _geocode_geoapify(address: str, key: str) -> Dict[str, Any]:
 		+ urllib.parse.quote(address)
 		+ f"&apiKey={key}"
 	)
-	with httpx.Client(headers={"User-Agent": USER_AGENT}, timeout=15) as client:
-		r = client.get(url)
-		r.raise_for_status()
-		js = r.json()
+	r = _CLIENT.get(url)
+	r.raise_for_status()
+	js = r.json()
 	feats = js.get("features", [])
 	if not feats:
 		return _geocode_nominatim(address)
@@ -97,11 +99,9 @@ def _geocode_geoapify(address: str, key: str) -> Dict[str, Any]:
 def _geocode_nominatim(address: str) -> Dict[str, Any]:
 	url = "https://nominatim.openstreetmap.org/search"
 	params = {"q": address, "format": "json", "limit": 1, "addressdetails": 1}
-	headers = {"User-Agent": USER_AGENT}
-	with httpx.Client(headers=headers, timeout=20) as client:
-		r = client.get(url, params=params)
-		r.raise_for_status()
-		data = r.json()
+	r = _CLIENT.get(url, params=params, timeout=20)
+	r.raise_for_status()
+	data = r.json()
 	if not data:
 		raise ValueError("Geocoding failed: no results")
 	d = data[0]
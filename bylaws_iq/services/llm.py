@@ -1,14 +1,77 @@
 from __future__ import annotations
 
+import copy
+import importlib.util
 import os
-import json
 import logging
+import threading
+from collections import OrderedDict
 import httpx
+import orjson
 from typing import Dict, List, Optional, Any
+from .. import cache
 from ..logging_config import configure_logging, span
 
 logger = logging.getLogger(__name__)
 
+# Largest number of independent queries sent in one batched synthesis prompt. Beyond this the
+# combined document context gets long enough that per-query extraction quality drops.
+MAX_SYNTHESIS_BATCH = 8
+
+# Document text sent to the LLM, in characters: at most _MAX_DOCUMENT_CHARS from any one
+# document and _MAX_PROMPT_DOCUMENT_CHARS across a prompt (split evenly between the queries
+# of a batch). Official bylaws can run to hundreds of pages when reading isn't cut short at
+# the district's section; the budget keeps such a document from flooding the prompt.
+_MAX_DOCUMENT_CHARS = 120_000
+_MAX_PROMPT_DOCUMENT_CHARS = 300_000
+
+# Successful single-query syntheses, keyed by a hash of the full prompt (address, district,
+# metrics and every document's text), so re-running the same inputs skips the LLM call. Hot
+# entries stay in memory; the disk copy lets them survive app restarts.
+_SYNTHESIS_CACHE_SIZE = 256
+_SYNTHESIS_NS = "synthesis"
+_SYNTHESIS_TTL_S = 7 * 24 * 3600
+_synthesis_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_synthesis_cache_lock = threading.Lock()
+
+# One pooled client for every OpenRouter call, synthesis and agents alike: calls after the
+# first skip the TCP+TLS handshake, and concurrent calls share one HTTP/2 connection.
+# Timeouts are passed per request where a caller needs a shorter one.
+OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+OPENROUTER_CLIENT = httpx.Client(
+    http2=importlib.util.find_spec("h2") is not None,  # h2 comes with the httpx[http2] extra
+    timeout=120.0,
+    limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+)
+
+# Prompt sections shared by the single-query and batched synthesis prompts
+_METRIC_DEFINITIONS = """Extract ONLY the following specific numeric/measurable zoning metrics from the documents:
+
+PARKING METRICS (for parkingSummary):
+- carParking90Deg: Parking space dimensions for 90-degree parking
+- officesParkingRatio: Required parking spaces per square foot for offices  
+- drivewayWidth: Minimum driveway width requirement
+
+ZONING METRICS (for zoningAnalysis):
+- minLotArea: Minimum lot area requirement (sq ft or acres)
+- minFrontSetback: Minimum front yard setback (feet)
+- minSideSetback: Minimum side yard setback (feet) 
+- minRearSetback: Minimum rear yard setback (feet)
+- minLotFrontage: Minimum lot frontage requirement (feet)
+- minLotWidth: Minimum lot width requirement (feet)"""
+
+_METRIC_VALUE_FIELDS = """Return ONLY metrics that are explicitly found with specific values. For each metric, provide:
+- value: The specific numeric value with units (e.g., "25 feet", "5000 sq ft", "2 spaces per 1000 sq ft")
+- quote: Direct quote from the source document showing this requirement
+- source: Document name or section reference
+- note: Any additional context or conditions"""
+
+_EXTRACTION_RULES = """IMPORTANT: 
+- Only include metrics where you find explicit numeric requirements
+- Do NOT include general analysis or district information
+- Do NOT make up values - only use what's explicitly stated in the documents
+- If a metric is not found, do not include that key in the response"""
+
 
 def synthesize_metrics(
     address: str,
@@ -38,56 +101,16 @@ def synthesize_metrics(
             logger.info(f"📋 Requested metrics: {requested_metrics}")
             logger.info(f"📄 Documents: {len(documents)}")
             
-            # Prepare document content
-            document_content = ""
-            for i, doc in enumerate(documents):
-                content = doc.get('content', '')
-                title = doc.get('title', f'Document {i+1}')
-                document_content += f"\n\n=== {title} ===\n{content}"
-            
-            # Prepare zoning context
-            zoning_context = ""
-            if zoning_districts:
-                for district in zoning_districts:
-                    if hasattr(district, 'code') and hasattr(district, 'name'):
-                        zoning_context += f"Zoning District: {district.code} - {district.name}\n"
-                    elif isinstance(district, dict):
-                        code = district.get('code', '')
-                        name = district.get('name', '')
-                        zoning_context += f"Zoning District: {code} - {name}\n"
+            document_content = _format_documents(documents)
+            zoning_context = _format_zoning_context(zoning_districts)
             
-            # Create LLM prompt following the expected structure
-            prompt = f"""You are a zoning law expert. Analyze the provided zoning documents to extract specific metrics for the address: {address}
-
-Address: {address}
-Jurisdiction: {jurisdiction.get('city', '')}, {jurisdiction.get('state', '')}
-{zoning_context}
-
-Requested Metrics: {', '.join(requested_metrics)}
-
-Extract ONLY the following specific numeric/measurable zoning metrics from the documents:
-
-PARKING METRICS (for parkingSummary):
-- carParking90Deg: Parking space dimensions for 90-degree parking
-- officesParkingRatio: Required parking spaces per square foot for offices  
-- drivewayWidth: Minimum driveway width requirement
-
-ZONING METRICS (for zoningAnalysis):
-- minLotArea: Minimum lot area requirement (sq ft or acres)
-- minFrontSetback: Minimum front yard setback (feet)
-- minSideSetback: Minimum side yard setback (feet) 
-- minRearSetback: Minimum rear yard setback (feet)
-- minLotFrontage: Minimum lot frontage requirement (feet)
-- minLotWidth: Minimum lot width requirement (feet)
+            # Instructions and documents first, the address-specific query last: every address
+            # in a town sends the same bylaws text, so the provider can reuse the cached prefix
+            static_prompt = f"""You are a zoning law expert. Analyze the provided zoning documents to extract specific metrics for the address given after them.
 
-Documents to analyze:
-{document_content}
+{_METRIC_DEFINITIONS}
 
-Return ONLY metrics that are explicitly found with specific values. For each metric, provide:
-- value: The specific numeric value with units (e.g., "25 feet", "5000 sq ft", "2 spaces per 1000 sq ft")
-- quote: Direct quote from the source document showing this requirement
-- source: Document name or section reference
-- note: Any additional context or conditions
+{_METRIC_VALUE_FIELDS}
 
 Return your analysis as a JSON object with this EXACT structure:
 {{
@@ -106,17 +129,31 @@ Return your analysis as a JSON object with this EXACT structure:
     }}
 }}
 
-IMPORTANT: 
-- Only include metrics where you find explicit numeric requirements
-- Do NOT include general analysis or district information
-- Do NOT make up values - only use what's explicitly stated in the documents
-- If a metric is not found, do not include that key in the response"""
+{_EXTRACTION_RULES}
+
+Documents to analyze:
+{document_content}"""
+
+            prompt = f"""Extract the metrics for the address: {address}
+
+Address: {address}
+Jurisdiction: {jurisdiction.get('city', '')}, {jurisdiction.get('state', '')}
+{zoning_context}
+
+Requested Metrics: {', '.join(requested_metrics)}"""
+
+            cache_key = cache.key_for(static_prompt, prompt)
+            cached = _synthesis_cache_get(cache_key)
+            if cached is not None:
+                logger.info("♻️ LLM synthesis served from cache")
+                return cached
 
             # Call LLM API
-            result = _call_openrouter_llm(prompt)
+            result = _call_openrouter_llm(prompt, static_prompt=static_prompt)
             
             if result:
                 logger.info("✅ LLM synthesis completed successfully")
+                _synthesis_cache_put(cache_key, result)
                 return result
             else:
                 logger.warning("⚠️ LLM synthesis returned empty result")
@@ -127,6 +164,148 @@ IMPORTANT:
         return _create_empty_result()
 
 
+def _synthesis_cache_get(key: str) -> Optional[Dict[str, Any]]:
+    with _synthesis_cache_lock:
+        result = _synthesis_cache.get(key)
+        if result is not None:
+            _synthesis_cache.move_to_end(key)
+    if result is None:
+        result = cache.read_json(_SYNTHESIS_NS, key, max_age=_SYNTHESIS_TTL_S)
+        if not isinstance(result, dict):
+            return None
+        _synthesis_cache_remember(key, result)
+    # Callers may annotate the result, so never hand out the cached object itself
+    return copy.deepcopy(result)
+
+
+def _synthesis_cache_put(key: str, result: Dict[str, Any]) -> None:
+    _synthesis_cache_remember(key, result)
+    cache.write_json(_SYNTHESIS_NS, key, result)
+
+
+def _synthesis_cache_remember(key: str, result: Dict[str, Any]) -> None:
+    with _synthesis_cache_lock:
+        _synthesis_cache[key] = copy.deepcopy(result)
+        _synthesis_cache.move_to_end(key)
+        while len(_synthesis_cache) > _SYNTHESIS_CACHE_SIZE:
+            _synthesis_cache.popitem(last=False)
+
+
+def synthesize_metrics_batch(
+    items: List[Dict[str, Any]],
+    requested_metrics: List[str],
+) -> List[Dict[str, Any]]:
+    """
+    Synthesize metrics for several independent addresses with shared prompts
+    
+    Queries are grouped into prompts of up to MAX_SYNTHESIS_BATCH, each sending the
+    extraction instructions once followed by "Query 1", "Query 2", ... sections.
+    
+    Args:
+        items: One dict per address with address, jurisdiction, zoning_districts and documents
+        requested_metrics: List of metrics to extract (shared by every query)
+        
+    Returns:
+        List of results aligned with items, each shaped like synthesize_metrics() output
+    """
+    results: List[Dict[str, Any]] = []
+    for start in range(0, len(items), MAX_SYNTHESIS_BATCH):
+        results.extend(_synthesize_batch(items[start:start + MAX_SYNTHESIS_BATCH], requested_metrics))
+    return results
+
+
+def _synthesize_batch(batch: List[Dict[str, Any]], requested_metrics: List[str]) -> List[Dict[str, Any]]:
+    try:
+        with span(logger, "llm_synthesis_batch"):
+            logger.info(f"🤖 Starting batched LLM synthesis for {len(batch)} addresses")
+            
+            queries = []
+            for i, item in enumerate(batch, start=1):
+                jurisdiction = item.get('jurisdiction') or {}
+                queries.append(f"""Query {i}:
+Address: {item.get('address', '')}
+Jurisdiction: {jurisdiction.get('city', '')}, {jurisdiction.get('state', '')}
+{_format_zoning_context(item.get('zoning_districts'))}
+Documents to analyze:
+{_format_documents(item.get('documents') or [], _MAX_PROMPT_DOCUMENT_CHARS // len(batch))}""")
+            
+            prompt = f"""You are a zoning law expert. Each query below is an independent address with its own zoning documents. Analyze every query separately, using only that query's documents.
+
+Requested Metrics: {', '.join(requested_metrics)}
+
+{_METRIC_DEFINITIONS}
+
+{_METRIC_VALUE_FIELDS}
+
+Return your analysis as a JSON object with this EXACT structure, with one entry per query in query order:
+{{
+    "results": [
+        {{
+            "query": 1,
+            "parkingSummary": {{"drivewayWidth": {{"value": "12 feet", "quote": "direct quote", "source": "section reference", "note": "context"}}}},
+            "zoningAnalysis": {{"minLotArea": {{"value": "5000 sq ft", "quote": "direct quote", "source": "section reference", "note": "context"}}}}
+        }}
+    ]
+}}
+
+{_EXTRACTION_RULES}
+
+""" + "\n\n".join(queries)
+
+            result = _call_openrouter_llm(prompt, max_tokens=4000 * len(batch))
+            
+            by_query: Dict[int, Dict[str, Any]] = {}
+            for entry in (result or {}).get("results") or []:
+                if isinstance(entry, dict) and isinstance(entry.get("query"), int):
+                    by_query[entry["query"]] = {
+                        "parkingSummary": entry.get("parkingSummary") or {},
+                        "zoningAnalysis": entry.get("zoningAnalysis") or {},
+                    }
+            
+            if len(by_query) < len(batch):
+                logger.warning(f"⚠️ Batched LLM synthesis returned {len(by_query)} of {len(batch)} results")
+            return [by_query.get(i) or _create_empty_result() for i in range(1, len(batch) + 1)]
+                
+    except Exception as e:
+        logger.error(f"❌ Batched LLM synthesis failed: {str(e)}", exc_info=True)
+        return [_create_empty_result() for _ in batch]
+
+
+def _format_documents(documents: List[Dict[str, Any]], budget: int = _MAX_PROMPT_DOCUMENT_CHARS) -> str:
+    """Render documents as titled sections for the prompt, within `budget` characters of text"""
+    sections = []
+    for i, doc in enumerate(documents):
+        # Pipeline documents carry their text as 'text' (official bylaws) or 'excerpt' (search results)
+        content = doc.get('content') or doc.get('text') or doc.get('excerpt') or ''
+        title = doc.get('title', f'Document {i+1}')
+        limit = min(_MAX_DOCUMENT_CHARS, budget)
+        if len(content) > limit:
+            logger.warning(f"✂️ Truncating '{title}' from {len(content)} to {limit} characters for the prompt")
+            content = content[:limit] + "\n[... document truncated ...]"
+            budget -= limit
+        else:
+            budget -= len(content)
+        sections.append(f"\n\n=== {title} ===\n{content}")
+        if budget <= 0:
+            if i + 1 < len(documents):
+                logger.warning(f"✂️ Prompt document budget used up; dropping {len(documents) - i - 1} document(s)")
+            break
+    return "".join(sections)
+
+
+def _format_zoning_context(zoning_districts: Optional[List[Any]]) -> str:
+    """Render the known zoning districts, one line each"""
+    lines = []
+    for district in zoning_districts or []:
+        if hasattr(district, 'code') and hasattr(district, 'name'):
+            lines.append(f"Zoning District: {district.code} - {district.name}\n")
+        elif isinstance(district, dict):
+            code = district.get('code', '')
+            name = district.get('name', '')
+            lines.append(f"Zoning District: {code} - {name}\n")
+    return "".join(lines)
+
+
 def estimate_confidence(verified_data: Dict[str, Any]) -> float:
     """
     Estimate confidence score for the verified data
@@ -178,12 +357,15 @@ def estimate_confidence(verified_data: Dict[str, Any]) -> float:
         return 0.3  # Low confidence on error
 
 
-def _call_openrouter_llm(prompt: str) -> Optional[Dict[str, Any]]:
+def _call_openrouter_llm(prompt: str, max_tokens: int = 4000, static_prompt: Optional[str] = None) -> Optional[Dict[str, Any]]:
     """
     Call OpenRouter API for LLM analysis
     
     Args:
         prompt: The prompt to send to the LLM
+        max_tokens: Completion token budget
+        static_prompt: Optional part shared across calls, sent ahead of `prompt` with a
+            cache_control marker so the provider can cache it as a prompt prefix
         
     Returns:
         Parsed JSON response or None on failure
@@ -201,42 +383,44 @@ def _call_openrouter_llm(prompt: str) -> Optional[Dict[str, Any]]:
             "X-Title": "Bylaws-IQ"
         }
         
+        user_content: Any = prompt
+        if static_prompt:
+            user_content = [
+                {"type": "text", "text": static_prompt, "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": prompt},
+            ]
+        
         payload = {
             "model": "google/gemini-2.5-pro",  # Using stable Gemini model
             "messages": [
                 {"role": "system", "content": "You are a zoning law expert specializing in municipal zoning code analysis. Always respond with valid JSON."},
-                {"role": "user", "content": prompt}
+                {"role": "user", "content": user_content}
             ],
-            "max_tokens": 4000,
+            "max_tokens": max_tokens,
             "temperature": 0.1,
             "response_format": {"type": "json_object"}
         }
         
         logger.info("🌐 Calling OpenRouter API for LLM analysis...")
         
-        with httpx.Client(timeout=120.0) as client:
-            response = client.post(
-                "https://openrouter.ai/api/v1/chat/completions",
-                headers=headers,
-                json=payload
-            )
+        response = OPENROUTER_CLIENT.post(OPENROUTER_URL, headers=headers, content=orjson.dumps(payload))
+        
+        if response.status_code == 200:
+            data = orjson.loads(response.content)
+            content = data['choices'][0]['message']['content']
             
-            if response.status_code == 200:
-                data = response.json()
-                content = data['choices'][0]['message']['content']
-                
-                # Parse JSON response
-                try:
-                    result = json.loads(content)
-                    logger.info("✅ Successfully parsed LLM JSON response")
-                    return result
-                except json.JSONDecodeError as e:
-                    logger.error(f"❌ Failed to parse LLM JSON response: {e}")
-                    logger.error(f"Raw content: {content}")
-                    return None
-            else:
-                logger.error(f"❌ OpenRouter API error: {response.status_code} - {response.text}")
+            # Parse JSON response
+            try:
+                result = orjson.loads(content)
+                logger.info("✅ Successfully parsed LLM JSON response")
+                return result
+            except orjson.JSONDecodeError as e:
+                logger.error(f"❌ Failed to parse LLM JSON response: {e}")
+                logger.error(f"Raw content: {content}")
                 return None
+        else:
+            logger.error(f"❌ OpenRouter API error: {response.status_code} - {response.text}")
+            return None
                 
     except Exception as e:
         logger.error(f"❌ OpenRouter API call failed: {str(e)}", exc_info=True)
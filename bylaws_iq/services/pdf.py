@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import functools
+import io
+import multiprocessing
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Iterable, List, Optional, Union
+
+# Poppler's pdftotext, when installed, is the fastest way to get a whole document's text
+_PDFTOTEXT = shutil.which("pdftotext")
+
+# Documents this long are split into page ranges extracted in worker processes
+_PARALLEL_MIN_PAGES = 50
+_PAGES_PER_TASK = 5
+
+
+@functools.lru_cache(maxsize=1)
+def process_pool() -> ProcessPoolExecutor:
+	"""Worker processes for CPU-bound PDF parsing, shared by the whole app.
+
+	Created on first use and kept for the life of the process, so later queries skip
+	worker start-up. "spawn" keeps workers clear of the app's threads and sockets. If the
+	pool breaks, `process_pool.cache_clear()` makes the next call build a fresh one.
+	"""
+	return ProcessPoolExecutor(
+		max_workers=min(4, os.cpu_count() or 1),
+		mp_context=multiprocessing.get_context("spawn"),
+	)
+
+
+def _fitz_text_flags(fitz) -> int:
+	# Plain reading-order text: ligatures and whitespace passed through untouched, text
+	# outside the page box dropped, and no CID lookups for unmapped glyphs (figure labels
+	# on district maps are the usual culprits)
+	return fitz.TEXT_PRESERVE_LIGATURES | fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_MEDIABOX_CLIP
+
+
+def _fitz_page_text(page, flags: int) -> str:
+	"""Page text assembled from MuPDF's text blocks, top-to-bottom then left-to-right.
+
+	Blocks keep each table cell or paragraph together, so dimensional tables come out
+	cell by cell instead of with their columns interleaved line by line.
+	"""
+	blocks = page.get_text("blocks", flags=flags)
+	# (x0, y0, x1, y1, text, block_no, block_type); type 0 is text, 1 is an image
+	text_blocks = sorted((b for b in blocks if b[6] == 0), key=lambda b: (b[1], b[0]))
+	return "\n".join(b[4] for b in text_blocks)
+
+
+def _extract_with_pdftotext(source: Union[bytes, bytearray, str], max_pages: int = 0) -> Optional[str]:
+	"""Document text from pdftotext (pages end with a form feed), or None if unavailable or failing."""
+	if not _PDFTOTEXT:
+		return None
+	from_stdin = not isinstance(source, str)
+	page_limit = ["-l", str(max_pages)] if max_pages > 0 else []
+	try:
+		res = subprocess.run(
+			[_PDFTOTEXT, "-q", "-enc", "UTF-8", *page_limit, "-" if from_stdin else source, "-"],
+			input=source if from_stdin else None,
+			capture_output=True,
+			timeout=60,
+		)
+	except (OSError, subprocess.SubprocessError):
+		return None
+	if res.returncode != 0:
+		return None
+	return res.stdout.decode("utf-8", "ignore")
+
+
+def _take_until(pages: Iterable[str], until: Optional[Callable[[str], bool]]) -> List[str]:
+	"""Pages in order, up to and including the first one `until` returns True for."""
+	if until is None:
+		return list(pages)
+	taken: List[str] = []
+	for page in pages:
+		taken.append(page)
+		if until(page):
+			break
+	return taken
+
+
+def page_texts(
+	source: Union[bytes, bytearray, str],
+	until: Optional[Callable[[str], bool]] = None,
+	max_pages: int = 0,
+) -> List[str]:
+	"""Text of each page of a PDF given as raw bytes or a file path.
+
+	Tries pdftotext first, then PyMuPDF: MuPDF maps glyphs to text in C, several times
+	faster than PyPDF2's pure-Python content-stream interpreter on long bylaws. PyPDF2 is
+	the last resort (an ImportError is raised if no parser is available). Documents of
+	_PARALLEL_MIN_PAGES or more are extracted in page ranges across worker processes.
+
+	`until`, if given, is called with each page's text in order; once it returns True the
+	remaining pages are skipped (and, where the parser allows, never extracted).
+	`max_pages` > 0 reads only that many pages from the start.
+	"""
+	text = _extract_with_pdftotext(source, max_pages)
+	if text is not None:
+		pages = text.split("\f")
+		if pages and not pages[-1]:
+			# pdftotext terminates every page, so the last split is empty
+			pages.pop()
+		return _take_until(pages, until)
+
+	try:
+		import fitz
+	except ImportError:
+		import PyPDF2
+
+		reader = PyPDF2.PdfReader(source if isinstance(source, str) else io.BytesIO(source))
+		page_count = _capped(len(reader.pages), max_pages)
+		if page_count < _PARALLEL_MIN_PAGES:
+			return _take_until((reader.pages[i].extract_text() or "" for i in range(page_count)), until)
+	else:
+		doc = fitz.open(source) if isinstance(source, str) else fitz.open(stream=source, filetype="pdf")
+		try:
+			page_count = _capped(doc.page_count, max_pages)
+			if page_count < _PARALLEL_MIN_PAGES:
+				flags = _fitz_text_flags(fitz)
+				return _take_until((_fitz_page_text(doc[i], flags) for i in range(page_count)), until)
+		finally:
+			doc.close()
+	return _parallel_page_texts(source, page_count, until)
+
+
+def _capped(page_count: int, max_pages: int) -> int:
+	return min(page_count, max_pages) if max_pages > 0 else page_count
+
+
+def _extract_pdf_pages(path: str, start: int, stop: int) -> List[str]:
+	"""Text of pages [start, stop) of the PDF at `path`; module-level so worker processes can run it."""
+	try:
+		import fitz
+	except ImportError:
+		import PyPDF2
+
+		reader = PyPDF2.PdfReader(path)
+		return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+	doc = fitz.open(path)
+	try:
+		flags = _fitz_text_flags(fitz)
+		return [_fitz_page_text(doc[i], flags) for i in range(start, stop)]
+	finally:
+		doc.close()
+
+
+def _parallel_page_texts(
+	source: Union[bytes, bytearray, str],
+	page_count: int,
+	until: Optional[Callable[[str], bool]] = None,
+) -> List[str]:
+	# Workers open the file themselves, so in-memory PDFs are spilled to a temp file once
+	# rather than pickled to every task
+	tmp_path = None
+	if not isinstance(source, str):
+		fd, tmp_path = tempfile.mkstemp(suffix=".pdf")
+		with os.fdopen(fd, "wb") as f:
+			f.write(source)
+	path = tmp_path or source
+	pages: List[str] = []
+	try:
+		try:
+			pool = process_pool()
+			futures = [
+				pool.submit(_extract_pdf_pages, path, start, min(start + _PAGES_PER_TASK, page_count))
+				for start in range(0, page_count, _PAGES_PER_TASK)
+			]
+			try:
+				for future in futures:
+					for page in future.result():
+						pages.append(page)
+						if until is not None and until(page):
+							return pages
+				return pages
+			finally:
+				# Ranges past an early stop that haven't started yet are never run
+				for future in futures:
+					future.cancel()
+		except Exception as e:
+			if isinstance(e, BrokenProcessPool):
+				# A crashed worker poisons the pool; replace it on the next call
+				process_pool.cache_clear()
+			# Carry on in-process from the first page the pool didn't deliver
+			return pages + _take_until(_extract_pdf_pages(path, len(pages), page_count), until)
+	finally:
+		if tmp_path:
+			try:
+				os.unlink(tmp_path)
+			except OSError:
+				pass
+
+
+def extract_text(
+	source: Union[bytes, bytearray, str],
+	until: Optional[Callable[[str], bool]] = None,
+	max_pages: int = 0,
+) -> str:
+	"""Text of every page of a PDF (or up to where `until` or `max_pages` stops it), newline-separated."""
+	return "\n".join(page_texts(source, until, max_pages))
@@ -1,17 +1,33 @@
 from __future__ import annotations
 
-from typing import Optional, Tuple
+import asyncio
+from typing import Any, Callable, List, Optional, Tuple, Union
 import logging
+from .. import cache
 from ..logging_config import configure_logging, span
+from . import pdf as pdf_service
 
+import httpx
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 from tenacity import retry, stop_after_attempt, wait_exponential
-from pdfminer.high_level import extract_text as pdf_extract_text
 
 
 HEADERS = {"User-Agent": "ByLaws-IQ/0.1 (contact: dev@example.com)"}
 
+# Keep-alive pool shared by the synchronous helpers (thread-safe for plain GETs)
+_SESSION = requests.Session()
+_SESSION.headers.update(HEADERS)
+_SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+_SESSION.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+
+# Enough HTML to yield well over the first 8k characters of page text, even on markup-heavy pages
+MAX_HTML_BYTES = 256 * 1024
+
+# Disk cache namespaces for conditional (ETag/Last-Modified) revalidation
+_HTTP_BODY_NS = "http-body"
+_HTTP_META_NS = "http-meta"
+
 
 @retry(wait=wait_exponential(multiplier=0.5, min=1, max=8), stop=stop_after_attempt(3))
 def fetch(url: str, timeout: int = 30) -> Tuple[Optional[str], Optional[bytes], Optional[str]]:
@@ -23,7 +39,7 @@ def fetch(url: str, timeout: int = 30) -> Tuple[Optional[str], Optional[bytes],
 	configure_logging()
 	logger = logging.getLogger("bylaws_iq.scrape")
 	with span(logger, "http.get"):
-		r = requests.get(url, headers=HEADERS, timeout=timeout)
+		r = _SESSION.get(url, timeout=timeout)
 		r.raise_for_status()
 		ctype = r.headers.get("Content-Type", "").split(";")[0].strip().lower()
 		logger.info("http.status: %s %s", r.status_code, url)
@@ -32,30 +48,177 @@ def fetch(url: str, timeout: int = 30) -> Tuple[Optional[str], Optional[bytes],
 		return None, r.content, ctype or None
 
 
+def fetch_many(
+	urls: List[str],
+	timeout: int = 30,
+	max_html_bytes: Optional[int] = None,
+	on_result: Optional[Callable[[str, Any], None]] = None,
+) -> List[Union[Tuple[Optional[str], Optional[bytes], Optional[str]], BaseException]]:
+	"""Fetch several URLs concurrently; results line up with `urls`.
+
+	Each entry is the (text, content_bytes, content_type) tuple `fetch` returns, or the
+	exception that URL failed with, so one bad URL doesn't sink the batch.
+	With `max_html_bytes`, HTML/text bodies stop downloading after that many bytes
+	(callers that only read the head of a page); other content is read in full.
+	Repeated URLs are fetched once, and responses carrying ETag/Last-Modified are kept
+	on disk and revalidated on later calls, so an unchanged page costs a 304.
+	`on_result(url, result)` is called as each distinct URL completes, so callers can start
+	processing early arrivals while slower fetches are still in flight; keep it cheap.
+	"""
+	configure_logging()
+	unique = list(dict.fromkeys(urls))
+	fetched = dict(zip(unique, asyncio.run(_afetch_all(unique, timeout, max_html_bytes, on_result))))
+	return [fetched[url] for url in urls]
+
+
+async def _afetch_all(
+	urls: List[str],
+	timeout: int,
+	max_html_bytes: Optional[int],
+	on_result: Optional[Callable[[str, Any], None]] = None,
+) -> list:
+	logger = logging.getLogger("bylaws_iq.scrape")
+
+	async def one(client: httpx.AsyncClient, url: str) -> Any:
+		try:
+			result = await _afetch(client, url, logger, max_html_bytes)
+		except Exception as e:
+			result = e
+		if on_result:
+			try:
+				on_result(url, result)
+			except Exception:
+				logger.debug("fetch.on_result failed: %s", url, exc_info=True)
+		return result
+
+	with span(logger, "http.get_many"):
+		async with httpx.AsyncClient(headers=HEADERS, timeout=timeout, follow_redirects=True) as client:
+			return await asyncio.gather(
+				*(one(client, url) for url in urls),
+				return_exceptions=True,
+			)
+
+
+@retry(wait=wait_exponential(multiplier=0.5, min=1, max=8), stop=stop_after_attempt(3))
+async def _afetch(
+	client: httpx.AsyncClient,
+	url: str,
+	logger: logging.Logger,
+	max_html_bytes: Optional[int] = None,
+) -> Tuple[Optional[str], Optional[bytes], Optional[str]]:
+	key = cache.key_for(url)
+	meta, cached_body = _cached_entry(key, max_html_bytes)
+	headers = {}
+	if meta:
+		if meta.get("etag"):
+			headers["If-None-Match"] = meta["etag"]
+		if meta.get("last_modified"):
+			headers["If-Modified-Since"] = meta["last_modified"]
+
+	async with client.stream("GET", url, headers=headers) as r:
+		if r.status_code == 304 and meta:
+			logger.info("http.status: 304 %s (cached)", url)
+			if max_html_bytes and _is_text(meta["ctype"]):
+				cached_body = cached_body[:max_html_bytes]
+			return _as_result(cached_body, meta["ctype"], meta.get("encoding"))
+		r.raise_for_status()
+		ctype = r.headers.get("Content-Type", "").split(";")[0].strip().lower()
+		logger.info("http.status: %s %s", r.status_code, url)
+		limit = None
+		if _is_text(ctype):
+			limit = max_html_bytes or None
+			body = await _aread_head(r, limit) if limit else await r.aread()
+		else:
+			body = await r.aread()
+		etag = r.headers.get("ETag")
+		last_modified = r.headers.get("Last-Modified")
+		if etag or last_modified:
+			cache.write_bytes(_HTTP_BODY_NS, key, body)
+			cache.write_json(_HTTP_META_NS, key, {
+				"etag": etag,
+				"last_modified": last_modified,
+				"ctype": ctype,
+				"encoding": r.encoding,
+				"limit": limit,
+			})
+		return _as_result(body, ctype, r.encoding)
+
+
+def _cached_entry(key: str, max_html_bytes: Optional[int]) -> Tuple[Optional[dict], Optional[bytes]]:
+	meta = cache.read_json(_HTTP_META_NS, key)
+	if not meta:
+		return None, None
+	# A body cut at a smaller limit can't stand in for a bigger read
+	limit = meta.get("limit")
+	if limit is not None and (not max_html_bytes or max_html_bytes > limit):
+		return None, None
+	body = cache.read_bytes(_HTTP_BODY_NS, key)
+	if body is None:
+		return None, None
+	return meta, body
+
+
+def _is_text(ctype: str) -> bool:
+	return ctype.startswith("text/") or "html" in ctype
+
+
+def _as_result(body: bytes, ctype: str, encoding: Optional[str]) -> Tuple[Optional[str], Optional[bytes], Optional[str]]:
+	if _is_text(ctype):
+		return body.decode(encoding or "utf-8", errors="replace"), body, ctype
+	return None, body, ctype or None
+
+
+async def _aread_head(r: httpx.Response, limit: int) -> bytes:
+	# Leaving the stream early closes the connection instead of draining the body
+	chunks = []
+	size = 0
+	async for chunk in r.aiter_bytes():
+		chunks.append(chunk)
+		size += len(chunk)
+		if size >= limit:
+			break
+	return b"".join(chunks)[:limit]
+
+
 @retry(wait=wait_exponential(multiplier=0.5, min=1, max=8), stop=stop_after_attempt(3))
 def fetch_html(url: str, timeout: int = 20) -> Optional[str]:
 	configure_logging()
 	logger = logging.getLogger("bylaws_iq.scrape")
 	with span(logger, "http.get"):
-		r = requests.get(url, headers=HEADERS, timeout=timeout)
+		r = _SESSION.get(url, timeout=timeout)
 		r.raise_for_status()
 		logger.info("http.status: %s %s", r.status_code, url)
 		return r.text
 
 
 def parse_text_from_html(html: str) -> str:
+	from bs4 import BeautifulSoup
+
 	soup = BeautifulSoup(html, "lxml")
 	for tag in soup(["script", "style", "noscript"]):
 		tag.decompose()
 	return soup.get_text(" ", strip=True)
 
 
-def try_extract_pdf_text(url: str, content_bytes: bytes) -> Optional[str]:
+def try_extract_pdf_text(url: str, content_bytes: bytes, max_pages: int = 0) -> Optional[str]:
+	"""Text of a PDF, or None. `max_pages` > 0 stops after that many pages.
+
+	Uses the native parsers behind services.pdf (pdftotext, then MuPDF); pure-Python
+	pdfminer is only the fallback for when neither they nor PyPDF2 are available. Runs in
+	worker processes, so `max_pages` should stay under pdf's parallel threshold.
+	"""
 	if not url.lower().endswith(".pdf"):
 		return None
+	try:
+		return pdf_service.extract_text(content_bytes, max_pages=max_pages)
+	except ImportError:
+		pass
+	except Exception:
+		return None
 	try:
 		from io import BytesIO
+		from pdfminer.high_level import extract_text as pdf_extract_text
 
-		return pdf_extract_text(BytesIO(content_bytes))
+		return pdf_extract_text(BytesIO(content_bytes), maxpages=max_pages)
 	except Exception:
 		return None
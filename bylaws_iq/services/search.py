@@ -1,34 +1,35 @@
 from __future__ import annotations
 
 import os
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List, Tuple
+from urllib.parse import urlparse
 import logging
-from ..logging_config import configure_logging, span
+from ..logging_config import configure_logging, load_env_once, span
 
-from tavily import TavilyClient  # type: ignore
-from dotenv import load_dotenv
 
+def _domain_allowed(url: str, allowed_domains: Tuple[str, ...]) -> bool:
+	host = (urlparse(url).hostname or "").lower()
+	return bool(host) and host.endswith(allowed_domains)
 
-def _domain_allowed(url: str, allowed_domains: List[str]) -> bool:
-	return any(part in url for part in allowed_domains)
 
-
-def search_documents(query: str, allowed_domains: List[str]) -> List[Dict[str, Any]]:
+def search_documents(query: str, allowed_domains: Iterable[str]) -> List[Dict[str, Any]]:
 	configure_logging()
 	logger = logging.getLogger("bylaws_iq.search")
-	try:
-		load_dotenv()
-	except Exception:
-		pass
+	load_env_once()
 	api_key = os.getenv("TAVILY_API_KEY")
 	if not api_key:
 		logger.info("tavily.disabled: no API key present")
 		return []
+	# Only the fallback searches, so the Tavily SDK is imported on first use rather than
+	# on every start-up
+	from tavily import TavilyClient  # type: ignore
+
 	client = TavilyClient(api_key=api_key)
 	with span(logger, "tavily.search"):
 		res = client.search(query=query, topic="general", include_raw_content=True, max_results=8)
 	items = res.get("results", [])
-	filtered = [i for i in items if _domain_allowed(i.get("url", ""), allowed_domains)]
+	allowed = tuple(allowed_domains)
+	filtered = [i for i in items if _domain_allowed(i.get("url", ""), allowed)]
 	logger.info("tavily.results: total=%d filtered=%d", len(items), len(filtered))
 	return filtered
 
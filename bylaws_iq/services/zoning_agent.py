@@ -28,10 +28,10 @@ import logging
 import requests
 import time
 import random
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple, Any
 from urllib.parse import urljoin, urlparse
 from bs4 import BeautifulSoup
-from dotenv import load_dotenv
 
 from ..logging_config import configure_logging, span
 from . import search
@@ -76,6 +76,9 @@ class CombinedZoningAgent:
         self.classification_model = self.map_agent.classification_model
         self.downloaded_pdfs = self.map_agent.downloaded_pdfs
         
+        # (address, future of (website searched, results)) from prefetch_zoning_bylaws()
+        self._bylaws_prefetch: Optional[Tuple[str, Future]] = None
+        
     @property 
     def driver(self):
         """Delegate driver access to map agent"""
@@ -103,6 +106,24 @@ class CombinedZoningAgent:
             self.logger.info(f"🎯 Delegating zoning district discovery to ZoningMapAgent for: {address}")
             return self.map_agent.find_zoning_district(address)
     
+    def prefetch_zoning_bylaws(self, address: str) -> None:
+        """
+        Start bylaws discovery for an address in the background
+        
+        Bylaws discovery only needs the address (the district code doesn't steer it), so it
+        can run on the bylaws agent's own WebDriver while the map agent determines the
+        district. The prefetch finds the official website through its own MMA lookup; the
+        next find_zoning_bylaws() call for the same address reuses its results only if that
+        is the website the map agent settled on, and otherwise searches again.
+        """
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bylaws-iq-bylaws")
+        self._bylaws_prefetch = (address, executor.submit(self._discover_bylaws_with_website, address))
+        executor.shutdown(wait=False)
+    
+    def _discover_bylaws_with_website(self, address: str) -> Tuple[Optional[str], Optional[List[Dict[str, Any]]]]:
+        results = self.bylaws_agent.find_zoning_bylaws(address)
+        return getattr(self.bylaws_agent, '_last_official_website', None), results
+    
     def find_zoning_bylaws(self, address: str, official_website: str = None, zoning_district: str = None) -> Optional[List[Dict[str, Any]]]:
         """
         Find zoning bylaws documents for an address
@@ -119,8 +140,6 @@ class CombinedZoningAgent:
             list: List of discovered bylaws documents or None if discovery fails
         """
         with span(self.logger, "combined_agent.find_zoning_bylaws"):
-            self.logger.info(f"📋 Delegating bylaws discovery to ZoningBylawsAgent for: {address}")
-            
             # Reuse the official website found by the map agent to avoid duplicate lookups
             if not official_website:
                 cached_website = getattr(self.map_agent, '_last_official_website', None)
@@ -130,6 +149,21 @@ class CombinedZoningAgent:
                 else:
                     self.logger.warning("⚠️ No cached official website available from map discovery")
             
+            prefetch, self._bylaws_prefetch = self._bylaws_prefetch, None
+            if prefetch and prefetch[0] == address:
+                # Waiting also keeps the bylaws agent's WebDriver to one caller at a time
+                prefetched_website, prefetched_results = prefetch[1].result()
+                if prefetched_results and (
+                    not official_website or self.map_agent._same_domain(prefetched_website or "", official_website)
+                ):
+                    self.logger.info(f"♻️ Using bylaws discovered alongside map discovery for: {address}")
+                    return prefetched_results
+                if prefetched_results:
+                    self.logger.info(
+                        f"🔄 Prefetched bylaws came from {prefetched_website}, not {official_website}; searching again"
+                    )
+            
+            self.logger.info(f"📋 Delegating bylaws discovery to ZoningBylawsAgent for: {address}")
             return self.bylaws_agent.find_zoning_bylaws(address, official_website, zoning_district)
     
     def discover_complete_zoning_info(self, address: str) -> Optional[Dict[str, Any]]:
@@ -26,17 +26,20 @@ import os
 import re
 import json
 import logging
-import requests
 import time
 import random
+import base64
+import hashlib
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple, Any
 from urllib.parse import urljoin, urlparse
 from bs4 import BeautifulSoup
-from dotenv import load_dotenv
 
-from ..logging_config import configure_logging, span
+from ..logging_config import configure_logging, load_env_once, span
 from . import search
-from .base_zoning_agent import BaseZoningAgent
+from .base_zoning_agent import BaseZoningAgent, canonical_url
 
 # Selenium imports for JavaScript content handling
 from selenium import webdriver
@@ -61,6 +64,10 @@ class ZoningBylawsAgent(BaseZoningAgent):
     
     def __init__(self):
         super().__init__("zoning_bylaws_agent")
+        # PDFs download on worker threads, but the WebDriver fallback takes one caller at a time
+        self._driver_lock = threading.Lock()
+        self._pdf_files_by_hash: Dict[str, str] = {}  # SHA-256 of a downloaded PDF -> saved path
+        
     def find_zoning_bylaws(self, address: str, official_website: str = None, zoning_district: str = None) -> Optional[List[Dict[str, Any]]]:
         """
         Find zoning bylaws PDFs using multiple discovery methods
@@ -113,6 +120,7 @@ class ZoningBylawsAgent(BaseZoningAgent):
             self.logger.info(f"🏛️ Starting zoning bylaws search for: {city_part}, {state}")
             
             # Step 2: Use provided official website or find it via MMA lookup
+            self._last_official_website = None
             website_url = official_website
             if website_url:
                 self.logger.info(f"♻️ Using provided official website: {website_url}")
@@ -122,6 +130,8 @@ class ZoningBylawsAgent(BaseZoningAgent):
                 if not website_url:
                     self.logger.error(f"Could not find official website for {city_part}, {state}")
                     return None
+            # Recorded so callers can tell which site the results came from
+            self._last_official_website = website_url
             
             # Step 3: Try multiple discovery methods in sequence
             # Method 1: Zoning Board of Appeals
@@ -346,7 +356,7 @@ class ZoningBylawsAgent(BaseZoningAgent):
             from bs4 import BeautifulSoup
             from urllib.parse import urljoin, urlparse
             
-            soup = BeautifulSoup(page_source, 'html.parser')
+            soup = BeautifulSoup(page_source, 'lxml')
             base_domain = urlparse(website_url).netloc
             
             # Domain normalization function
@@ -647,7 +657,7 @@ class ZoningBylawsAgent(BaseZoningAgent):
             from urllib.parse import urljoin, urlparse
             import re
             
-            soup = BeautifulSoup(page_source, 'html.parser')
+            soup = BeautifulSoup(page_source, 'lxml')
             base_domain = urlparse(current_url).netloc
             
             found_elements = []
@@ -803,6 +813,12 @@ class ZoningBylawsAgent(BaseZoningAgent):
                 
                 # PRIORITY 1: Process PDF documents first
                 if pdf_elements:
+                    # Pages often link the same PDF more than once, sometimes with tracking parameters
+                    unique_pdfs = {}
+                    for element in pdf_elements:
+                        unique_pdfs.setdefault(canonical_url(element['url']), element)
+                    pdf_elements = list(unique_pdfs.values())
+                    
                     print(f"\n🎯 PRIORITY 1: Processing {len(pdf_elements)} PDF document(s)")
                     print("=" * 50)
                     
@@ -810,9 +826,16 @@ class ZoningBylawsAgent(BaseZoningAgent):
                         print(f"\n📄 PDF {i}: {element['link_text'][:60]}")
                         print(f"   Keyword: {element['keyword']}")
                         print(f"   URL: {element['url']}")
-                        print(f"   📥 DOWNLOADING PDF...")
-                        
-                        success = self._download_pdf(element['url'], element['link_text'], current_url)
+                    
+                    # Downloads are network-bound, so fetch them together (map() keeps link order)
+                    print(f"   📥 DOWNLOADING {len(pdf_elements)} PDF(s)...")
+                    with ThreadPoolExecutor(max_workers=min(8, len(pdf_elements))) as pool:
+                        successes = list(pool.map(
+                            lambda element: self._download_pdf(element['url'], element['link_text'], current_url),
+                            pdf_elements,
+                        ))
+                    
+                    for element, success in zip(pdf_elements, successes):
                         if success:
                             downloaded_documents.append({
                                 'title': element['link_text'],
@@ -892,10 +915,6 @@ class ZoningBylawsAgent(BaseZoningAgent):
             traceback.print_exc()
             return []
 
-    def _normalize_domain(self, domain: str) -> str:
-        """Normalize domain by removing www prefix"""
-        return domain.replace('www.', '') if domain.startswith('www.') else domain
-
     def _is_ecode360_link(self, url: str) -> bool:
         """Check if a URL points to ecode360.com"""
         return 'ecode360.com' in url.lower()
@@ -947,11 +966,11 @@ class ZoningBylawsAgent(BaseZoningAgent):
         """Download a PDF file and return success status, with duplicate detection"""
         try:
             import os
-            import requests
             
-            # Check if this PDF has already been downloaded
-            if pdf_url in self.downloaded_pdfs:
-                existing_info = self.downloaded_pdfs[pdf_url]
+            # Check if this PDF has already been downloaded (tracking parameters aside)
+            pdf_key = canonical_url(pdf_url)
+            if pdf_key in self.downloaded_pdfs:
+                existing_info = self.downloaded_pdfs[pdf_key]
                 existing_filename = existing_info['filename']
                 existing_sources = existing_info['source_pages']
                 
@@ -976,27 +995,59 @@ class ZoningBylawsAgent(BaseZoningAgent):
             download_dir = "pdf_downloads"
             os.makedirs(download_dir, exist_ok=True)
             
-            # Clean filename
+            # Clean filename; link texts repeat across PDFs ("Zoning Bylaw"), so a hash of the
+            # URL keeps every download in its own file
             safe_name = "".join(c for c in pdf_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
             safe_name = safe_name[:50]  # Limit length
-            if not safe_name.endswith('.pdf'):
-                safe_name += '.pdf'
+            safe_name += f"-{hashlib.sha256(pdf_key.encode('utf-8')).hexdigest()[:12]}.pdf"
             
             file_path = os.path.join(download_dir, safe_name)
             
-            # Download the file
-            response = requests.get(pdf_url, timeout=30)
-            response.raise_for_status()
-            
-            with open(file_path, 'wb') as f:
-                f.write(response.content)
+            # Stream the file straight to disk; the browser is only used when the site blocks us
+            with self.session.get(pdf_url, timeout=30, stream=True) as response:
+                if response.status_code == 403 and self.driver is not None:
+                    print(f"🛡️ Direct download blocked (403) - retrying through the browser session")
+                    content = self._fetch_pdf_via_driver(pdf_url)
+                    if content is None:
+                        response.raise_for_status()
+                    chunks = (content,)
+                else:
+                    response.raise_for_status()
+                    chunks = response.iter_content(chunk_size=65536)
+                
+                # Write via a temp file so an interrupted download never leaves a partial PDF behind
+                fd, tmp_path = tempfile.mkstemp(dir=download_dir, suffix='.part')
+                digest = hashlib.sha256()
+                try:
+                    with os.fdopen(fd, 'wb') as f:
+                        for chunk in chunks:
+                            digest.update(chunk)
+                            f.write(chunk)
+                    
+                    # The same file mirrored under another URL is kept once, under its first name.
+                    # Only files already in place are recorded, so a hit always points at the
+                    # right bytes; identical files finishing together are simply both kept.
+                    same_file = self._pdf_files_by_hash.get(digest.hexdigest())
+                    if same_file is not None:
+                        os.unlink(tmp_path)
+                        file_path = same_file
+                        print(f"♻️ Same content as an earlier download: {file_path}")
+                    else:
+                        os.replace(tmp_path, file_path)
+                        self._pdf_files_by_hash.setdefault(digest.hexdigest(), file_path)
+                except BaseException:
+                    try:
+                        os.unlink(tmp_path)
+                    except OSError:
+                        pass
+                    raise
             
             print(f"✅ Downloaded to: {file_path}")
-            print(f"📊 File size: {len(response.content)} bytes")
+            print(f"📊 File size: {os.path.getsize(file_path)} bytes")
             
             # Track this download
             source_pages = [source_page] if source_page else []
-            self.downloaded_pdfs[pdf_url] = {
+            self.downloaded_pdfs[pdf_key] = {
                 'filename': file_path,
                 'source_pages': source_pages
             }
@@ -1007,6 +1058,36 @@ class ZoningBylawsAgent(BaseZoningAgent):
             print(f"❌ Download failed: {str(e)}")
             return False
 
+    def _fetch_pdf_via_driver(self, pdf_url: str) -> Optional[bytes]:
+        """
+        Fetch a PDF from inside the browser session, for hosts that refuse plain HTTP clients
+        
+        The request runs as a same-page fetch(), so it carries the browser's cookies and
+        anti-bot clearance. Cross-origin URLs are blocked by CORS and come back as None.
+        """
+        script = """
+            const [url, done] = arguments;
+            fetch(url, {credentials: 'include'})
+                .then(r => r.ok ? r.arrayBuffer() : Promise.reject(r.status))
+                .then(buf => {
+                    const bytes = new Uint8Array(buf);
+                    let binary = '';
+                    for (let i = 0; i < bytes.length; i += 0x8000) {
+                        binary += String.fromCharCode.apply(null, bytes.subarray(i, i + 0x8000));
+                    }
+                    done(btoa(binary));
+                })
+                .catch(() => done(null));
+        """
+        try:
+            with self._driver_lock:
+                self.driver.set_script_timeout(60)
+                data = self.driver.execute_async_script(script, pdf_url)
+        except Exception as e:
+            print(f"⚠️ Browser fetch failed: {str(e)}")
+            return None
+        return base64.b64decode(data) if data else None
+
     def _follow_page_for_pdfs(self, driver: webdriver.Chrome, page_url: str, zoning_keywords: list) -> List[Dict[str, Any]]:
         """Follow a page link and search specifically for PDF links, returning downloaded documents"""
         try:
@@ -1020,7 +1101,7 @@ class ZoningBylawsAgent(BaseZoningAgent):
             from urllib.parse import urljoin, urlparse
             import re
             
-            soup = BeautifulSoup(page_source, 'html.parser')
+            soup = BeautifulSoup(page_source, 'lxml')
             
             print(f"\n🔍 SEARCHING FOR ZONING PDFs ON: {page_url}")
             print("-" * 40)
@@ -1173,10 +1254,10 @@ class ZoningBylawsAgent(BaseZoningAgent):
             print("-" * 50)
             
             # Prepare the candidate list for LLM analysis
-            candidates_text = "Available zoning PDFs:\n\n"
-            for i, pdf in enumerate(pdf_links, 1):
-                candidates_text += f"{i}. {pdf['text']}\n"
-                candidates_text += f"   URL: {pdf['url']}\n\n"
+            candidates_text = "Available zoning PDFs:\n\n" + "".join(
+                f"{i}. {pdf['text']}\n   URL: {pdf['url']}\n\n"
+                for i, pdf in enumerate(pdf_links, 1)
+            )
             
             # Create prompt for LLM analysis
             prompt = f"""You are analyzing multiple zoning code PDFs to identify the most recent version.
@@ -1258,11 +1339,9 @@ Example:
     def _call_llm_classification_for_selection(self, prompt: str) -> str:
         """Call LLM for PDF selection using gemini-1.5-flash with structured outputs"""
         try:
-            import requests
             import os
-            from dotenv import load_dotenv
             
-            load_dotenv()
+            load_env_once()
             api_key = os.getenv('OPENROUTER_API_KEY')
             
             if not api_key:
@@ -1325,7 +1404,7 @@ Example:
             self.logger.debug(f"🤖 LLM selection request with structured outputs: {len(prompt)} chars")
             print(f"🤖 Using OpenRouter Structured Outputs for reliable JSON response")
             
-            response = requests.post(url, json=payload, headers=headers, timeout=30)
+            response = self.session.post(url, json=payload, headers=headers, timeout=30)
             response.raise_for_status()
             
             result = response.json()
@@ -1349,11 +1428,9 @@ Example:
     def _call_llm_fallback_selection(self, prompt: str) -> str:
         """Fallback LLM call without structured outputs"""
         try:
-            import requests
             import os
-            from dotenv import load_dotenv
             
-            load_dotenv()
+            load_env_once()
             api_key = os.getenv('OPENROUTER_API_KEY')
             
             url = "https://openrouter.ai/api/v1/chat/completions"
@@ -1381,7 +1458,7 @@ Example:
             
             print(f"🔄 Using fallback JSON prompting method")
             
-            response = requests.post(url, json=payload, headers=headers, timeout=30)
+            response = self.session.post(url, json=payload, headers=headers, timeout=30)
             response.raise_for_status()
             
             result = response.json()
@@ -1664,7 +1741,7 @@ Example:
                 print(f"📄 Page preview: {preview}...")
                 
                 # Try to find any elements with 'download' in text
-                soup_debug = BeautifulSoup(page_source, 'html.parser')
+                soup_debug = BeautifulSoup(page_source, 'lxml')
                 download_elements = soup_debug.find_all(text=lambda text: text and 'download' in text.lower())
                 print(f"🔍 Found {len(download_elements)} text elements containing 'download'")
                 
@@ -29,18 +29,20 @@ with multiple fallback strategies to maximize success rate across different juri
 import os
 import re
 import json
+import functools
+import hashlib
 import logging
-import requests
 import time
 import random
 from typing import Dict, List, Optional, Tuple, Any
 from urllib.parse import urljoin, urlparse
 from bs4 import BeautifulSoup
-from dotenv import load_dotenv
 
-from ..logging_config import configure_logging, span
+from ..logging_config import configure_logging, load_env_once, span
+from . import pdf as pdf_service
 from . import search
-from .base_zoning_agent import BaseZoningAgent
+from .base_zoning_agent import BaseZoningAgent, mma_directory_html
+from .llm import OPENROUTER_CLIENT, OPENROUTER_URL
 
 # Selenium imports for JavaScript content handling
 from selenium import webdriver
@@ -54,6 +56,34 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException,
 from webdriver_manager.chrome import ChromeDriverManager
 
 
+# Phrase breaks in scraped page text: any whitespace run containing a line break (as
+# str.splitlines() sees them) or a double space. Other whitespace inside a phrase is kept.
+_PHRASE_BREAK_RE = re.compile(r"\s*(?:[\n\r\v\f\x1c-\x1e\x85\u2028\u2029]| {2})\s*")
+
+
+
+@functools.lru_cache(maxsize=1)
+def _mma_text_entries(html: bytes) -> List[Tuple[str, str, str]]:
+    """(cleaned lowercase name, name as written, URL) for each "Name – www.site" line of the MMA directory."""
+    entries = []
+    for line in BeautifulSoup(html, 'lxml').get_text().split('\n'):
+        line_clean = line.strip()
+        
+        # Look for lines with URLs (any domain - no filtering)
+        if '–' in line_clean and ('www.' in line_clean or '.gov' in line_clean or '.us' in line_clean or '.org' in line_clean or '.com' in line_clean):
+            parts = line_clean.split('–')
+            if len(parts) >= 2:
+                name_part = parts[0].strip()
+                url_match = re.search(r'((?:www\.)?[^\s]+\.[a-z]+)', parts[1].strip())
+                if url_match:
+                    url = url_match.group(1)
+                    # Ensure URL has protocol
+                    if not url.startswith('http'):
+                        url = f"https://{url}"
+                    # Clean up city name (remove markdown formatting)
+                    entries.append((re.sub(r'\*+', '', name_part).strip().lower(), name_part, url))
+    return entries
+
 class ZoningMapAgent(BaseZoningAgent):
     """
     Specialized agent for zoning map discovery and analysis
@@ -63,6 +93,8 @@ class ZoningMapAgent(BaseZoningAgent):
     - Analyzing maps to extract zoning district information
     """
     
+    classification_system_message = "You are a URL classifier. Select the official government website URL from search results."
+    
     def __init__(self):
         super().__init__("zoning_map_agent")
     
@@ -439,7 +471,7 @@ class ZoningMapAgent(BaseZoningAgent):
         with span(self.logger, "selenium.parse_results"):
             try:
                 # Clean the HTML content for LLM processing
-                soup = BeautifulSoup(page_source, 'html.parser')
+                soup = BeautifulSoup(page_source, 'lxml')
                 
                 # Remove script and style elements
                 for script in soup(["script", "style"]):
@@ -574,7 +606,7 @@ class ZoningMapAgent(BaseZoningAgent):
         with span(self.logger, "fallback.identify_library"):
             try:
                 # Parse HTML to extract links and their text
-                soup = BeautifulSoup(page_source, 'html.parser')
+                soup = BeautifulSoup(page_source, 'lxml')
                 
                 # Define keywords in priority order (first match wins)
                 target_keywords = [
@@ -731,7 +763,7 @@ class ZoningMapAgent(BaseZoningAgent):
         with span(self.logger, "fallback.parse_library"):
             try:
                 # Parse HTML for detailed link analysis
-                soup = BeautifulSoup(page_source, 'html.parser')
+                soup = BeautifulSoup(page_source, 'lxml')
                 
                 # First, try direct PDF link detection
                 direct_pdf_url = self._extract_direct_pdf_links(soup, maps_page_url)
@@ -981,10 +1013,10 @@ Only return the JSON object. If no zoning map found, return {{}}
                 # Add small delay to avoid rate limiting
                 time.sleep(0.5)
                 
-                response = requests.get(website_url, headers=headers, timeout=30, allow_redirects=True)
+                response = self.session.get(website_url, headers=headers, timeout=30, allow_redirects=True)
                 response.raise_for_status()
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
+                soup = BeautifulSoup(response.content, 'lxml')
                 
                 # Enhanced keywords targeting map libraries and GIS pages specifically
                 planning_keywords = [
@@ -1133,7 +1165,7 @@ Only return the JSON object. If no zoning map found, return {{}}
                 # Add delay between page requests
                 time.sleep(0.8)
                 
-                response = requests.get(page_url, headers=headers, timeout=30, allow_redirects=True)
+                response = self.session.get(page_url, headers=headers, timeout=30, allow_redirects=True)
                 response.raise_for_status()
                 
                 # Debug response details
@@ -1150,7 +1182,7 @@ Only return the JSON object. If no zoning map found, return {{}}
                 # Force UTF-8 encoding
                 response.encoding = 'utf-8'
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
+                soup = BeautifulSoup(response.content, 'lxml')
                 
                 pdf_candidates = []
                 
@@ -1388,17 +1420,7 @@ Only return the JSON object. If no zoning map found, return {{}}
     
     def _is_same_domain(self, base_url: str, check_url: str) -> bool:
         """Check if two URLs are from the same domain"""
-        try:
-            base_domain = urlparse(base_url).netloc.lower()
-            check_domain = urlparse(check_url).netloc.lower()
-            
-            # Remove www. for comparison
-            base_domain = base_domain.replace('www.', '')
-            check_domain = check_domain.replace('www.', '')
-            
-            return base_domain == check_domain
-        except:
-            return False
+        return self._same_domain(base_url, check_url)
     
     def _get_page_title(self, soup: BeautifulSoup) -> str:
         """Extract page title from BeautifulSoup object"""
@@ -1612,11 +1634,11 @@ RULES:
                     'Cache-Control': 'no-cache'
                 }
                 
-                response = requests.get(page_url, headers=headers, timeout=30, allow_redirects=True)
+                response = self.session.get(page_url, headers=headers, timeout=30, allow_redirects=True)
                 response.raise_for_status()
                 response.encoding = 'utf-8'
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
+                soup = BeautifulSoup(response.content, 'lxml')
                 page_text = soup.get_text()
                 
                 # Direct PDF extraction first
@@ -1678,7 +1700,7 @@ RULES:
                     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
                 }
                 
-                response = requests.head(pattern, headers=headers, timeout=10, allow_redirects=True)
+                response = self.session.head(pattern, headers=headers, timeout=10, allow_redirects=True)
                 
                 if response.status_code == 200:
                     content_type = response.headers.get('content-type', '')
@@ -1850,10 +1872,10 @@ RULES:
                 'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
             }
             
-            response = requests.get(website_url, headers=headers, timeout=30)
+            response = self.session.get(website_url, headers=headers, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(response.content, 'lxml')
             
             document_pages = []
             processed_urls = set()
@@ -1899,10 +1921,10 @@ RULES:
                 'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
             }
             
-            response = requests.get(website_url, headers=headers, timeout=30)
+            response = self.session.get(website_url, headers=headers, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(response.content, 'lxml')
             
             # Look for search forms
             search_forms = soup.find_all('form')
@@ -1925,13 +1947,13 @@ RULES:
                     
                     try:
                         if method == 'post':
-                            search_response = requests.post(search_url, data=search_params, headers=headers, timeout=15)
+                            search_response = self.session.post(search_url, data=search_params, headers=headers, timeout=15)
                         else:
-                            search_response = requests.get(search_url, params=search_params, headers=headers, timeout=15)
+                            search_response = self.session.get(search_url, params=search_params, headers=headers, timeout=15)
                         
                         if search_response.status_code == 200:
                             # Extract PDFs from search results
-                            search_soup = BeautifulSoup(search_response.content, 'html.parser')
+                            search_soup = BeautifulSoup(search_response.content, 'lxml')
                             search_pdfs = []
                             
                             for link in search_soup.find_all('a', href=True):
@@ -1982,7 +2004,7 @@ RULES:
         for pattern_url in patterns:
             try:
                 # Check if URL exists (HEAD request)
-                response = requests.head(pattern_url, timeout=10, allow_redirects=True)
+                response = self.session.head(pattern_url, timeout=10, allow_redirects=True)
                 if response.status_code == 200 and 'pdf' in response.headers.get('content-type', '').lower():
                     pattern_candidates.append({
                         'url': pattern_url,
@@ -2029,11 +2051,11 @@ RULES:
                     'Cache-Control': 'no-cache'
                 }
                 
-                response = requests.get(website_url, headers=headers, timeout=30, allow_redirects=True)
+                response = self.session.get(website_url, headers=headers, timeout=30, allow_redirects=True)
                 response.raise_for_status()
                 response.encoding = 'utf-8'
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
+                soup = BeautifulSoup(response.content, 'lxml')
                 page_text = soup.get_text()
                 
                 # Extract all links for LLM analysis
@@ -2143,11 +2165,11 @@ RULES:
                     'Cache-Control': 'no-cache'
                 }
                 
-                response = requests.get(website_url, headers=headers, timeout=30, allow_redirects=True)
+                response = self.session.get(website_url, headers=headers, timeout=30, allow_redirects=True)
                 response.raise_for_status()
                 response.encoding = 'utf-8'
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
+                soup = BeautifulSoup(response.content, 'lxml')
                 
                 # Look for search functionality - multiple detection methods
                 search_forms = []
@@ -2333,9 +2355,9 @@ RULES:
                 }
                 
                 if method == 'POST':
-                    response = requests.post(action_url, data=form_data, headers=headers, timeout=30, allow_redirects=True)
+                    response = self.session.post(action_url, data=form_data, headers=headers, timeout=30, allow_redirects=True)
                 else:
-                    response = requests.get(action_url, params=form_data, headers=headers, timeout=30, allow_redirects=True)
+                    response = self.session.get(action_url, params=form_data, headers=headers, timeout=30, allow_redirects=True)
                 
                 response.raise_for_status()
                 
@@ -2501,7 +2523,7 @@ RULES:
                 }
                 
                 # Test with a simple GET request first
-                response = requests.head(test_url, headers=headers, timeout=5, allow_redirects=True)
+                response = self.session.head(test_url, headers=headers, timeout=5, allow_redirects=True)
                 
                 if response.status_code in [200, 302, 404]:  # 404 is OK for search pages without query
                     search_endpoints.append(test_url)
@@ -2541,9 +2563,9 @@ RULES:
                 
                 for strategy_name, params in search_strategies:
                     try:
-                        self.logger.info(f"search.trying_strategy: {strategy_name} with params: {list(params.keys())}")
+                        self.logger.info("search.trying_strategy: %s with params: %s", strategy_name, list(params))
                         
-                        response = requests.get(base_url, params=params, headers=headers, timeout=30, allow_redirects=True)
+                        response = self.session.get(base_url, params=params, headers=headers, timeout=30, allow_redirects=True)
                         
                         if response.status_code == 200:
                             # Check if this looks like search results with actual content
@@ -2692,11 +2714,11 @@ RULES:
                     'Cache-Control': 'no-cache'
                 }
                 
-                response = requests.get(search_results_url, headers=headers, timeout=30, allow_redirects=True)
+                response = self.session.get(search_results_url, headers=headers, timeout=30, allow_redirects=True)
                 response.raise_for_status()
                 response.encoding = 'utf-8'
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
+                soup = BeautifulSoup(response.content, 'lxml')
                 
                 self.logger.info(f"search.results_page_size: {len(response.text)} characters")
                 
@@ -2750,7 +2772,7 @@ RULES:
             try:
                 # Clean and truncate HTML for LLM processing
                 from bs4 import BeautifulSoup
-                soup = BeautifulSoup(page_html, 'html.parser')
+                soup = BeautifulSoup(page_html, 'lxml')
                 
                 # Remove script and style elements
                 for script in soup(["script", "style"]):
@@ -3073,7 +3095,7 @@ All candidates are confirmed PDFs, so return 0 only if none appear to be zoning
                 self.logger.info(f"📁 Downloading to: {local_path}")
                 
                 # Download the PDF
-                response = requests.get(pdf_url, headers=headers, timeout=30, stream=True)
+                response = self.session.get(pdf_url, headers=headers, timeout=30, stream=True)
                 response.raise_for_status()
                 
                 # Check content type
@@ -3213,11 +3235,9 @@ RULES:
         Call LLM via OpenRouter with actual PDF analysis capability
         """
         try:
-            import httpx
             import os
-            from dotenv import load_dotenv
             
-            load_dotenv()
+            load_env_once()
             api_key = os.getenv("OPENROUTER_API_KEY")
             
             if not api_key:
@@ -3341,58 +3361,53 @@ ADDRESS TO ANALYZE: {address}
             self.logger.info(f"🎯 OPTIMIZATION: Max tokens=2000, reasoning disabled for direct JSON output")
             
             # Make actual API call
-            with httpx.Client(timeout=60) as client:
-                response = client.post(
-                    "https://openrouter.ai/api/v1/chat/completions",
-                    headers=headers,
-                    json=payload
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    content = result['choices'][0]['message']['content']
-                    
-                    self.logger.info(f"✅ SUCCESS: Analysis completed using {model}")
-                    
-                    # Log token usage information
-                    if 'usage' in result:
-                        usage = result['usage']
-                        self.logger.info(f"🔢 TOKEN USAGE: {usage.get('prompt_tokens', 0)} prompt + {usage.get('completion_tokens', 0)} completion = {usage.get('total_tokens', 0)} total")
-                    
-                    # Log finish reason to debug truncation
-                    if 'choices' in result and len(result['choices']) > 0:
-                        finish_reason = result['choices'][0].get('finish_reason', 'unknown')
-                        self.logger.info(f"🏁 FINISH REASON: {finish_reason}")
-                    
-                    self.logger.info(f"📄 Raw LLM Response: {content}")
-                    
-                    # Debug: Check if content is empty but there's reasoning
-                    if not content or content.strip() == "":
-                        # Check if there's reasoning data (O1-style models)
-                        message = result['choices'][0]['message']
-                        if 'reasoning' in message and message['reasoning']:
-                            reasoning_text = message['reasoning']
-                            self.logger.warning(f"⚠️ EMPTY CONTENT but found reasoning - extracting zoning info...")
-                            self.logger.info(f"🧠 Reasoning Content: {reasoning_text[:500]}...")
-                            
-                            # Extract zoning info from reasoning text
-                            extracted_json = self._extract_zoning_from_reasoning(reasoning_text)
-                            if extracted_json:
-                                self.logger.info(f"✅ EXTRACTED FROM REASONING: {extracted_json}")
-                                self.last_successful_model = model
-                                return extracted_json
+            response = OPENROUTER_CLIENT.post(OPENROUTER_URL, headers=headers, json=payload, timeout=60)
+            
+            if response.status_code == 200:
+                result = response.json()
+                content = result['choices'][0]['message']['content']
+                
+                self.logger.info(f"✅ SUCCESS: Analysis completed using {model}")
+                
+                # Log token usage information
+                if 'usage' in result:
+                    usage = result['usage']
+                    self.logger.info(f"🔢 TOKEN USAGE: {usage.get('prompt_tokens', 0)} prompt + {usage.get('completion_tokens', 0)} completion = {usage.get('total_tokens', 0)} total")
+                
+                # Log finish reason to debug truncation
+                if 'choices' in result and len(result['choices']) > 0:
+                    finish_reason = result['choices'][0].get('finish_reason', 'unknown')
+                    self.logger.info(f"🏁 FINISH REASON: {finish_reason}")
+                
+                self.logger.info(f"📄 Raw LLM Response: {content}")
+                
+                # Debug: Check if content is empty but there's reasoning
+                if not content or content.strip() == "":
+                    # Check if there's reasoning data (O1-style models)
+                    message = result['choices'][0]['message']
+                    if 'reasoning' in message and message['reasoning']:
+                        reasoning_text = message['reasoning']
+                        self.logger.warning(f"⚠️ EMPTY CONTENT but found reasoning - extracting zoning info...")
+                        self.logger.info(f"🧠 Reasoning Content: {reasoning_text[:500]}...")
                         
-                        self.logger.error(f"❌ EMPTY RESPONSE: {model} returned empty content")
-                        self.logger.error(f"🔍 Full API Response: {result}")
-                        return None
-                    
-                    # Store the successful model for reference
-                    self.last_successful_model = model
+                        # Extract zoning info from reasoning text
+                        extracted_json = self._extract_zoning_from_reasoning(reasoning_text)
+                        if extracted_json:
+                            self.logger.info(f"✅ EXTRACTED FROM REASONING: {extracted_json}")
+                            self.last_successful_model = model
+                            return extracted_json
                     
-                    return content
-                else:
-                    self.logger.error(f"❌ API ERROR: {response.status_code} - {response.text}")
+                    self.logger.error(f"❌ EMPTY RESPONSE: {model} returned empty content")
+                    self.logger.error(f"🔍 Full API Response: {result}")
                     return None
+                
+                # Store the successful model for reference
+                self.last_successful_model = model
+                
+                return content
+            else:
+                self.logger.error(f"❌ API ERROR: {response.status_code} - {response.text}")
+                return None
             
         except Exception as e:
             self.logger.error(f"❌ REAL ANALYSIS ERROR: {str(e)}", exc_info=True)
@@ -3491,54 +3506,57 @@ ADDRESS TO ANALYZE: {address}
         Fetch and extract text content from a PDF URL
         """
         try:
-            import httpx
+            text_content = self._known_pdf_text(pdf_url)
+            if text_content is not None:
+                self.logger.info(f"♻️ PDF ALREADY EXTRACTED: {pdf_url}")
+                return text_content
             
             self.logger.info(f"📥 FETCHING PDF: {pdf_url}")
             
-            # Download the PDF
-            with httpx.Client(timeout=30) as client:
-                response = client.get(pdf_url, follow_redirects=True)
-                
-                if response.status_code != 200:
-                    self.logger.error(f"❌ PDF FETCH FAILED: {response.status_code}")
-                    return None
+            # Download the PDF over the agents' pooled session
+            response = self.session.get(pdf_url, timeout=30, allow_redirects=True)
+            
+            if response.status_code != 200:
+                self.logger.error(f"❌ PDF FETCH FAILED: {response.status_code}")
+                return None
+            
+            pdf_bytes = response.content
+            self.logger.info(f"📄 Downloaded PDF: {len(pdf_bytes)} bytes")
+            
+            # Same file as one already parsed under another URL (mirrors, renamed links)
+            digest = hashlib.sha256(pdf_bytes).hexdigest()
+            text_content = self._known_pdf_text(pdf_url, digest)
+            if text_content is not None:
+                self.logger.info("♻️ Same content as a PDF already extracted - reusing its text")
+                return text_content
+            
+            # Extract text from PDF
+            try:
+                pages = pdf_service.page_texts(pdf_bytes)
+                text_content = "".join(
+                    f"\n--- PAGE {page_num + 1} ---\n{page_text}\n"
+                    for page_num, page_text in enumerate(pages)
+                )
                 
-                pdf_bytes = response.content
-                self.logger.info(f"📄 Downloaded PDF: {len(pdf_bytes)} bytes")
+                self.logger.info(f"📝 EXTRACTED TEXT: {len(text_content)} characters from {len(pages)} pages")
                 
-                # Extract text from PDF
-                try:
-                    import PyPDF2
-                    import io
-                    
-                    pdf_file = io.BytesIO(pdf_bytes)
-                    pdf_reader = PyPDF2.PdfReader(pdf_file)
-                    
-                    text_content = ""
-                    for page_num, page in enumerate(pdf_reader.pages):
-                        page_text = page.extract_text()
-                        text_content += f"\n--- PAGE {page_num + 1} ---\n{page_text}\n"
-                    
-                    self.logger.info(f"📝 EXTRACTED TEXT: {len(text_content)} characters from {len(pdf_reader.pages)} pages")
-                    
+                # isspace() checks for text without copying the whole document like strip() would
+                if text_content and not text_content.isspace():
                     # Debug: Show sample of extracted content
-                    if text_content.strip():
+                    if self.logger.isEnabledFor(logging.DEBUG):
                         sample_content = text_content[:500] + "..." if len(text_content) > 500 else text_content
-                        self.logger.info(f"📄 PDF CONTENT SAMPLE:")
-                        self.logger.info(f"--- START SAMPLE ---")
-                        self.logger.info(sample_content)
-                        self.logger.info(f"--- END SAMPLE ---")
-                        return text_content
-                    else:
-                        self.logger.warning("⚠️ No text extracted from PDF - might be image-based")
-                        return "PDF contains no extractable text - appears to be image-based zoning map"
-                        
-                except ImportError:
-                    self.logger.error("❌ PyPDF2 not available - install with: pip install PyPDF2")
-                    return None
-                except Exception as e:
-                    self.logger.error(f"❌ PDF TEXT EXTRACTION ERROR: {str(e)}")
-                    return "PDF text extraction failed - analyzing based on URL only"
+                        self.logger.debug("📄 PDF CONTENT SAMPLE:\n--- START SAMPLE ---\n%s\n--- END SAMPLE ---", sample_content)
+                    return self._remember_pdf_text(pdf_url, digest, text_content)
+                else:
+                    self.logger.warning("⚠️ No text extracted from PDF - might be image-based")
+                    return self._remember_pdf_text(pdf_url, digest, "PDF contains no extractable text - appears to be image-based zoning map")
+                    
+            except ImportError:
+                self.logger.error("❌ No PDF parser available - install with: pip install PyMuPDF")
+                return None
+            except Exception as e:
+                self.logger.error(f"❌ PDF TEXT EXTRACTION ERROR: {str(e)}")
+                return "PDF text extraction failed - analyzing based on URL only"
                     
         except Exception as e:
             self.logger.error(f"❌ PDF FETCH ERROR: {str(e)}")
@@ -3597,11 +3615,10 @@ Answer:"""
                     
                     # Debug: Try direct verification with improved headers
                     try:
-                        import requests
                         headers = {
                             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
                         }
-                        test_response = requests.head(response, timeout=10, allow_redirects=True, headers=headers)
+                        test_response = self.session.head(response, timeout=10, allow_redirects=True, headers=headers)
                         status = test_response.status_code
                         is_valid_status = status in [200, 301, 302, 403]
                         self.logger.info(f"agent.direct_test: {response} returned status {status}, valid: {is_valid_status}")
@@ -3635,7 +3652,7 @@ Answer:"""
                 'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
             }
             
-            response = requests.head(url, timeout=10, allow_redirects=True, headers=headers)
+            response = self.session.head(url, timeout=10, allow_redirects=True, headers=headers)
             status_code = response.status_code
             self.logger.debug(f"verify_website: {url} returned status {status_code}")
             
@@ -3646,7 +3663,7 @@ Answer:"""
             if not is_valid:
                 # Try GET request as fallback for HEAD-blocking sites
                 try:
-                    get_response = requests.get(url, timeout=10, allow_redirects=True, headers=headers)
+                    get_response = self.session.get(url, timeout=10, allow_redirects=True, headers=headers)
                     get_status = get_response.status_code
                     self.logger.debug(f"verify_website: {url} GET returned status {get_status}")
                     is_valid = get_status in valid_codes
@@ -3689,22 +3706,19 @@ Answer:"""
     def _scrape_page_content(self, url: str, max_length: int = 8000) -> Optional[str]:
         """Scrape and clean page content for agent analysis"""
         try:
-            response = requests.get(url, timeout=10, headers={
+            response = self.session.get(url, timeout=10, headers={
                 'User-Agent': 'Mozilla/5.0 (compatible; ZoningAgent/1.0)'
             })
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(response.text, 'lxml')
             
             # Remove script and style elements
             for script in soup(["script", "style"]):
                 script.decompose()
             
             # Get text and clean it
-            text = soup.get_text()
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
+            text = _PHRASE_BREAK_RE.sub(" ", soup.get_text()).strip()
             
             # Truncate for LLM processing
             if len(text) > max_length:
@@ -3906,8 +3920,8 @@ Response format: Just the URL or "none"
         """Extract all PDF links from a page"""
         
         try:
-            response = requests.get(page_url, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            response = self.session.get(page_url, timeout=10)
+            soup = BeautifulSoup(response.text, 'lxml')
             
             pdf_links = []
             for link in soup.find_all('a', href=True):
@@ -4019,99 +4033,6 @@ Response format: Just the URL or "none"
             
             return None, None
     
-    def _call_llm(self, prompt: str) -> str:
-        """Call the LLM using OpenRouter without forcing JSON format"""
-        
-        try:
-            load_dotenv()
-            api_key = os.getenv("OPENROUTER_API_KEY")
-            if not api_key:
-                raise RuntimeError("OPENROUTER_API_KEY not set")
-            
-            system_message = """You are an expert web navigation agent specializing in finding official municipal zoning maps. You understand the difference between zoning maps (visual/graphic PDFs) and zoning codes/ordinances (text documents). You prioritize official, recent, and authoritative sources."""
-            
-            headers = {
-                "Authorization": f"Bearer {api_key}",
-                "HTTP-Referer": "https://bylaws-iq.local",
-                "X-Title": "ByLaws-IQ Agent",
-                "Content-Type": "application/json",
-            }
-            
-            messages = [
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": prompt}
-            ]
-            
-            payload = {
-                "model": self.model,
-                "temperature": 0.1,
-                "messages": messages,
-                # NOTE: No response_format forcing JSON - we want text responses
-            }
-            
-            self.logger.debug(f"llm.call_start: model={self.model}")
-            
-            import httpx
-            with httpx.Client(timeout=60) as client:
-                r = client.post("https://openrouter.ai/api/v1/chat/completions", headers=headers, json=payload)
-                r.raise_for_status()
-                js = r.json()
-            
-            response = js["choices"][0]["message"]["content"]
-            self.logger.debug(f"llm.call_success: response_length={len(response)}")
-            return response
-            
-        except Exception as e:
-            self.logger.error(f"llm.call_failed: {str(e)}", exc_info=True)
-            raise e
-    
-    def _call_llm_classification(self, prompt: str) -> str:
-        """Call cheaper LLM for simple classification tasks like website selection"""
-        
-        try:
-            load_dotenv()
-            api_key = os.getenv("OPENROUTER_API_KEY")
-            if not api_key:
-                raise RuntimeError("OPENROUTER_API_KEY not set")
-            
-            # Simplified system message for classification
-            system_message = """You are a URL classifier. Select the official government website URL from search results."""
-            
-            headers = {
-                "Authorization": f"Bearer {api_key}",
-                "HTTP-Referer": "https://bylaws-iq.local",
-                "X-Title": "ByLaws-IQ Classification",
-                "Content-Type": "application/json",
-            }
-            
-            messages = [
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": prompt}
-            ]
-            
-            payload = {
-                "model": self.classification_model,
-                "temperature": 0.0,  # More deterministic for classification
-                "messages": messages,
-                "max_tokens": 500,  # Allow for JSON array with multiple zoning maps
-            }
-            
-            self.logger.debug(f"llm.classification_call_start: model={self.classification_model}")
-            
-            import httpx
-            with httpx.Client(timeout=30) as client:  # Shorter timeout for simple task
-                r = client.post("https://openrouter.ai/api/v1/chat/completions", headers=headers, json=payload)
-                r.raise_for_status()
-                js = r.json()
-            
-            response = js["choices"][0]["message"]["content"]
-            self.logger.debug(f"llm.classification_success: response='{response}'")
-            return response
-            
-        except Exception as e:
-            self.logger.error(f"llm.classification_failed: {str(e)}", exc_info=True)
-            raise e
-    
     def _extract_map_metadata(self, pdf_url: str, city: str, state: str) -> Dict[str, Any]:
         """Extract metadata about the zoning map"""
         
@@ -4149,20 +4070,9 @@ Response format: Just the URL or "none"
             self.logger.info(f"mma.searching: Looking for {city} in MMA directory")
             
             try:
-                # Fetch the MMA municipal directory page
-                mma_url = "https://www.mma.org/members/member-communities/city-and-town-websites/#all"
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-                }
-                
-                response = requests.get(mma_url, headers=headers, timeout=30)
-                response.raise_for_status()
-                
-                # Parse the HTML content
-                soup = BeautifulSoup(response.content, 'html.parser')
-                text_content = soup.get_text()
-                
-                self.logger.debug(f"mma.fetched: {len(text_content)} characters from MMA directory")
+                # The directory is fetched once a day and parsed once per process
+                entries = _mma_text_entries(mma_directory_html(self.session, self.logger))
+                self.logger.debug(f"mma.fetched: {len(entries)} entries in MMA directory")
                 
                 # Normalize the city name for matching
                 city_normalized = city.lower().strip()
@@ -4176,36 +4086,12 @@ Response format: Just the URL or "none"
                 
                 self.logger.debug(f"mma.variations: Searching for {city_variations}")
                 
-                # Search for the city in the text content - try multiple patterns
-                lines = text_content.split('\n')
-                
-                for line in lines:
-                    line_clean = line.strip()
-                    
-                    # Look for lines with URLs (any domain - no filtering)
-                    if '–' in line_clean and ('www.' in line_clean or '.gov' in line_clean or '.us' in line_clean or '.org' in line_clean or '.com' in line_clean):
-                        parts = line_clean.split('–')
-                        if len(parts) >= 2:
-                            name_part = parts[0].strip()
-                            url_part = parts[1].strip()
-                            
-                            # Clean up city name (remove markdown formatting)
-                            name_clean = re.sub(r'\*+', '', name_part).strip().lower()
-                            
-                            # Check if this matches any of our city variations
-                            for variation in city_variations:
-                                if variation in name_clean or name_clean in variation:
-                                    # Extract the URL
-                                    url_match = re.search(r'((?:www\.)?[^\s]+\.[a-z]+)', url_part)
-                                    if url_match:
-                                        url = url_match.group(1)
-                                        
-                                        # Ensure URL has protocol
-                                        if not url.startswith('http'):
-                                            url = f"https://{url}"
-                                        
-                                        self.logger.info(f"mma.match_found: {city} matched '{name_part}' -> {url}")
-                                        return url
+                for name_clean, name_part, url in entries:
+                    # Check if this matches any of our city variations
+                    for variation in city_variations:
+                        if variation in name_clean or name_clean in variation:
+                            self.logger.info(f"mma.match_found: {city} matched '{name_part}' -> {url}")
+                            return url
                 
                 self.logger.warning(f"mma.not_found: No entry found for {city} in MMA directory")
                 return None